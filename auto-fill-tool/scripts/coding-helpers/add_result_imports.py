@@ -1,39 +1,39 @@
 #!/usr/bin/env python3
-import os
-import re
+from codemod_engine import register_rule
+from file_writer import WriteStats, write_if_changed
+from import_block import RESULT_MODULE, ensure_imports
+from targets import find_targets, parse_target_args
 
-def add_result_import(file_path):
+RESULT_IMPORT = {'Result': RESULT_MODULE}
+
+def add_result_import_to_content(content, file_path=None):
+    """Result.success/failure を使っていて Result をimportしていなければ、最後のimport文の後に追加したcontentを返す
+    （古い @domain/types/result.types からのimportは ensure_imports が @domain/values/result.value に付け替える）"""
+    if 'Result.success' not in content and 'Result.failure' not in content:
+        return content
+    return ensure_imports(content, RESULT_IMPORT)[0]
+
+def add_result_import(file_path, stats=None):
     with open(file_path, 'r') as f:
         content = f.read()
     
-    # Check if Result is used but not imported
-    if 'Result.success' in content or 'Result.failure' in content:
-        # Check if Result is already imported
-        if 'import { Result }' not in content and 'import {Result}' not in content:
-            # Find the last import statement
-            import_pattern = r'(import .+?;)\n'
-            imports = re.findall(import_pattern, content)
-            
-            if imports:
-                # Add Result import after the last import
-                last_import = imports[-1]
-                result_import = "import { Result } from '@domain/types/result.types';"
-                
-                # Replace the last import with itself + Result import
-                content = content.replace(
-                    last_import,
-                    last_import + '\n' + result_import
-                )
-                
-                with open(file_path, 'w') as f:
-                    f.write(content)
-                return True
+    new_content = add_result_import_to_content(content, file_path)
+    if new_content != content:
+        return write_if_changed(file_path, new_content, stats)
+    if stats is not None:
+        stats.record(file_path, False)
     return False
 
-# Find all test files that need Result import
-for root, dirs, files in os.walk('/home/developer/workspace/auto-fill-tool/src'):
-    for file in files:
-        if file.endswith('.test.ts'):
-            file_path = os.path.join(root, file)
-            if add_result_import(file_path):
-                print(f"Added Result import to: {file_path}")
+# importの追加はエンジンが全ルールの適用後にまとめて行う
+register_rule('result-import', None, imports=RESULT_IMPORT,
+              anchors=('Result.success', 'Result.failure'),
+              description='Result.success/failure を使うテストに Result の import を追加 (add_result_imports.py)')
+
+if __name__ == '__main__':
+    args = parse_target_args('テストファイルにResult型のimportを追加する')
+    stats = WriteStats()
+    # Find all test files that need Result import
+    for file_path in find_targets(args):
+        if add_result_import(file_path, stats):
+            print(f"Added Result import to: {file_path}")
+    print(stats.summary())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+変更されたファイルの影響を受けるjestテストの選択
+
+ステージされたファイル（git diff --cached）から import_graph の逆向きのグラフをたどり、
+変更されたファイルに直接・間接に依存している src/**/__tests__/*.test.ts をすべて求める。
+--run を付けると、選択したテストだけを1回の jest 実行（npm test -- --runTestsByPath ...）で実行する。
+jest / TypeScript の設定やモジュールモックが変更された場合は、影響範囲を特定できないので全テストを実行する。
+
+使い方（プロジェクトルートで実行）:
+    python3 scripts/coding-helpers/affected_tests.py                 # 影響を受けるテストを1行ずつ表示
+    python3 scripts/coding-helpers/affected_tests.py --run           # それらを1回のjestで実行
+    python3 scripts/coding-helpers/affected_tests.py src/domain/entities/Website.ts
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from import_graph import DEFAULT_PROJECT_ROOT, RESOLVE_SUFFIXES, ImportGraph, Resolver, default_cache_path
+
+# tests/helpers も src のテストからimportされるので、グラフに含める
+GRAPH_ROOTS = ('src', 'tests')
+# 変更されたら全テストを実行するファイル
+FULL_RUN_FILES = {
+    'package.json', 'package-lock.json', 'tsconfig.json', 'tsconfig.test.json',
+    'jest.config.js', 'jest.setup.js',
+}
+# jestが暗黙に使うモジュールモックのディレクトリ（直下のファイルはimportされずに使われる）
+MOCK_DIRS = {'__mocks__', 'src/__mocks__'}
+
+
+def is_test_file(path):
+    """jest.config.js の testMatch（src/**/__tests__/**/*.test.ts）に一致するか"""
+    return path.startswith('src/') and '/__tests__/' in path and path.endswith('.test.ts')
+
+
+def staged_files(root):
+    """ステージされたファイルを (追加・変更されたファイル, 削除されたファイル) で返す（rootからの相対パス）"""
+    output = subprocess.run(
+        ['git', 'diff', '--cached', '--name-status', '--relative', '-M'],
+        cwd=root, capture_output=True, text=True, check=True).stdout
+    changed, deleted = [], []
+    for line in output.splitlines():
+        fields = line.split('\t')
+        status = fields[0][:1]
+        if status == 'D':
+            deleted.append(fields[1])
+        elif status == 'R':
+            deleted.append(fields[1])
+            changed.append(fields[2])
+        elif len(fields) > 1:
+            changed.append(fields[-1])
+    return changed, deleted
+
+
+def full_run_reason(path):
+    """全テストの実行が必要になる変更ならそのパスを返す"""
+    if path in FULL_RUN_FILES or os.path.dirname(path) in MOCK_DIRS:
+        return path
+    return None
+
+
+def _importers_of_deleted(graph, deleted):
+    """削除されたファイルをimportしていた（今は解決できない）ファイル"""
+    deleted = set(deleted)
+    resolver = Resolver(graph.files, graph.aliases)
+    importers = set()
+    for rel, _, spec in graph.unresolved:
+        for base in resolver.candidates(rel, spec):
+            stems = [base, base[:-3]] if base.endswith('.js') else [base]
+            if any(stem + suffix in deleted for stem in stems for suffix in RESOLVE_SUFFIXES):
+                importers.add(rel)
+    return importers
+
+
+def affected_tests(graph, changed, deleted=()):
+    """changed / deleted の影響を受けるテストファイルの一覧（ソート済み）"""
+    dependents = graph.dependents()
+    seeds = {path for path in changed if path in dependents}
+    seeds |= _importers_of_deleted(graph, deleted)
+
+    seen = set(seeds)
+    stack = list(seeds)
+    while stack:
+        for source in dependents.get(stack.pop(), ()):
+            if source not in seen:
+                seen.add(source)
+                stack.append(source)
+    return sorted(path for path in seen if is_test_file(path))
+
+
+def run_jest(root, tests, extra_args):
+    """npm test を1回だけ起動する（testsがNoneなら全テスト）"""
+    command = ['npm', 'test', '--']
+    if tests is not None:
+        command += ['--runTestsByPath', *tests]
+    command += extra_args
+    print(f"$ {' '.join(command[:6])}{' ...' if len(command) > 6 else ''}", file=sys.stderr)
+    return subprocess.run(command, cwd=root).returncode
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='変更されたファイルの影響を受けるjestテストを選択する')
+    parser.add_argument('files', nargs='*',
+                        help='変更されたファイル（プロジェクトルートからの相対パス。省略時はステージされたファイル）')
+    parser.add_argument('--project-root', default=DEFAULT_PROJECT_ROOT,
+                        help='プロジェクトルート (default: このスクリプトの2つ上のディレクトリ)')
+    parser.add_argument('--no-cache', action='store_true', help='importグラフのキャッシュを使わない')
+    parser.add_argument('--run', action='store_true', help='選択したテストを1回のjest実行で実行する')
+    parser.add_argument('--jest-arg', action='append', default=[], metavar='ARG',
+                        help='--run 時にjestへ渡す追加の引数（複数指定可）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root)
+
+    if args.files:
+        changed = [os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/') for path in args.files]
+        deleted = [path for path in changed if not os.path.exists(os.path.join(root, path))]
+        changed = [path for path in changed if path not in deleted]
+    else:
+        try:
+            changed, deleted = staged_files(root)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Error: git diff --cached failed: {e}", file=sys.stderr)
+            return 1
+
+    if not changed and not deleted:
+        print("No changed files", file=sys.stderr)
+        return 0
+
+    reasons = [path for path in map(full_run_reason, changed + deleted) if path]
+    if reasons:
+        print(f"{', '.join(reasons)} changed; all tests are affected", file=sys.stderr)
+        if args.run:
+            return run_jest(root, None, args.jest_arg)
+
+    graph = ImportGraph.build(root, GRAPH_ROOTS, None if args.no_cache else default_cache_path(root))
+    graph.save()
+    if reasons:
+        tests = sorted(path for path in graph.files if is_test_file(path))
+    else:
+        tests = affected_tests(graph, changed, deleted)
+        print(f"{len(changed) + len(deleted)} changed file(s) affect {len(tests)} test file(s)", file=sys.stderr)
+
+    if not args.run:
+        for test in tests:
+            print(test)
+        return 0
+    if not tests:
+        return 0
+    return run_jest(root, tests, args.jest_arg)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+codemodルールのベンチマーク
+
+synthetic_tree.py で合成テストツリーを生成し、規模ごとに次を計測してJSONに保存する。
+- ルール単体: 各ファイルに各ルールを単独で適用した時間（repeat回の最小値）と、1回の適用での最大メモリ確保量
+- エンドツーエンド: codemod_engine.run による書き換えまでの時間と、子プロセスのピークRSS
+--compare で過去の結果と比較し、閾値を超えて遅く（大きく）なった項目を回帰として報告する。
+
+使い方（プロジェクトルートで実行）:
+    python3 scripts/coding-helpers/benchmark_codemod.py --sizes 1000,10000 --output bench.json
+    python3 scripts/coding-helpers/benchmark_codemod.py --compare bench-main.json --fail-on-regression
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import codemod_engine
+from codemod import load_rule_modules
+from codemod_profile import git_head
+from synthetic_tree import GENERATOR_VERSION, generate_tree
+
+BENCHMARK_FORMAT = 1
+DEFAULT_SIZES = '1000,10000'
+
+
+def _rule_names(rules):
+    return ','.join(rule.name for rule in rules)
+
+
+def bench_rules(root, rules, repeat):
+    """ルールごとに全ファイルへ単独で適用し、{ルール名: {ms, changed, peak_alloc_kb}} を返す
+
+    ファイルは1つずつ読み込むため、大きなツリーでもメモリ使用量は1ファイル分に収まる。
+    時間計測とメモリ計測（tracemalloc）は計測のオーバーヘッドが混ざらないよう別のパスで行う。
+    """
+    files = list(codemod_engine.find_files(root, tuple(sorted({s for rule in rules for s in rule.suffixes}))))
+    best = {rule.name: None for rule in rules}
+    changed = {rule.name: 0 for rule in rules}
+
+    for iteration in range(repeat):
+        seconds = dict.fromkeys(best, 0.0)
+        for file_path in files:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            for rule in rules:
+                if not rule.applies_to(file_path):
+                    continue
+                started = time.perf_counter()
+                new_content = rule.transform(content, file_path)
+                seconds[rule.name] += time.perf_counter() - started
+                if iteration == 0 and new_content != content:
+                    changed[rule.name] += 1
+        for name, value in seconds.items():
+            if best[name] is None or value < best[name]:
+                best[name] = value
+
+    peaks = dict.fromkeys(best, 0)
+    tracemalloc.start()
+    try:
+        for file_path in files:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            for rule in rules:
+                if rule.applies_to(file_path):
+                    tracemalloc.reset_peak()
+                    base = tracemalloc.get_traced_memory()[0]
+                    rule.transform(content, file_path)
+                    peaks[rule.name] = max(peaks[rule.name], tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        name: {'ms': round(best[name] * 1000, 3), 'changed': changed[name], 'peak_alloc_kb': peaks[name] // 1024}
+        for name in best
+    }
+
+
+def bench_end_to_end(pristine, workdir, rules, jobs, repeat):
+    """合成ツリーのコピーに対してcodemodを実行し、{ms, changed, peak_rss_kb, workers_peak_rss_kb} を返す
+
+    ピークRSSを実行ごとに分けて測るため、各回を子プロセスで実行する（コピーの時間は含まない）。
+    """
+    best = None
+    peak = workers_peak = 0
+    for iteration in range(repeat):
+        target = os.path.join(workdir, f'run{iteration}')
+        shutil.copytree(pristine, target)
+        try:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--run-tree', target,
+                 '--rules', _rule_names(rules), '--jobs', str(jobs)],
+                capture_output=True, text=True, check=True).stdout
+        finally:
+            shutil.rmtree(target, ignore_errors=True)
+        result = json.loads(output.splitlines()[-1])
+        if best is None or result['ms'] < best['ms']:
+            best = result
+        peak = max(peak, result['peak_rss_kb'])
+        workers_peak = max(workers_peak, result['workers_peak_rss_kb'])
+    return dict(best, peak_rss_kb=peak, workers_peak_rss_kb=workers_peak)
+
+
+def run_tree(root, rules, jobs):
+    """子プロセス側: rootにルールを適用し、計測結果をJSONで1行出力する"""
+    started = time.perf_counter()
+    results = codemod_engine.run(root, rules, jobs=jobs, loader=load_rule_modules)
+    seconds = time.perf_counter() - started
+    print(json.dumps({
+        'ms': round(seconds * 1000, 3),
+        'changed': len(results),
+        # Linuxのru_maxrssはKB単位
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'workers_peak_rss_kb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }))
+
+
+def run_benchmark(sizes, rules, seed, jobs, repeat, workdir=None, log=sys.stderr):
+    """規模ごとに合成ツリーを生成して計測し、結果のdictを返す"""
+    data = {
+        'format': BENCHMARK_FORMAT,
+        'generator': GENERATOR_VERSION,
+        'seed': seed,
+        'commit': git_head(),
+        'generated_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'jobs': jobs,
+        'repeat': repeat,
+        'rules': [rule.name for rule in rules],
+        'sizes': {},
+    }
+    for size in sizes:
+        tmp = tempfile.mkdtemp(prefix=f'codemod-bench-{size}-', dir=workdir)
+        try:
+            pristine = os.path.join(tmp, 'pristine')
+            started = time.perf_counter()
+            count, total = generate_tree(pristine, size, seed)
+            print(f"[{size}] generated {count} files ({total / 1024 / 1024:.1f} MiB) "
+                  f"in {time.perf_counter() - started:.1f}s", file=log)
+            rule_results = bench_rules(pristine, rules, repeat)
+            print(f"[{size}] rules: {sum(r['ms'] for r in rule_results.values()):.1f} ms total", file=log)
+            end_to_end = bench_end_to_end(pristine, tmp, rules, jobs, repeat)
+            print(f"[{size}] end-to-end: {end_to_end['ms']:.1f} ms, peak RSS {end_to_end['peak_rss_kb']} KB", file=log)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        data['sizes'][str(size)] = {
+            'files': count,
+            'bytes': total,
+            'rules': rule_results,
+            'end_to_end': end_to_end,
+        }
+    return data
+
+
+def _metrics(data):
+    """比較対象の (規模, 項目名) -> (値, 単位) を返す"""
+    metrics = {}
+    for size, entry in data.get('sizes', {}).items():
+        for name, rule in entry.get('rules', {}).items():
+            metrics[(size, f'rule {name}')] = (rule['ms'], 'ms')
+            metrics[(size, f'rule {name} alloc')] = (rule['peak_alloc_kb'], 'KB')
+        end_to_end = entry.get('end_to_end')
+        if end_to_end:
+            metrics[(size, 'end-to-end')] = (end_to_end['ms'], 'ms')
+            metrics[(size, 'end-to-end rss')] = (end_to_end['peak_rss_kb'], 'KB')
+    return metrics
+
+
+def compare(baseline, current, threshold, min_ms, out=sys.stdout):
+    """baselineとcurrentを比較して表を表示し、回帰した項目の一覧を返す"""
+    for key in ('generator', 'seed'):
+        if baseline.get(key) != current.get(key):
+            print(f"Warning: {key} differs ({baseline.get(key)} -> {current.get(key)}); "
+                  f"results are not directly comparable", file=out)
+
+    old = _metrics(baseline)
+    new = _metrics(current)
+    regressions = []
+    print(f"{'size':>6} {'metric':<40} {'baseline':>12} {'current':>12} {'change':>8}", file=out)
+    for key in sorted(old.keys() & new.keys(), key=lambda k: (int(k[0]), k[1])):
+        (before, unit), (after, _) = old[key], new[key]
+        change = (after - before) / before * 100 if before else 0.0
+        # 数ms程度の時間はノイズが大きいので回帰判定から外す
+        noisy = unit == 'ms' and max(before, after) < min_ms
+        regressed = change > threshold and not noisy
+        mark = '  REGRESSION' if regressed else ''
+        print(f"{key[0]:>6} {key[1]:<40} {before:>9.1f} {unit} {after:>9.1f} {unit} {change:>+7.1f}%{mark}", file=out)
+        if regressed:
+            regressions.append((key, before, after))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='codemodルールのベンチマーク')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'生成するテストファイル数をカンマ区切りで指定 (default: {DEFAULT_SIZES}、例: 1000,10000,50000)')
+    parser.add_argument('--rules', help='計測するルール名をカンマ区切りで指定（省略時は有効な全ルール）')
+    parser.add_argument('--seed', type=int, default=1, help='合成ツリーの乱数シード (default: 1)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='エンドツーエンド実行の並列プロセス数 (default: 1)')
+    parser.add_argument('--repeat', type=int, default=3, help='各計測の繰り返し回数（最小値を採用, default: 3）')
+    parser.add_argument('--workdir', help='合成ツリーを生成する一時ディレクトリの親 (default: システムの一時ディレクトリ)')
+    parser.add_argument('--output', '-o', help='結果をJSONで保存するパス')
+    parser.add_argument('--compare', metavar='BASELINE', help='過去の結果JSONと比較する')
+    parser.add_argument('--threshold', type=float, default=10.0, help='回帰とみなす増加率（%%, default: 10）')
+    parser.add_argument('--min-ms', type=float, default=5.0,
+                        help='これ未満の時間は回帰判定から外す (default: 5)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='回帰があれば終了コード1で終了')
+    parser.add_argument('--run-tree', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    load_rule_modules()
+
+    names = [name.strip() for name in args.rules.split(',') if name.strip()] if args.rules else None
+    try:
+        rules = codemod_engine.get_rules(names)
+    except KeyError as e:
+        print(f"Error: {e.args[0]}")
+        return 1
+
+    if args.run_tree:
+        run_tree(args.run_tree, rules, args.jobs)
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    current = run_benchmark(sizes, rules, args.seed, max(1, args.jobs), max(1, args.repeat), args.workdir)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(current, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.min_ms,
+                              out=sys.stdout if args.output else sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:g}%", file=sys.stderr)
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+webpackのバンドルサイズをエントリーごと・レイヤーごとに集計する
+
+webpack --json の統計（npm run build:stats で webpack-stats.json に出力）を読み、エントリーごとに
+出力されるファイルの合計サイズと、含まれるモジュール（連結されたモジュールは中身ごと）のサイズを
+src/domain・application・infrastructure・presentation・node_modules に分けて表示する。
+content-script はページへの注入、background はService Workerの起動のたびに読み込まれるので、
+この2つのエントリーに入った大きなモジュール（node_modules はパッケージ単位）を --heavy 以上なら報告する。
+
+--save-baseline で今回の集計を .codemod-cache/bundle-baseline.json（--baseline で変更可）に保存し、
+以降はその基準との差分を表示する。--budget ENTRY=SIZE（出力サイズの上限）や、基準からの増加率の上限
+--max-growth を超えたエントリーがあれば終了コード1を返す。レイヤーごとのサイズはminify前のモジュールのサイズで、
+出力サイズ（minify後）とは一致しない。
+
+使い方（プロジェクトルートで実行）:
+    npm run build:stats
+    python3 scripts/coding-helpers/bundle_stats.py                                   # webpack-stats.json
+    python3 scripts/coding-helpers/bundle_stats.py --save-baseline                   # 基準として保存
+    python3 scripts/coding-helpers/bundle_stats.py --budget content-script=150KiB --budget background=600KiB
+    python3 scripts/coding-helpers/bundle_stats.py --max-growth 5 --json bundle-report.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from codemod_manifest import DEFAULT_CACHE_DIR
+from file_writer import atomic_write
+from targets import find_project_root
+
+BASELINE_FORMAT = 1
+DEFAULT_STATS = 'webpack-stats.json'
+LAYERS = ('domain', 'application', 'infrastructure', 'presentation')
+# 表示する順（LAYERS の後）
+OTHER_GROUPS = ('node_modules', 'runtime', 'other')
+# 起動のたびに読み込まれるエントリー
+HEAVY_ENTRIES = ('content-script', 'background')
+DEFAULT_HEAVY_BYTES = 20 * 1024
+
+_SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(b|bytes?|k|kb|kib|m|mb|mib)?\s*$', re.IGNORECASE)
+_UNITS = {'k': 1024, 'm': 1024 * 1024}
+_CONCATENATED = re.compile(r' \+ \d+ modules?$')
+_SRC_DIR = re.compile(r'^\./src/([^/]+)/')
+
+
+def default_baseline_path(root):
+    return os.path.join(root, DEFAULT_CACHE_DIR, 'bundle-baseline.json')
+
+
+def parse_size(text):
+    """'150KiB' / '1.5MB' / '20000' をバイト数にする（k・m は1024単位）"""
+    match = _SIZE.match(text)
+    if not match:
+        raise ValueError(f"invalid size: {text!r}")
+    unit = (match.group(2) or 'b')[0].lower()
+    return round(float(match.group(1)) * _UNITS.get(unit, 1))
+
+
+def format_size(size):
+    """webpackの出力と同じ形式（bytes / KiB / MiB）"""
+    if abs(size) < 1024:
+        return f"{size} bytes"
+    if abs(size) < 1024 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size / 1024 / 1024:.2f} MiB"
+
+
+def format_delta(old, new):
+    delta = new - old
+    line = f"{'+' if delta >= 0 else '-'}{format_size(abs(delta))}"
+    if old:
+        line += f", {delta / old * 100:+.1f}%"
+    return line
+
+
+def module_path(name):
+    """統計のモジュール名からローダーの指定・種類の接頭辞・連結の接尾辞を除いたパス"""
+    name = _CONCATENATED.sub('', name.rsplit('!', 1)[-1])
+    if not name.startswith(('.', '/', '(')) and ' ' in name:
+        # 'css ./node_modules/...' や 'external "googleapis"'
+        kind, rest = name.split(' ', 1)
+        if kind in ('css', 'javascript'):
+            name = rest
+    return name
+
+
+def classify(module):
+    """(グループ, 報告の単位) を返す。node_modules の報告の単位はパッケージ名"""
+    path = module_path(module.get('name', ''))
+    if module.get('moduleType') == 'runtime' or path.startswith('webpack/runtime/'):
+        return 'runtime', path
+    if 'node_modules/' in path:
+        parts = path.rsplit('node_modules/', 1)[1].split('/')
+        package = '/'.join(parts[:2]) if parts[0].startswith('@') else parts[0]
+        return 'node_modules', package
+    match = _SRC_DIR.match(path)
+    if match and match.group(1) in LAYERS:
+        return match.group(1), path
+    return 'other', path
+
+
+def _issuer(module):
+    """モジュールを取り込んだモジュール（issuerName か最初の reason）"""
+    name = module.get('issuerName')
+    if not name:
+        name = next((reason.get('moduleName') for reason in module.get('reasons') or [] if reason.get('moduleName')), None)
+    return module_path(name) if name else None
+
+
+def leaf_modules(module):
+    """連結されたモジュール（ModuleConcatenationPlugin）は中のモジュールに展開する"""
+    nested = module.get('modules')
+    if nested:
+        for inner in nested:
+            yield from leaf_modules(inner)
+    else:
+        yield module
+
+
+def load_stats(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    if 'entrypoints' not in stats:
+        # マルチコンパイラの出力
+        stats = next((child for child in stats.get('children', []) if 'entrypoints' in child), stats)
+    if not stats.get('entrypoints') or not (stats.get('chunks') or stats.get('modules')):
+        raise ValueError(f"{path} has no entrypoints/chunks/modules (run `npm run build:stats`)")
+    return stats
+
+
+def analyze(stats):
+    """エントリーごとに {'assets': 出力サイズ, 'files': [ファイル], 'groups': {グループ: サイズ},
+    'items': {報告の単位: (グループ, サイズ, 取り込んだモジュール)}, 'modules': モジュール数} を返す"""
+    asset_sizes = {asset['name']: asset.get('size', 0) for asset in stats.get('assets', [])}
+    chunk_modules = {}
+    for chunk in stats.get('chunks', []):
+        if 'modules' in chunk:
+            chunk_modules[chunk['id']] = chunk['modules']
+    if not chunk_modules:
+        # chunkModules: false の統計はトップレベルの modules の chunks から割り当てる
+        for module in stats.get('modules', []):
+            for chunk_id in module.get('chunks', []):
+                chunk_modules.setdefault(chunk_id, []).append(module)
+
+    entries = {}
+    for name, entrypoint in stats['entrypoints'].items():
+        files = []
+        assets = 0
+        for asset in entrypoint.get('assets', []):
+            file = asset['name'] if isinstance(asset, dict) else asset
+            if file.endswith('.map'):
+                continue
+            files.append(file)
+            assets += asset.get('size', asset_sizes.get(file, 0)) if isinstance(asset, dict) else asset_sizes.get(file, 0)
+
+        seen = set()
+        groups = dict.fromkeys(LAYERS + OTHER_GROUPS, 0)
+        items = {}
+        for chunk_id in entrypoint.get('chunks', []):
+            for module in chunk_modules.get(chunk_id, []):
+                for leaf in leaf_modules(module):
+                    key = leaf.get('identifier') or leaf.get('name')
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    size = leaf.get('size') or 0
+                    group, item = classify(leaf)
+                    groups[group] += size
+                    _, total, issuer = items.get(item, (group, 0, None))
+                    items[item] = (group, total + size, issuer or _issuer(leaf))
+        entries[name] = {'assets': assets, 'files': files, 'groups': groups, 'items': items, 'modules': len(seen)}
+    return entries
+
+
+def heavy_items(entry, threshold):
+    """threshold以上の報告の単位を大きい順に [(単位, グループ, サイズ, 取り込んだモジュール)] で返す"""
+    heavy = [(item, group, size, issuer) for item, (group, size, issuer) in entry['items'].items()
+             if size >= threshold and group != 'runtime']
+    return sorted(heavy, key=lambda h: (-h[2], h[0]))
+
+
+def summarize(entries, heavy_entries):
+    """基準として保存する形（報告の単位ごとのサイズは heavy_entries のものだけ）"""
+    summary = {}
+    for name, entry in entries.items():
+        summary[name] = {'assets': entry['assets'], 'modules': entry['modules'],
+                         'groups': {group: size for group, size in entry['groups'].items() if size}}
+        if name in heavy_entries:
+            summary[name]['items'] = {item: size for item, (_, size, _) in entry['items'].items()}
+    return summary
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') == BASELINE_FORMAT:
+            return data.get('entries', {})
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def save_baseline(path, summary):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    data = {'format': BASELINE_FORMAT, 'entries': summary}
+    atomic_write(path, (json.dumps(data, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+
+def print_entries(entries, heavy_entries, threshold, out=sys.stdout):
+    for name in sorted(entries, key=lambda n: (-entries[n]['assets'], n)):
+        entry = entries[name]
+        total = sum(entry['groups'].values())
+        print(f"{name}: {format_size(entry['assets'])} emitted ({', '.join(entry['files']) or 'no files'}), "
+              f"{entry['modules']} module(s) {format_size(total)} before minification", file=out)
+        for group, size in entry['groups'].items():
+            if size:
+                print(f"  {group:<16} {format_size(size):>12} {size / total * 100:5.1f}%", file=out)
+        if name in heavy_entries:
+            for item, group, size, issuer in heavy_items(entry, threshold):
+                line = f"  heavy: {item} {format_size(size)} ({group})"
+                if issuer:
+                    line += f" <- {issuer}"
+                print(line, file=out)
+
+
+def compare(summary, baseline, heavy_entries, threshold, out=sys.stdout):
+    """基準との差分を表示し、{エントリー: (基準の出力サイズ, 今回の出力サイズ)} を返す"""
+    changes = {}
+    for name in sorted(set(summary) | set(baseline)):
+        if name not in summary:
+            print(f"{name}: removed (was {format_size(baseline[name]['assets'])})", file=out)
+            continue
+        if name not in baseline:
+            print(f"{name}: new entry ({format_size(summary[name]['assets'])})", file=out)
+            continue
+        old, new = baseline[name], summary[name]
+        changes[name] = (old['assets'], new['assets'])
+        group_changes = [(group, old['groups'].get(group, 0), new['groups'].get(group, 0))
+                         for group in LAYERS + OTHER_GROUPS]
+        group_changes = [change for change in group_changes if change[1] != change[2]]
+        if old['assets'] == new['assets'] and not group_changes:
+            continue
+        print(f"{name}: {format_size(old['assets'])} -> {format_size(new['assets'])} "
+              f"({format_delta(old['assets'], new['assets'])})", file=out)
+        for group, before, after in group_changes:
+            print(f"  {group:<16} {format_size(before)} -> {format_size(after)} ({format_delta(before, after)})", file=out)
+        if name in heavy_entries and 'items' in old:
+            # 新しく入った、または大きくなった報告の単位
+            grown = [(item, old['items'].get(item, 0), size) for item, size in new.get('items', {}).items()
+                     if size - old['items'].get(item, 0) >= threshold / 4]
+            for item, before, after in sorted(grown, key=lambda g: (g[1] - g[2], g[0])):
+                label = 'new' if not before else f"{format_size(before)} ->"
+                print(f"  grown: {item} {label} {format_size(after)}", file=out)
+    return changes
+
+
+def check_budgets(entries, budgets, changes, max_growth):
+    """超過したものを [メッセージ] で返す"""
+    exceeded = []
+    for name, limit in budgets.items():
+        size = entries[name]['assets']
+        if size > limit:
+            exceeded.append(f"{name}: {format_size(size)} exceeds budget {format_size(limit)}")
+    if max_growth is not None:
+        for name, (before, after) in sorted(changes.items()):
+            if before and (after - before) / before * 100 > max_growth:
+                exceeded.append(f"{name}: grew {format_delta(before, after)} from baseline "
+                                f"(max {max_growth:g}%)")
+    return exceeded
+
+
+def parse_budgets(values):
+    """['content-script=150KiB', ...] -> {エントリー: バイト数}"""
+    budgets = {}
+    for value in values:
+        name, sep, size = value.partition('=')
+        if not sep or not name:
+            raise ValueError(f"invalid budget: {value!r} (expected ENTRY=SIZE)")
+        budgets[name] = parse_size(size)
+    return budgets
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='webpackのバンドルサイズをエントリーごと・レイヤーごとに集計し、基準や上限と比べる')
+    parser.add_argument('stats', nargs='?',
+                        help=f'webpack --json の統計ファイル (default: プロジェクトルートの {DEFAULT_STATS})')
+    parser.add_argument('--project-root',
+                        help='プロジェクトルート (default: カレントディレクトリから package.json / tsconfig.json を探す)')
+    parser.add_argument('--baseline', help='基準のファイル (default: .codemod-cache/bundle-baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='今回の集計を基準として保存する')
+    parser.add_argument('--budget', action='append', default=[], metavar='ENTRY=SIZE',
+                        help='エントリーの出力サイズの上限（例: content-script=150KiB、複数指定可）')
+    parser.add_argument('--max-growth', type=float, metavar='PERCENT',
+                        help='基準からの出力サイズの増加率の上限（%%）')
+    parser.add_argument('--heavy', default=f'{DEFAULT_HEAVY_BYTES // 1024}KiB', metavar='SIZE',
+                        help='この大きさ以上のモジュール・パッケージを報告する (default: %(default)s)')
+    parser.add_argument('--heavy-entry', action='append', metavar='ENTRY',
+                        help=f"大きなモジュールを報告するエントリー (default: {', '.join(HEAVY_ENTRIES)})")
+    parser.add_argument('--json', metavar='PATH', help='集計と超過の一覧をJSONで保存する')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root) if args.project_root else find_project_root()
+    stats_path = args.stats or os.path.join(root, DEFAULT_STATS)
+    baseline_path = args.baseline or default_baseline_path(root)
+    heavy_entries = tuple(args.heavy_entry or HEAVY_ENTRIES)
+    if not os.path.isfile(stats_path):
+        print(f"Error: {stats_path} not found (run `npm run build:stats`)", file=sys.stderr)
+        return 1
+    try:
+        threshold = parse_size(args.heavy)
+        budgets = parse_budgets(args.budget)
+        entries = analyze(load_stats(stats_path))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    unknown = sorted(set(budgets) - set(entries))
+    if unknown:
+        print(f"Error: unknown entry in --budget: {', '.join(unknown)} (entries: {', '.join(sorted(entries))})",
+              file=sys.stderr)
+        return 1
+
+    print_entries(entries, heavy_entries, threshold)
+    summary = summarize(entries, heavy_entries)
+    baseline = load_baseline(baseline_path)
+    changes = {}
+    if baseline is not None:
+        print(f"\nCompared with baseline {baseline_path}:")
+        changes = compare(summary, baseline, heavy_entries, threshold)
+    elif args.max_growth is not None:
+        print(f"Warning: no baseline at {baseline_path}, --max-growth is ignored", file=sys.stderr)
+
+    exceeded = check_budgets(entries, budgets, changes, args.max_growth)
+    for message in exceeded:
+        print(f"BUDGET EXCEEDED {message}")
+    if args.json:
+        report = {'entries': summary, 'exceeded': exceeded,
+                  'heavy': {name: [{'module': item, 'group': group, 'size': size, 'issuer': issuer}
+                                   for item, group, size, issuer in heavy_items(entries[name], threshold)]
+                            for name in heavy_entries if name in entries}}
+        atomic_write(args.json, (json.dumps(report, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+        print(f"Report written to {args.json}")
+    if args.save_baseline:
+        save_baseline(baseline_path, summary)
+        print(f"Baseline saved to {baseline_path}")
+    return 1 if exceeded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+fix_*.py の書き換えルールを1回のツリー走査でまとめて実行するスクリプト
+
+使い方（プロジェクトルートで実行）:
+    python3 scripts/coding-helpers/codemod.py                 # 有効な全ルールを適用
+    python3 scripts/coding-helpers/codemod.py --rules mocks,all-mocks
+    python3 scripts/coding-helpers/codemod.py --list          # 登録済みルールの一覧
+    python3 scripts/coding-helpers/codemod.py --changed       # git diff --name-only HEAD と未追跡ファイルのみ
+    git diff --name-only main | python3 scripts/coding-helpers/codemod.py --stdin   # 標準入力のファイル一覧のみ
+    python3 scripts/coding-helpers/codemod.py --jobs 16       # プロセスプールで並列実行
+    python3 scripts/coding-helpers/codemod.py --dry-run > preview.diff   # 書き換えずにdiffとルール別集計を出力
+    python3 scripts/coding-helpers/codemod.py --profile --top 20 --profile-json profile.json
+    python3 scripts/coding-helpers/codemod.py --file-budget-ms 500   # 1ファイル500msを超えたら書き換えずにスキップ
+    python3 scripts/coding-helpers/codemod.py --cprofile codemod.prof   # cProfileの結果を保存（python3 -m pstats で表示）
+    python3 scripts/coding-helpers/codemod.py --watch         # 保存されたファイルにだけルールを適用し続ける
+
+前回の実行で書き換え不要と確認したファイルは .codemod-cache/ のマニフェストにより開かずにスキップされる。
+--root / --cache-dir の既定値はプロジェクトルート（カレントディレクトリから上に package.json を探す）からのパスなので、
+サブディレクトリから実行しても同じツリーとマニフェストが使われる。
+"""
+
+import argparse
+import cProfile
+import importlib
+import os
+import subprocess
+import sys
+
+import codemod_engine
+import codemod_watch
+from codemod_manifest import DEFAULT_CACHE_DIR, Manifest
+from codemod_profile import Profile
+from file_writer import WriteStats
+from targets import filter_listed, find_project_root
+
+# ルールを登録するモジュール（この順序がルールの適用順になる）
+RULE_MODULES = [
+    'add_result_imports',
+    'fix_all_issues',
+    'fix_mocks',
+    'fix_all_mocks',
+    'fix_complex_mocks',
+    'fix_storagesyncconfig',
+    'fix_all_create_calls',
+    # idgenerator-import-mock は create系ルールが追加したmockIdGeneratorも宣言するので最後に読み込む
+    'fix_idgenerator',
+]
+
+
+def load_rule_modules():
+    """ルールモジュールを読み込んでルールを登録する"""
+    for module_name in RULE_MODULES:
+        importlib.import_module(module_name)
+
+
+def print_rules():
+    """登録済みルールの一覧を表示"""
+    for rule in codemod_engine.all_rules():
+        status = 'on ' if rule.enabled else 'off'
+        suffixes = ','.join(rule.suffixes)
+        print(f"[{status}] {rule.name:<26} {suffixes:<10} {rule.description}")
+
+
+def print_rule_stats(rules, rule_stats, out):
+    """ルールごとの集計表を表示"""
+    print(f"{'rule':<26} {'checked':>8} {'matched':>8} {'subs':>6} {'bytes':>9} {'time(ms)':>9}", file=out)
+    names = [rule.name for rule in rules]
+    if codemod_engine.IMPORTS_STEP in rule_stats:
+        names.append(codemod_engine.IMPORTS_STEP)
+    for name in names:
+        entry = rule_stats.get(name) or codemod_engine.RuleStats()
+        print(f"{name:<26} {entry.checked:>8} {entry.matched:>8} {entry.substitutions:>6} "
+              f"{entry.bytes_changed:>9} {entry.seconds * 1000:>9.1f}", file=out)
+
+
+def git_changed_files(ref='HEAD'):
+    """git diff --name-only <ref> と未追跡ファイルを、カレントディレクトリからの相対パスで返す"""
+    top = subprocess.run(['git', 'rev-parse', '--show-toplevel'],
+                         capture_output=True, text=True, check=True).stdout.strip()
+    changed = subprocess.run(['git', 'diff', '--name-only', ref],
+                             capture_output=True, text=True, check=True, cwd=top).stdout.splitlines()
+    untracked = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'],
+                               capture_output=True, text=True, check=True, cwd=top).stdout.splitlines()
+    return [os.path.relpath(os.path.join(top, name)) for name in changed + untracked if name]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='fix_*.py のルールを1パスで適用する')
+    parser.add_argument('--root', help='走査するディレクトリ (default: プロジェクトルートの src)')
+    parser.add_argument('--rules', help='適用するルール名をカンマ区切りで指定（省略時は有効な全ルール）')
+    parser.add_argument('--list', action='store_true', help='登録済みルールを表示して終了')
+    parser.add_argument('--changed', nargs='?', const='HEAD', metavar='REF',
+                        help='git diff --name-only REF（default: HEAD）と未追跡ファイルのみを対象にする')
+    parser.add_argument('--stdin', action='store_true',
+                        help='標準入力のファイル一覧（1行1ファイル）のうち --root 配下の *.ts のみを対象にする')
+    parser.add_argument('--cache-dir',
+                        help=f'マニフェストの保存先 (default: プロジェクトルートの {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-manifest', action='store_true', help='マニフェストを使わず全ファイルを処理する')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='並列プロセス数（0でCPUコア数, default: 1）。結果は逐次実行と同一')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='ファイルを書き換えず、unified diffを標準出力に逐次出力する（集計は標準エラー出力）')
+    parser.add_argument('--stats', action='store_true',
+                        help='ルールごとの集計（実行/変更ファイル数・置換箇所・変更バイト数・時間）を表示（--dry-runでは常に表示）')
+    parser.add_argument('--profile', action='store_true',
+                        help='ファイル×ルールの時間を計測し、遅いファイルと (ファイル, ルール) の上位を表示')
+    parser.add_argument('--top', type=int, default=10, help='--profileで表示する件数 (default: 10)')
+    parser.add_argument('--profile-json', metavar='PATH',
+                        help='プロファイル結果（ルール別集計・上位N件・上限超過）をJSONで保存（--profileを含む）')
+    parser.add_argument('--file-budget-ms', type=float, metavar='MS',
+                        help='1ファイルあたりの時間上限。超えたファイルは報告して書き換えずにスキップする')
+    parser.add_argument('--cprofile', metavar='PATH',
+                        help='cProfileの結果をPATHに保存（関数単位の計測のため --jobs は1に固定）')
+    parser.add_argument('--watch', action='store_true',
+                        help='終了せずにファイルの保存を監視し、保存されたファイルにだけルールを適用する')
+    parser.add_argument('--debounce-ms', type=float, default=codemod_watch.DEFAULT_DEBOUNCE_MS,
+                        help=f'--watch で連続した保存をまとめる待ち時間 (default: {codemod_watch.DEFAULT_DEBOUNCE_MS})')
+    parser.add_argument('--poll', action='store_true',
+                        help='--watch でinotifyを使わず、一定間隔でsize/mtimeを比較する')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    load_rule_modules()
+
+    if args.list:
+        print_rules()
+        return 0
+
+    names = [name.strip() for name in args.rules.split(',') if name.strip()] if args.rules else None
+    try:
+        rules = codemod_engine.get_rules(names)
+    except KeyError as e:
+        print(f"Error: {e.args[0]}")
+        return 1
+
+    project_root = find_project_root()
+    args.root = args.root or os.path.relpath(os.path.join(project_root, 'src'))
+    args.cache_dir = args.cache_dir or os.path.relpath(os.path.join(project_root, DEFAULT_CACHE_DIR))
+    if not os.path.isdir(args.root):
+        print(f"Error: directory not found: {args.root}")
+        return 1
+
+    files = None
+    if args.changed:
+        try:
+            changed = git_changed_files(args.changed)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Error: git diff failed: {e}")
+            return 1
+        root = os.path.abspath(args.root) + os.sep
+        files = [f for f in changed if os.path.abspath(f).startswith(root)]
+    elif args.stdin:
+        listed = filter_listed(project_root, sys.stdin, include=('**/*.ts',))
+        root = os.path.abspath(args.root) + os.sep
+        files = [os.path.relpath(os.path.join(project_root, rel)) for rel in listed
+                 if os.path.join(project_root, rel).startswith(root)]
+
+    manifest = None if args.no_manifest else Manifest.load(args.cache_dir, rules)
+
+    # dry-runではdiffだけを標準出力に流し、git apply等にそのまま渡せるようにする
+    log = sys.stderr if args.dry_run else sys.stdout
+
+    def on_outcome(outcome):
+        if outcome.diff:
+            sys.stdout.write(outcome.diff)
+            sys.stdout.flush()
+        elif outcome.applied:
+            print(f"Fixed: {outcome.file_path} ({', '.join(outcome.applied)})", file=log)
+
+    print(f"Applying {len(rules)} rule(s): {', '.join(rule.name for rule in rules)}", file=log)
+    if args.watch:
+        return codemod_watch.watch(args.root, rules, args.cache_dir, args.debounce_ms / 1000, args.poll,
+                                   dry_run=args.dry_run, on_outcome=on_outcome, log=log)
+    stats = WriteStats()
+    profiling = args.profile or args.profile_json is not None
+    profile = Profile(args.top) if profiling else None
+    budget = args.file_budget_ms / 1000 if args.file_budget_ms is not None else None
+    rule_stats = {} if (args.stats or args.dry_run) else None
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if args.cprofile and jobs > 1:
+        # ワーカープロセス内の処理はcProfileで計測できない
+        print("Note: --cprofile runs with --jobs 1", file=log)
+        jobs = 1
+
+    def observe(outcome):
+        if profile is not None:
+            profile.add(outcome)
+        if outcome.over_budget is not None and profile is None:
+            print(f"Over budget (skipped): {outcome.file_path}: {outcome.over_budget}", file=log)
+        on_outcome(outcome)
+
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler is not None:
+        profiler.enable()
+    results = codemod_engine.run(args.root, rules, stats, manifest, files, jobs, load_rule_modules,
+                                 dry_run=args.dry_run, rule_stats=rule_stats, on_outcome=observe,
+                                 profile=profiling, budget=budget)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+        print(f"cProfile stats written to {args.cprofile}", file=log)
+
+    if rule_stats is not None:
+        print_rule_stats(rules, rule_stats, log)
+    if profile is not None:
+        profile.print_report(log)
+        if args.profile_json:
+            profile.write_json(args.profile_json, rule_stats, budget)
+            print(f"Profile written to {args.profile_json}", file=log)
+
+    summary = stats.summary()
+    if manifest is not None:
+        manifest.save()
+        summary += f", {manifest.hits} skipped via manifest"
+    verb = 'Would fix' if args.dry_run else 'Fixed'
+    print(f"{verb} {len(results)} files ({summary})", file=log)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+codemodエンジン: 登録された書き換えルールを1回のツリー走査でまとめて適用する
+
+各ファイルは一度だけ読み込まれ、有効なルールがメモリ上のテキストに登録順で適用され、
+内容が変わった場合のみ一度だけ書き戻される。ルールは各 fix_*.py が register_rule() で登録する。
+ルールがアンカー（リテラル文字列）を宣言している場合、そのいずれかを含むファイルにだけ適用される。
+ルールが必要とするimport（Rule.imports）はルールごとには追加せず、全ルールの適用後に
+import_block でファイルごとに1回だけ解析・追加する。
+"""
+
+import difflib
+import os
+import time
+
+from file_writer import content_hash, write_if_changed
+from import_block import ensure_imports
+from trigger_index import index_for
+
+# 走査対象から外すディレクトリ
+SKIP_DIRS = {'node_modules', 'dist', 'coverage', '.git'}
+
+
+class Rule:
+    """書き換えルール: transform(content, file_path) -> 新しいcontent
+
+    anchorsを指定すると、いずれかの文字列を含むファイルにだけ適用される（Noneなら全ファイル）。
+    importsに {ローカル名: モジュール} を指定すると、適用後にその名前が使われていてimportされていなければ追加する。
+    エンジンは edit（import以外の書き換え。Noneならimportの追加のみ）を実行し、importは全ルール分をまとめて追加する。
+    transform は単独で実行する場合（ベンチマーク等）の edit + import追加。
+    """
+
+    def __init__(self, name, transform, description='', suffixes=('.test.ts',), enabled=True, anchors=None,
+                 imports=None):
+        self.name = name
+        self.edit = transform
+        self.imports = dict(imports) if imports else None
+        self.transform = self._edit_and_import if self.imports else transform
+        self.description = description
+        self.suffixes = tuple(suffixes)
+        self.enabled = enabled
+        self.anchors = frozenset(anchors) if anchors else None
+
+    def applies_to(self, file_path):
+        return file_path.endswith(self.suffixes)
+
+    def _edit_and_import(self, content, file_path=None):
+        if self.edit is not None:
+            content = self.edit(content, file_path)
+        return ensure_imports(content, self.imports)[0]
+
+
+_RULES = {}
+
+
+def register_rule(name, transform, description='', suffixes=('.test.ts',), enabled=True, anchors=None,
+                  imports=None):
+    """ルールを登録する（登録順がそのまま適用順になる）"""
+    if name in _RULES:
+        raise ValueError(f"Rule already registered: {name}")
+    rule = Rule(name, transform, description, suffixes, enabled, anchors, imports)
+    _RULES[name] = rule
+    return rule
+
+
+def all_rules():
+    """登録済みの全ルールを登録順で返す"""
+    return list(_RULES.values())
+
+
+def get_rules(names=None):
+    """名前指定がなければ有効なルールを、指定があれば指定順でルールを返す"""
+    if names is None:
+        return [rule for rule in _RULES.values() if rule.enabled]
+
+    missing = [name for name in names if name not in _RULES]
+    if missing:
+        raise KeyError(f"Unknown rule(s): {', '.join(missing)}")
+    return [_RULES[name] for name in names]
+
+
+def find_files(root, suffixes=('.ts',)):
+    """rootを一度だけ走査し、suffixesに一致するファイルを安定した順序で列挙する"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith(suffixes):
+                yield os.path.join(dirpath, filename)
+
+
+class RuleStats:
+    """ルールごとの集計: 実行したファイル数 / 変更したファイル数 / 置換箇所数 / 変更バイト数 / 所要時間"""
+
+    __slots__ = ('checked', 'matched', 'substitutions', 'bytes_changed', 'seconds')
+
+    def __init__(self):
+        self.checked = 0
+        self.matched = 0
+        self.substitutions = 0
+        self.bytes_changed = 0
+        self.seconds = 0.0
+
+    def merge(self, other):
+        self.checked += other.checked
+        self.matched += other.matched
+        self.substitutions += other.substitutions
+        self.bytes_changed += other.bytes_changed
+        self.seconds += other.seconds
+
+
+def _count_changes(before, after):
+    """行単位の差分から (置換箇所数, 変更バイト数) を求める"""
+    old_lines = before.splitlines(True)
+    new_lines = after.splitlines(True)
+    substitutions = 0
+    changed = 0
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            continue
+        substitutions += 1
+        changed += max(len(''.join(old_lines[i1:i2]).encode('utf-8')), len(''.join(new_lines[j1:j2]).encode('utf-8')))
+    return substitutions, changed
+
+
+# ルールの適用後にまとめて行うimportの追加の、時間の集計上の名前（ルール名とは重ならない）
+IMPORTS_STEP = '<imports>'
+
+
+class BudgetExceeded(Exception):
+    """1ファイルあたりの処理時間の上限を超えた"""
+
+    def __init__(self, rule_name, elapsed):
+        super().__init__(f"time budget exceeded after rule '{rule_name}' ({elapsed * 1000:.1f} ms)")
+        self.rule_name = rule_name
+        self.elapsed = elapsed
+
+
+def apply_rules(content, file_path, rules, rule_stats=None, timings=None, budget=None):
+    """メモリ上のテキストにルールを順番に適用し、(新しいcontent, 変更を加えたルール名) を返す
+
+    アンカーを宣言したルールは、1回の多パターン検索で見つかったアンカーを含む場合だけ実行する。
+    前のルールが内容を変えた場合は、後続ルールのためにアンカーを検索し直す。
+    rule_stats（ルール名 -> RuleStats）を渡すとルールごとの実行時間と変更量を加算し、
+    timings（list）を渡すと (ルール名, 秒) を実行順に追加する。
+    budget（秒）を超えた場合は次のルールに進まず BudgetExceeded を送出する（実行中のルールは中断できない）。
+    """
+    index = index_for(rules)
+    measure = rule_stats is not None or timings is not None or budget is not None
+    hits = None
+    applied = []
+    elapsed = 0.0
+    # 適用対象になったルールが必要とするimport（ローカル名 -> (モジュール, ルール名)）
+    imports = {}
+    for rule in rules:
+        if not rule.applies_to(file_path):
+            continue
+        if rule.anchors is not None:
+            if hits is None:
+                hits = index.search(content)
+            if rule.anchors.isdisjoint(hits):
+                continue
+        if rule.imports:
+            for name, module in rule.imports.items():
+                imports.setdefault(name, (module, rule.name))
+        if rule.edit is None:
+            if measure:
+                if timings is not None:
+                    timings.append((rule.name, 0.0))
+                _record_rule(rule_stats, rule.name, 0.0, content, content)
+            continue
+
+        if not measure:
+            new_content = rule.edit(content, file_path)
+        else:
+            started = time.perf_counter()
+            new_content = rule.edit(content, file_path)
+            seconds = time.perf_counter() - started
+            elapsed += seconds
+            if timings is not None:
+                timings.append((rule.name, seconds))
+            _record_rule(rule_stats, rule.name, seconds, content, new_content)
+            if budget is not None and elapsed > budget:
+                raise BudgetExceeded(rule.name, elapsed)
+
+        if new_content != content:
+            applied.append(rule.name)
+            content = new_content
+            hits = None
+
+    if imports:
+        # importは全ルールの適用後にまとめて1回だけ解析・追加する
+        started = time.perf_counter()
+        new_content, added = ensure_imports(content, {name: module for name, (module, _) in imports.items()})
+        seconds = time.perf_counter() - started
+        # 時間は IMPORTS_STEP、変更は追加した名前を要求したルール（なければ最初に要求したルール）のものとして数える
+        owners = list(dict.fromkeys(imports[name][1] for name in added)) or [next(iter(imports.values()))[1]]
+        if measure:
+            elapsed += seconds
+            if timings is not None:
+                timings.append((IMPORTS_STEP, seconds))
+            _record_rule(rule_stats, IMPORTS_STEP, seconds, content, content)
+            # チェック数と変更ファイル数はルール本体の実行時に数えている（変更が初めてなら変更ファイル数のみ加算）
+            _record_rule(rule_stats, owners[0], 0.0, content, new_content,
+                         count_check=False, count_match=owners[0] not in applied)
+            if budget is not None and elapsed > budget:
+                raise BudgetExceeded(IMPORTS_STEP, elapsed)
+        if new_content != content:
+            applied.extend(name for name in owners if name not in applied)
+            content = new_content
+    return content, applied
+
+
+def _record_rule(rule_stats, name, seconds, before, after, count_check=True, count_match=True):
+    """ルールの実行時間と変更量を rule_stats に加算する"""
+    if rule_stats is None:
+        return
+    entry = rule_stats.setdefault(name, RuleStats())
+    entry.seconds += seconds
+    if count_check:
+        entry.checked += 1
+    if after != before:
+        if count_match:
+            entry.matched += 1
+        substitutions, changed = _count_changes(before, after)
+        entry.substitutions += substitutions
+        entry.bytes_changed += changed
+
+
+class FileOutcome:
+    """1ファイル分の処理結果（ワーカープロセスから親プロセスへ返せるよう単純な値のみを持つ）"""
+
+    __slots__ = ('file_path', 'applied', 'written', 'clean', 'error', 'diff', 'rule_stats',
+                 'timings', 'seconds', 'over_budget')
+
+    def __init__(self, file_path, applied=(), written=False, clean=None, error=None, diff=None, rule_stats=None,
+                 timings=None, seconds=0.0, over_budget=None):
+        self.file_path = file_path
+        self.applied = list(applied)
+        self.written = written
+        # 書き換え不要と確認できた場合の (size, mtime_ns, content hash)
+        self.clean = clean
+        self.error = error
+        # dry-run時の unified diff
+        self.diff = diff
+        self.rule_stats = rule_stats
+        # プロファイル時の [(ルール名, 秒)] と、読み込みから書き込みまでのファイル全体の秒数
+        self.timings = timings
+        self.seconds = seconds
+        # 時間上限を超えてスキップした場合の BudgetExceeded のメッセージ
+        self.over_budget = over_budget
+
+
+class RunOptions:
+    """ワーカーにも渡す実行オプション"""
+
+    __slots__ = ('track_clean', 'dry_run', 'collect_stats', 'profile', 'budget')
+
+    def __init__(self, track_clean=False, dry_run=False, collect_stats=False, profile=False, budget=None):
+        self.track_clean = track_clean
+        self.dry_run = dry_run
+        self.collect_stats = collect_stats
+        # ファイル×ルール単位の時間計測
+        self.profile = profile
+        # 1ファイルあたりの時間上限（秒）
+        self.budget = budget
+
+
+def _clean_entry(file_path, content):
+    st = os.stat(file_path)
+    return (st.st_size, st.st_mtime_ns, content_hash(content.encode('utf-8')))
+
+
+def unified_diff(file_path, before, after):
+    """git diff と同じ a/ b/ 形式の unified diff を返す"""
+    return ''.join(difflib.unified_diff(before.splitlines(True), after.splitlines(True),
+                                        fromfile=f'a/{file_path}', tofile=f'b/{file_path}'))
+
+
+def _process(file_path, rules, known_hash=None, options=None):
+    """ファイルを一度読み込み、全ルール適用後に変更があれば一度だけ書き戻してFileOutcomeを返す
+
+    dry-runの場合は書き込まずに unified diff を返す。
+    """
+    options = options or RunOptions()
+    started = time.perf_counter()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if known_hash is not None and content_hash(content.encode('utf-8')) == known_hash:
+        # mtimeだけ変わった既知のクリーンなファイル
+        return FileOutcome(file_path, clean=_clean_entry(file_path, content))
+
+    rule_stats = {} if options.collect_stats else None
+    timings = [] if options.profile else None
+    try:
+        new_content, applied = apply_rules(content, file_path, rules, rule_stats, timings, options.budget)
+    except BudgetExceeded as e:
+        # 上限を超えたファイルは書き換えずにスキップし、次回も再処理されるようクリーンとは記録しない
+        return FileOutcome(file_path, rule_stats=rule_stats, timings=timings,
+                           seconds=time.perf_counter() - started, over_budget=str(e))
+    changed = new_content != content
+
+    written = False
+    diff = None
+    if changed and options.dry_run:
+        diff = unified_diff(file_path, content, new_content)
+    elif changed:
+        written = write_if_changed(file_path, new_content)
+
+    clean = None
+    # ルールを再適用しても変化しない（不動点に達した）ファイルだけをクリーンとして記録する
+    if options.track_clean:
+        if not applied:
+            clean = _clean_entry(file_path, content)
+        elif not options.dry_run and not apply_rules(new_content, file_path, rules)[1]:
+            clean = _clean_entry(file_path, new_content)
+    return FileOutcome(file_path, applied, written, clean, diff=diff, rule_stats=rule_stats,
+                       timings=timings, seconds=time.perf_counter() - started)
+
+
+def _record(outcome, stats, manifest, rule_stats=None):
+    """FileOutcomeを集計とマニフェストに反映する（常に親プロセスで実行）"""
+    if stats is not None:
+        stats.record(outcome.file_path, outcome.written, pending=outcome.diff is not None,
+                     over_budget=outcome.over_budget is not None)
+    if manifest is not None:
+        if outcome.clean is not None:
+            manifest.mark_clean(outcome.file_path, *outcome.clean)
+        else:
+            manifest.forget(outcome.file_path)
+    if rule_stats is not None and outcome.rule_stats:
+        for name, entry in outcome.rule_stats.items():
+            rule_stats.setdefault(name, RuleStats()).merge(entry)
+
+
+def process_file(file_path, rules, stats=None, manifest=None):
+    """ファイルを一度読み込み、全ルール適用後に変更があれば一度だけ書き戻す"""
+    known_hash = manifest.known_hash(file_path) if manifest is not None else None
+    outcome = _process(file_path, rules, known_hash, RunOptions(track_clean=manifest is not None))
+    _record(outcome, stats, manifest)
+    return outcome.applied
+
+
+def select_files(files, suffixes):
+    """明示されたファイル一覧から、存在してsuffixesに一致するものを安定した順序で返す"""
+    return sorted({os.path.normpath(f) for f in files if f.endswith(suffixes) and os.path.isfile(f)})
+
+
+# ワーカープロセス内で使うルール（_init_workerで設定）
+_worker_rules = None
+
+
+def _init_worker(rule_names, loader):
+    """ワーカーの初期化: spawn起動でレジストリが空の場合はloaderでルールを登録し直す"""
+    global _worker_rules
+    if not _RULES and loader is not None:
+        loader()
+    _worker_rules = get_rules(rule_names)
+
+
+def _process_many(items, rules, options):
+    """(file_path, known_hash) の列を順に処理してFileOutcomeを返す"""
+    for file_path, known_hash in items:
+        try:
+            yield _process(file_path, rules, known_hash, options)
+        except (OSError, UnicodeDecodeError) as e:
+            yield FileOutcome(file_path, error=str(e))
+
+
+def _process_batch(args):
+    """ワーカー側: バッチを処理してFileOutcomeのリストを返す"""
+    options, batch = args
+    return list(_process_many(batch, _worker_rules, options))
+
+
+def _batches(items, jobs):
+    """ワーカー間で偏りが出にくいよう、ジョブ数の4倍程度のバッチに分割する"""
+    size = max(1, -(-len(items) // (jobs * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _run_parallel(work, rules, jobs, options, loader):
+    """プロセスプールでバッチを処理し、入力順（=安定した順序）でFileOutcomeを返す"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    names = [rule.name for rule in rules]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(names, loader)) as pool:
+        for outcomes in pool.map(_process_batch, [(options, batch) for batch in _batches(work, jobs)]):
+            yield from outcomes
+
+
+def run(root, rules, stats=None, manifest=None, files=None, jobs=1, loader=None,
+        dry_run=False, rule_stats=None, on_outcome=None, profile=False, budget=None):
+    """root配下（またはfilesのみ）にルールを適用し、変更したファイルの [(file_path, [rule名, ...])] を返す
+
+    manifestを渡すと、前回クリーンと確認したファイルのうちsize/mtimeが変わっていないものは開かずにスキップする。
+    jobs > 1 の場合はプロセスプールで並列に処理する（結果と出力順は逐次実行と同一）。
+    loaderはspawn起動のワーカーでルールを登録し直すための関数。
+    dry_run=True ではファイルを書き換えず、変更内容を FileOutcome.diff に入れる。
+    rule_stats（dict）を渡すとルール名 -> RuleStats の集計を書き込む。
+    on_outcomeは各ファイルの処理が終わるたびに（入力順で）呼ばれるので、diffを逐次出力できる。
+    profile=True で FileOutcome.timings にファイル×ルールの時間を入れ、
+    budget（秒）を超えたファイルは書き換えずにスキップして FileOutcome.over_budget に理由を入れる。
+    """
+    suffixes = tuple(sorted({suffix for rule in rules for suffix in rule.suffixes}))
+    results = []
+    if not suffixes:
+        return results
+
+    targets = find_files(root, suffixes) if files is None else select_files(files, suffixes)
+    work = []
+    for file_path in targets:
+        known_hash = None
+        if manifest is not None:
+            try:
+                if manifest.is_fresh(file_path, os.stat(file_path)):
+                    continue
+            except OSError as e:
+                print(f"Error processing {file_path}: {e}")
+                continue
+            known_hash = manifest.known_hash(file_path)
+        work.append((file_path, known_hash))
+
+    options = RunOptions(manifest is not None, dry_run, rule_stats is not None, profile, budget)
+    if jobs > 1 and len(work) > 1:
+        outcomes = _run_parallel(work, rules, jobs, options, loader)
+    else:
+        outcomes = _process_many(work, rules, options)
+
+    for outcome in outcomes:
+        if outcome.error is not None:
+            print(f"Error processing {outcome.file_path}: {outcome.error}")
+            continue
+        _record(outcome, stats, manifest, rule_stats)
+        if on_outcome is not None:
+            on_outcome(outcome)
+        if outcome.applied:
+            results.append((outcome.file_path, outcome.applied))
+    return results
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+codemodのインクリメンタル実行用マニフェスト
+
+(path, size, mtime, content hash) を「このルールセットでは書き換え不要」として保存する。
+size/mtimeが一致するファイルは開かずにスキップし、mtimeだけ変わったファイルは
+内容ハッシュが一致すればルールを実行せずにスキップする。
+ルールセットのバージョン（ルール名とcoding-helpers配下の*.pyの内容のハッシュ）ごとに別ファイルに保存するため、
+ルールを変更・選択し直した場合や、エンティティの create() のシグネチャが変わった場合は自動的に全ファイルが再処理される。
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+from create_calls import entity_signatures
+from file_writer import atomic_write
+
+MANIFEST_FORMAT = 1
+DEFAULT_CACHE_DIR = '.codemod-cache'
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def ruleset_version(rules):
+    """ルール名・ルール実装（coding-helpers配下の*.py）・エンティティのシグネチャからルールセットのバージョンを計算"""
+    digest = hashlib.sha256(f'format={MANIFEST_FORMAT}'.encode())
+    for rule in rules:
+        digest.update(b'\0' + rule.name.encode())
+    digest.update(b'\0' + json.dumps(entity_signatures(), sort_keys=True).encode())
+    for source_path in sorted(glob.glob(os.path.join(SCRIPT_DIR, '*.py'))):
+        with open(source_path, 'rb') as f:
+            digest.update(b'\0' + f.read())
+    return digest.hexdigest()
+
+
+class Manifest:
+    """書き換え不要と確認済みのファイルの記録"""
+
+    def __init__(self, path, ruleset, entries=None):
+        self.path = path
+        self.ruleset = ruleset
+        self.entries = entries if entries is not None else {}
+        self.base_dir = os.path.dirname(os.path.abspath(path))
+        self.hits = 0
+        self.dirty = False
+
+    @classmethod
+    def load(cls, cache_dir, rules):
+        """ルールセットに対応するマニフェストを読み込む（存在しない・壊れている場合は空）"""
+        ruleset = ruleset_version(rules)
+        path = os.path.join(cache_dir, f'manifest-{ruleset[:16]}.json')
+        entries = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == MANIFEST_FORMAT and data.get('ruleset') == ruleset:
+                entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return cls(path, ruleset, entries)
+
+    def _key(self, file_path):
+        return os.path.relpath(os.path.abspath(file_path), self.base_dir)
+
+    def is_fresh(self, file_path, st):
+        """size/mtimeが記録と一致すれば（ファイルを開かずに）書き換え不要と判定"""
+        entry = self.entries.get(self._key(file_path))
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            self.hits += 1
+            return True
+        return False
+
+    def known_hash(self, file_path):
+        """記録済みの内容ハッシュ（mtimeが変わっていてもこれと一致すれば書き換え不要）"""
+        entry = self.entries.get(self._key(file_path))
+        return entry[2] if entry is not None else None
+
+    def mark_clean(self, file_path, size, mtime_ns, digest):
+        entry = [size, mtime_ns, digest]
+        key = self._key(file_path)
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.dirty = True
+
+    def forget(self, file_path):
+        if self.entries.pop(self._key(file_path), None) is not None:
+            self.dirty = True
+
+    def save(self):
+        """変更があればマニフェストをアトミックに保存する"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        data = {'format': MANIFEST_FORMAT, 'ruleset': self.ruleset, 'files': self.entries}
+        atomic_write(self.path, json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+        self.dirty = False
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+codemodのプロファイル集計
+
+codemod_engine.run(..., profile=True) が返すファイル×ルールの時間（FileOutcome.timings）を集め、
+遅いファイル・遅い (ファイル, ルール) の上位N件と時間上限を超えたファイルを表示・JSON出力する。
+JSONにはコミットと日時を含めるので、実行ごとに保存すれば性能の推移を追える。
+"""
+
+import datetime
+import heapq
+import itertools
+import json
+import subprocess
+
+from file_writer import atomic_write
+
+PROFILE_FORMAT = 1
+
+
+class Profile:
+    """ファイル×ルールの時間の集計（上位N件だけを保持するので大きなツリーでもメモリは一定）"""
+
+    def __init__(self, top=10):
+        self.top = top
+        self.files = 0
+        self.seconds = 0.0
+        self.over_budget = []
+        # ルール名 -> [実行ファイル数, 秒]
+        self.rules = {}
+        # (秒, 通し番号, ...) の最小ヒープ。通し番号で同じ秒数の比較を安定させる
+        self._slow_files = []
+        self._slow_pairs = []
+        self._counter = itertools.count()
+
+    def _push(self, heap, seconds, item):
+        entry = (seconds, next(self._counter), item)
+        if len(heap) < self.top:
+            heapq.heappush(heap, entry)
+        elif seconds > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    def add(self, outcome):
+        """FileOutcomeの計測結果を加える"""
+        self.files += 1
+        self.seconds += outcome.seconds
+        if self.top > 0:
+            self._push(self._slow_files, outcome.seconds, outcome.file_path)
+        for rule_name, seconds in outcome.timings or ():
+            entry = self.rules.setdefault(rule_name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            if self.top > 0:
+                self._push(self._slow_pairs, seconds, (outcome.file_path, rule_name))
+        if outcome.over_budget is not None:
+            self.over_budget.append((outcome.file_path, outcome.over_budget))
+
+    def slowest_files(self):
+        """[(file_path, 秒)] を遅い順で返す"""
+        return [(path, seconds) for seconds, _, path in sorted(self._slow_files, reverse=True)]
+
+    def slowest_pairs(self):
+        """[(file_path, ルール名, 秒)] を遅い順で返す"""
+        return [(path, rule, seconds) for seconds, _, (path, rule) in sorted(self._slow_pairs, reverse=True)]
+
+    def print_report(self, out):
+        """上位N件と時間上限を超えたファイルを表示"""
+        print(f"Profiled {self.files} files in {self.seconds * 1000:.1f} ms", file=out)
+        if self._slow_files:
+            print(f"Slowest files (top {self.top}):", file=out)
+            for path, seconds in self.slowest_files():
+                print(f"  {seconds * 1000:>9.2f} ms  {path}", file=out)
+        if self._slow_pairs:
+            print(f"Slowest (file, rule) pairs (top {self.top}):", file=out)
+            for path, rule, seconds in self.slowest_pairs():
+                print(f"  {seconds * 1000:>9.2f} ms  {rule:<26} {path}", file=out)
+        for path, reason in self.over_budget:
+            print(f"Over budget (skipped): {path}: {reason}", file=out)
+
+    def to_dict(self, rule_stats=None, budget=None):
+        """JSON出力用のdict（rule_stats（ルール名 -> RuleStats）を渡すと変更量も含める）"""
+        rules = {}
+        for name, (checked, seconds) in sorted(self.rules.items()):
+            rules[name] = {'checked': checked, 'ms': round(seconds * 1000, 3)}
+            entry = (rule_stats or {}).get(name)
+            if entry is not None:
+                rules[name].update(matched=entry.matched, substitutions=entry.substitutions,
+                                   bytes_changed=entry.bytes_changed)
+        return {
+            'format': PROFILE_FORMAT,
+            'generated_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_head(),
+            'files': self.files,
+            'total_ms': round(self.seconds * 1000, 3),
+            'budget_ms': None if budget is None else round(budget * 1000, 3),
+            'rules': rules,
+            'slowest_files': [{'file': path, 'ms': round(seconds * 1000, 3)}
+                              for path, seconds in self.slowest_files()],
+            'slowest_pairs': [{'file': path, 'rule': rule, 'ms': round(seconds * 1000, 3)}
+                              for path, rule, seconds in self.slowest_pairs()],
+            'over_budget': [{'file': path, 'reason': reason} for path, reason in self.over_budget],
+        }
+
+    def write_json(self, path, rule_stats=None, budget=None):
+        data = self.to_dict(rule_stats, budget)
+        atomic_write(path, (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+
+def git_head():
+    """現在のコミットハッシュ（gitが使えない場合は None）"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+codemodの監視モード（codemod.py --watch）
+
+ルールとマニフェストをメモリに保持したまま、保存されたファイルの変更イベントを待ち、
+debounce時間内にまとめて届いたファイルだけにルールを適用する。
+Linuxでは inotify（ctypes経由、追加パッケージ不要）でイベントを受け取り、
+使えない環境では一定間隔でファイルのsize/mtimeを比較するポーリングに切り替える。
+src/domain/entities のエンティティが保存された場合は create() のシグネチャを読み直し、
+以降の保存に新しいシグネチャを使う。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import codemod_engine
+import trigger_index
+from codemod_manifest import Manifest
+from create_calls import ENTITIES_DIR, anchors, entity_signatures, reload_signatures
+
+# inotifyのイベント
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct('iIII')
+
+DEFAULT_DEBOUNCE_MS = 100
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+def _is_temporary(name):
+    """atomic_write やエディタの一時ファイル"""
+    return name.startswith('.') or name.endswith(('.tmp', '~', '.swp'))
+
+
+class InotifyWatcher:
+    """inotifyで root 配下のディレクトリを監視する"""
+
+    name = 'inotify'
+
+    def __init__(self, root):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        self.overflowed = False
+        self._watch_tree(root)
+
+    def _watch_tree(self, root):
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in codemod_engine.SKIP_DIRS]
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed: {dirpath}')
+            self.dirs[wd] = dirpath
+
+    def poll(self, timeout):
+        """timeout秒（Noneなら無期限）までイベントを待ち、変更されたファイルのパスの集合を返す"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', errors='replace')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in codemod_engine.SKIP_DIRS:
+                    # 新しいディレクトリ（と、監視を始める前に作られた中身）を監視に加える
+                    self._watch_tree(path)
+                    paths.update(codemod_engine.find_files(path, ('.ts',)))
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and not _is_temporary(name):
+                paths.add(path)
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """inotifyが使えない環境用: interval秒ごとに root 配下の *.ts のsize/mtimeを比較する"""
+
+    name = 'polling'
+
+    def __init__(self, root, interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.overflowed = False
+        self.snapshot = self._stat_all()
+
+    def _stat_all(self):
+        snapshot = {}
+        for path in codemod_engine.find_files(self.root, ('.ts',)):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._stat_all()
+        changed = {path for path, key in current.items() if self.snapshot.get(path) != key}
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(root, polling=False, interval=DEFAULT_POLL_INTERVAL):
+    """inotifyのwatcherを作る（使えなければポーリング）"""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"Note: inotify is not available ({e}); falling back to polling", file=sys.stderr)
+    return PollingWatcher(root, interval)
+
+
+def _is_entity_source(path):
+    return os.path.dirname(os.path.abspath(path)) == ENTITIES_DIR and not path.endswith('.test.ts')
+
+
+def refresh_signatures(rules, log):
+    """エンティティのcreate()のシグネチャを読み直し、変わっていればTrueを返す"""
+    before = dict(entity_signatures())
+    after = reload_signatures()
+    if after == before:
+        return False
+    print(f"Entity signatures changed: {', '.join(f'{k}({v})' for k, v in sorted(after.items()))}", file=log)
+    # IdGeneratorを受け取るエンティティが増減した場合、全エンティティを対象にするルールのアンカーを更新する
+    names = set(after)
+    for rule in rules:
+        if rule.anchors is not None and rule.anchors == frozenset(anchors(before)):
+            rule.anchors = frozenset(anchors(names))
+    trigger_index.clear_cache()
+    return True
+
+
+def watch(root, rules, cache_dir, debounce=DEFAULT_DEBOUNCE_MS / 1000, polling=False,
+          interval=DEFAULT_POLL_INTERVAL, dry_run=False, on_outcome=None, log=sys.stdout):
+    """Ctrl+Cまで root 配下の保存を監視し、保存されたファイルにだけルールを適用する"""
+    manifest = Manifest.load(cache_dir, rules)
+    watcher = make_watcher(root, polling, interval)
+    print(f"Watching {root} ({watcher.name}, debounce {debounce * 1000:.0f} ms); press Ctrl+C to stop", file=log)
+
+    pending = set()
+    deadline = None
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            changed = watcher.poll(timeout)
+            if watcher.overflowed:
+                # イベントを取りこぼした場合は全ファイルを対象にする（マニフェストで未変更のものはスキップされる）
+                watcher.overflowed = False
+                changed = set(codemod_engine.find_files(root, ('.ts',)))
+            if changed:
+                pending |= changed
+                deadline = time.monotonic() + debounce
+                continue
+            if deadline is None or time.monotonic() < deadline:
+                continue
+
+            batch = sorted(pending)
+            pending = set()
+            deadline = None
+            started = time.perf_counter()
+            if any(_is_entity_source(path) for path in batch) and refresh_signatures(rules, log):
+                # 以前のシグネチャでクリーンと判定した記録は使えない
+                manifest.save()
+                manifest = Manifest.load(cache_dir, rules)
+            results = codemod_engine.run(root, rules, manifest=manifest, files=batch,
+                                         dry_run=dry_run, on_outcome=on_outcome)
+            manifest.save()
+            if results:
+                print(f"[{time.strftime('%H:%M:%S')}] {len(results)} file(s) fixed "
+                      f"in {(time.perf_counter() - started) * 1000:.1f} ms", file=log)
+    except KeyboardInterrupt:
+        print("Stopped watching", file=log)
+    finally:
+        watcher.close()
+        manifest.save()
+    return 0
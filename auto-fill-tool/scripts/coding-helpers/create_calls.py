@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+<Entity>.create(...) 呼び出しの共通ロケータ
+
+src/domain/entities/*.ts の `static create(...)` のシグネチャから IdGenerator を受け取るエンティティと
+その引数位置を求め、テストコード中の呼び出しのうち IdGenerator 引数だけが不足しているものに
+mockIdGenerator を追加する。ts_scanner の括弧対応で呼び出しの範囲を特定するため、
+複数行・ネストしたオブジェクト・expect(X.create({...})) のような式中の呼び出しでも
+その呼び出しの外側のコードを書き換えることはなく、ファイル全体を1回走査するだけで済む。
+"""
+
+import os
+import re
+
+from ts_scanner import find_calls, scan, split_arguments
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ENTITIES_DIR = os.path.join(os.path.dirname(os.path.dirname(SCRIPT_DIR)), 'src', 'domain', 'entities')
+ID_GENERATOR_ARGUMENT = 'mockIdGenerator'
+
+# エンティティのソースが見つからない場合に使うシグネチャ（エンティティ名 -> IdGenerator引数の位置）
+DEFAULT_SIGNATURES = {
+    'AutomationResult': 1,
+    'AutomationVariables': 1,
+    'StorageSyncConfig': 1,
+    'SyncResult': 1,
+}
+
+_signatures = None
+_patterns = {}
+
+
+def read_signatures(entities_dir=ENTITIES_DIR):
+    """entities_dir配下の `static create(...)` から {エンティティ名: IdGenerator引数の位置} を求める"""
+    signatures = {}
+    for filename in sorted(os.listdir(entities_dir)):
+        if not filename.endswith('.ts') or filename.endswith('.test.ts'):
+            continue
+        entity = filename[:-len('.ts')]
+        with open(os.path.join(entities_dir, filename), 'r', encoding='utf-8') as f:
+            content = f.read()
+        if f'class {entity}' not in content:
+            continue
+        result = scan(content)
+        for open_index, _ in find_calls(content, 'static create', result):
+            for position, (start, end) in enumerate(split_arguments(content, open_index, result)):
+                if re.search(r':\s*IdGenerator\b', content[start:end]):
+                    signatures[entity] = position
+                    break
+            break
+    return signatures
+
+
+def entity_signatures():
+    """IdGeneratorを受け取るエンティティのシグネチャ（初回にsrc/domain/entitiesから読み込んでキャッシュ）"""
+    global _signatures
+    if _signatures is None:
+        try:
+            _signatures = read_signatures()
+        except OSError:
+            _signatures = {}
+        if not _signatures:
+            _signatures = dict(DEFAULT_SIGNATURES)
+    return _signatures
+
+
+def reload_signatures():
+    """エンティティのソースが変わった場合に、キャッシュしたシグネチャを読み直す"""
+    global _signatures
+    _signatures = None
+    _patterns.clear()
+    return entity_signatures()
+
+
+def _call_pattern(entities):
+    pattern = _patterns.get(entities)
+    if pattern is None:
+        names = '|'.join(re.escape(entity) for entity in sorted(entities, key=len, reverse=True))
+        pattern = re.compile(rf'(?<![\w$.])({names})\s*\.\s*create\s*\(')
+        _patterns[entities] = pattern
+    return pattern
+
+
+def anchors(entities=None):
+    """trigger_index用のアンカー文字列"""
+    return tuple(f'{entity}.create' for entity in sorted(entities or entity_signatures()))
+
+
+def find_create_calls(content, entities=None, result=None):
+    """コード中の <Entity>.create(...) を [(エンティティ名, 開き括弧の位置, [(引数start, end)])] で出現順に返す
+
+    entitiesで対象のエンティティ名を絞り込める。文字列やコメント中の出現は無視される。
+    """
+    signatures = entity_signatures()
+    names = tuple(sorted(signatures if entities is None else (e for e in entities if e in signatures)))
+    if not names:
+        return []
+    if result is None:
+        result = scan(content)
+    calls = []
+    for match in _call_pattern(names).finditer(content):
+        open_index = match.end() - 1
+        if open_index in result.pairs:
+            calls.append((match.group(1), open_index, split_arguments(content, open_index, result)))
+    return calls
+
+
+def add_id_generator(content, entities=None, argument=ID_GENERATOR_ARGUMENT):
+    """IdGenerator引数だけが不足している <Entity>.create(...) に argument を追加したcontentを返す
+
+    引数の数がIdGeneratorの位置と一致する（＝直前までの引数は揃っている）呼び出しだけを対象にするため、
+    追加済みの呼び出しや引数が足りない呼び出しは変更しない（何度実行しても結果は変わらない）。
+    """
+    if '.create' not in content:
+        return content
+
+    signatures = entity_signatures()
+    insertions = []
+    for entity, open_index, arguments in find_create_calls(content, entities):
+        if len(arguments) != signatures[entity]:
+            continue
+        if not arguments:
+            insertions.append((open_index + 1, argument))
+            continue
+        start, end = arguments[-1]
+        # 最後の引数の末尾の空白の前に追加する（末尾カンマや閉じ括弧の位置はそのまま）
+        while end > start and content[end - 1].isspace():
+            end -= 1
+        insertions.append((end, f', {argument}'))
+
+    if not insertions:
+        return content
+
+    parts = []
+    last = 0
+    for index, text in sorted(insertions):
+        parts.append(content[last:index])
+        parts.append(text)
+        last = index
+    parts.append(content[last:])
+    return ''.join(parts)
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+エラーコードレジストリ（validate-and-test.sh の list / reserve / validate / generate / generate-docs の実装）
+
+各ロケールの messages.json を1回だけ読み込み、E_<CATEGORY>_<NNNN>_(USER|DEV|RESOLUTION) のキーを
+カテゴリと番号で索引したうえで、すべての問い合わせをメモリ上の索引から答える。
+キーごとに jq を起動していたシェル版と同じ出力になる。
+
+使い方（通常は validate-and-test.sh 経由）:
+    python3 scripts/coding-helpers/error_codes.py list
+    python3 scripts/coding-helpers/error_codes.py reserve XPATH
+    python3 scripts/coding-helpers/error_codes.py validate
+    python3 scripts/coding-helpers/error_codes.py generate-docs
+"""
+
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+
+from file_writer import atomic_write
+from source_index import SourceIndex, default_cache_path
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+
+ERROR_KEY = re.compile(r'^E_([A-Z_]+)_([0-9]+)_(USER|DEV|RESOLUTION)$')
+CATEGORY_NAME = re.compile(r'^[A-Z_]+$')
+SUFFIXES = ('USER', 'DEV', 'RESOLUTION')
+
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+CYAN = '\033[0;36m'
+NC = '\033[0m'
+
+DOCS_FOOTER = [
+    "*This documentation is automatically generated by `npm run error:docs` command.*",
+    "*Generated on: {timestamp}*",
+    "*Triggered by: GitHub Actions workflow on push to main branch*",
+    "*Source: scripts/validate-and-test.sh generate-docs*",
+]
+
+# カテゴリ別のメッセージテンプレート（{code} は予約したエラーコード）
+CATEGORY_TEMPLATES = {
+    'XPATH': {
+        'en': ('[TODO] XPath operation failed',
+               '[TODO] XPath selector error in {code}',
+               '[TODO] Check XPath selector or wait for element to load'),
+        'ja': ('[TODO] XPath操作が失敗しました',
+               '[TODO] {code}でXPathセレクターエラー',
+               '[TODO] XPathセレクターを確認するか、要素の読み込み完了を待ってください'),
+    },
+    'AUTH': {
+        'en': ('[TODO] Authentication failed',
+               '[TODO] Authentication error in {code}',
+               '[TODO] Check credentials or authentication settings'),
+        'ja': ('[TODO] 認証に失敗しました',
+               '[TODO] {code}で認証エラー',
+               '[TODO] 認証情報または認証設定を確認してください'),
+    },
+    'USER': {
+        'en': ('[TODO] User operation failed',
+               '[TODO] User management error in {code}',
+               '[TODO] Check user permissions or input data'),
+        'ja': ('[TODO] ユーザー操作が失敗しました',
+               '[TODO] {code}でユーザー管理エラー',
+               '[TODO] ユーザー権限または入力データを確認してください'),
+    },
+    'STORAGE': {
+        'en': ('[TODO] Storage operation failed',
+               '[TODO] Storage access error in {code}',
+               '[TODO] Check storage permissions or available space'),
+        'ja': ('[TODO] ストレージ操作が失敗しました',
+               '[TODO] {code}でストレージアクセスエラー',
+               '[TODO] ストレージ権限または利用可能容量を確認してください'),
+    },
+    'SYNC': {
+        'en': ('[TODO] Synchronization failed',
+               '[TODO] Data sync error in {code}',
+               '[TODO] Check network connection or sync configuration'),
+        'ja': ('[TODO] 同期に失敗しました',
+               '[TODO] {code}でデータ同期エラー',
+               '[TODO] ネットワーク接続または同期設定を確認してください'),
+    },
+}
+DEFAULT_TEMPLATES = {
+    'en': ('[TODO] {category} operation failed',
+           '[TODO] {category} error in {code}',
+           '[TODO] Check {lower} configuration or input'),
+    'ja': ('[TODO] {category}操作が失敗しました',
+           '[TODO] {code}で{category}エラー',
+           '[TODO] {lower}設定または入力を確認してください'),
+}
+
+
+def log_info(message):
+    print(f"{BLUE}ℹ️  {message}{NC}")
+
+
+def log_success(message):
+    print(f"{GREEN}✅ {message}{NC}")
+
+
+def log_warning(message):
+    print(f"{YELLOW}⚠️  {message}{NC}")
+
+
+def log_error(message):
+    print(f"{RED}❌ {message}{NC}")
+
+
+def log_header(message):
+    print(f"{CYAN}📋 {message}{NC}")
+
+
+class ErrorCodeRegistry:
+    """1ロケール分のmessages.jsonと、エラーコードのカテゴリ・番号の索引"""
+
+    def __init__(self, messages, path=None):
+        self.messages = messages
+        self.path = path
+        # カテゴリ -> {番号: エラーコード}
+        self.categories = {}
+        codes = set()
+        for key in messages:
+            match = ERROR_KEY.match(key)
+            if match:
+                code = key[:-len(match.group(3)) - 1]
+                codes.add(code)
+                self.categories.setdefault(match.group(1), {})[int(match.group(2))] = code
+        self.codes = sorted(codes)
+
+    @classmethod
+    def load(cls, path):
+        """messages.jsonを読み込む（存在しない場合は空）"""
+        if not os.path.isfile(path):
+            return cls({}, path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), path)
+
+    @staticmethod
+    def category_of(code):
+        return code[2:code.rindex('_')]
+
+    def has(self, key):
+        return key in self.messages
+
+    def message(self, code, suffix):
+        """<code>_<suffix> の message（未設定・null・オブジェクトでない場合は None）"""
+        entry = self.messages.get(f'{code}_{suffix}')
+        if not isinstance(entry, dict):
+            return None
+        message = entry.get('message')
+        return None if message is None or message is False else message
+
+    def is_set(self, code, suffix):
+        """キーが存在し、値が null / false でないか"""
+        value = self.messages.get(f'{code}_{suffix}')
+        return value is not None and value is not False
+
+    def next_code(self, category):
+        """カテゴリ内で最初に空いている番号のエラーコード"""
+        used = self.categories.get(category, {})
+        number = 1
+        while number in used:
+            number += 1
+        return f'E_{category}_{number:04d}'
+
+    def add(self, code, user, dev, resolution):
+        for suffix, message in zip(SUFFIXES, (user, dev, resolution)):
+            self.messages[f'{code}_{suffix}'] = {'message': message}
+        self.categories.setdefault(self.category_of(code), {})[int(code.rsplit('_', 1)[1])] = code
+        self.codes = sorted(set(self.codes) | {code})
+
+    def save(self):
+        """jq . と同じ書式（2スペースインデント、キー順維持、非ASCIIはそのまま）で保存する"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        data = json.dumps(self.messages, indent=2, ensure_ascii=False) + '\n'
+        atomic_write(self.path, data.encode('utf-8'))
+
+
+class Project:
+    """プロジェクト内のパス"""
+
+    def __init__(self, root):
+        self.root = root
+        self.locales_dir = os.path.join(root, 'public', '_locales')
+        self.docs_dir = os.path.join(root, 'docs')
+
+    def messages_path(self, locale):
+        return os.path.join(self.locales_dir, locale, 'messages.json')
+
+
+def category_templates(category, code):
+    """(en, ja) それぞれの (USER, DEV, RESOLUTION) テンプレート"""
+    templates = CATEGORY_TEMPLATES.get(category, DEFAULT_TEMPLATES)
+    values = {'code': code, 'category': category, 'lower': category.lower()}
+    return tuple(tuple(t.format(**values) for t in templates[locale]) for locale in ('en', 'ja'))
+
+
+def extract_used_error_codes(project):
+    """テスト以外のsrc配下で new StandardError('<code>' ...) に渡しているエラーコード
+
+    source_index の索引（変更のないファイルはキャッシュから再利用）を使う。
+    """
+    index = SourceIndex.build(project.root, cache_path=default_cache_path(project.root))
+    index.save()
+    return sorted(code for code, places in index.error_codes().items()
+                  if any(path.startswith('src/') for path, _ in places))
+
+
+def list_error_codes(project):
+    log_header("Error Codes List")
+    print()
+
+    registry = ErrorCodeRegistry.load(project.messages_path('en'))
+    if not registry.codes:
+        print("No error codes found.")
+        return 0
+
+    current_category = None
+    for code in registry.codes:
+        category = registry.category_of(code)
+        if category != current_category:
+            print()
+            print(f"{CYAN}🏷️  {category}:{NC}")
+            current_category = category
+
+        print(f"  {YELLOW}{code}{NC}:")
+        for suffix, label in zip(SUFFIXES, ('USER', 'DEV', 'RES')):
+            message = registry.message(code, suffix)
+            if message and message != 'null':
+                print(f"    {GREEN}✅ {label}{NC}: {message}")
+            else:
+                print(f"    {RED}❌ {label}{NC}: {RED}(not set){NC}")
+        print()
+
+    print()
+    print(f"📊 Total: {len(registry.codes)} error codes")
+    return 0
+
+
+def reserve_error_code(project, category, prog):
+    if not category:
+        log_error(f"Usage: {prog} reserve <category>")
+        print("   Examples:")
+        for example in ('XPATH', 'AUTH', 'USER', 'STORAGE', 'SYNC'):
+            print(f"     {prog} reserve {example}")
+        return 1
+
+    if not CATEGORY_NAME.match(category):
+        log_error("Category must contain only uppercase letters and underscores")
+        print("   Valid examples: XPATH, AUTH, USER_MANAGEMENT, STORAGE_SYNC")
+        return 1
+
+    en = ErrorCodeRegistry.load(project.messages_path('en'))
+    ja = ErrorCodeRegistry.load(project.messages_path('ja'))
+    new_code = en.next_code(category)
+    en_messages, ja_messages = category_templates(category, new_code)
+    en.add(new_code, *en_messages)
+    ja.add(new_code, *ja_messages)
+    en.save()
+    ja.save()
+
+    log_success(f"Reserved error code: {new_code}")
+    log_info(f"Category-specific templates created for {category}")
+    log_info("Please update the messages with actual content")
+    print()
+    print("📋 Created keys:")
+    for suffix in SUFFIXES:
+        print(f"   {new_code}_{suffix}")
+    return 0
+
+
+def generate_documentation(project):
+    """docs/ERROR_CODES.md を生成する（旧形式）"""
+    log_info("Generating error code documentation...")
+
+    registry = ErrorCodeRegistry.load(project.messages_path('en'))
+    doc_file = os.path.join(project.docs_dir, 'ERROR_CODES.md')
+    os.makedirs(project.docs_dir, exist_ok=True)
+
+    lines = ["# Error Codes Reference", "", "This document lists all error codes used in the application.", ""]
+    current_category = None
+    for code in registry.codes:
+        category = registry.category_of(code)
+        if category != current_category:
+            lines += [f"## {category}", ""]
+            current_category = category
+        user, dev, resolution = (_or(registry.message(code, suffix), 'N/A') for suffix in SUFFIXES)
+        lines += [
+            f"### {code}",
+            "",
+            f"- **User Message**: {user}",
+            f"- **Developer Message**: {dev}",
+            f"- **Resolution**: {resolution}",
+            "",
+        ]
+    _write_lines(doc_file, lines)
+
+    log_success(f"Documentation generated: {doc_file}")
+    return 0
+
+
+def generate_docs(project, docs_dir='docs/error-codes'):
+    """docs/error-codes/ 配下のGitHub向けドキュメントを生成する"""
+    log_info("Generating GitHub error code documentation...")
+
+    registry = ErrorCodeRegistry.load(project.messages_path('en'))
+    os.makedirs(docs_dir, exist_ok=True)
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+    footer = [line.format(timestamp=timestamp) for line in DOCS_FOOTER]
+
+    lines = ["# Error Codes Reference", "", "## Summary", "| Category | Count | Status |", "|----------|-------|--------|"]
+    for category in sorted({registry.category_of(code) for code in registry.codes}):
+        count = sum(1 for code in registry.codes if registry.category_of(code) == category)
+        lines.append(f"| {category} | {count} | ✅ Complete |")
+    lines += [
+        "",
+        "## All Error Codes",
+        "| Code | Category | USER | DEV | RES | Status |",
+        "|------|----------|------|-----|-----|--------|",
+    ]
+    for code in registry.codes:
+        statuses = ['✅' if registry.is_set(code, suffix) else '❌' for suffix in SUFFIXES]
+        overall = 'Incomplete' if '❌' in statuses else 'Complete'
+        lines.append(f"| {code} | {registry.category_of(code)} | {' | '.join(statuses)} | {overall} |")
+    lines += ["", "---"] + footer
+    _write_lines(os.path.join(docs_dir, 'README.md'), lines)
+
+    lines = ["# Error Codes by Category", ""]
+    current_category = None
+    for code in registry.codes:
+        category = registry.category_of(code)
+        if category != current_category:
+            lines += [f"## {category} Category", ""]
+            current_category = category
+        user, dev, resolution = (_or(registry.message(code, suffix), '(not set)') for suffix in SUFFIXES)
+        lines += [f"### {code}", f"- **USER**: {user}", f"- **DEV**: {dev}", f"- **RES**: {resolution}", ""]
+    lines += ["---"] + footer
+    _write_lines(os.path.join(docs_dir, 'error-codes-by-category.md'), lines)
+
+    lines = [
+        "# Error Codes Usage Guide",
+        "",
+        "## How to Use Error Codes",
+        "",
+        "### In Code",
+        "```typescript",
+        "import { StandardError } from '@domain/entities/StandardError';",
+        "",
+        "// Throw an error with context",
+        "throw new StandardError('E_XPATH_0001', {",
+        "  xpath: '//*[@id=\"invalid\"]',",
+        "  url: 'https://example.com'",
+        "});",
+        "",
+        "// Get localized messages",
+        "const error = new StandardError('E_XPATH_0001');",
+        "console.log(error.getUserMessage());        // User-friendly message",
+        "console.log(error.getDevMessage());         // Developer message",
+        "console.log(error.getResolutionMessage());  // Resolution steps",
+        "```",
+        "",
+        "### Error Code Management",
+        "",
+        "```bash",
+        "# List all error codes",
+        "npm run error:list",
+        "",
+        "# Reserve new error code",
+        "npm run error:reserve XPATH",
+        "",
+        "# Validate error codes",
+        "npm run error:validate",
+        "",
+        "# Generate documentation",
+        "npm run error:docs",
+        "```",
+        "",
+        "## Error Code Format",
+        "",
+        "- **Pattern**: `E_CATEGORY_NNNN`",
+        "- **Categories**: AUTH, STORAGE, XPATH, USER, SYNC",
+        "- **Messages**: Each error code has USER, DEV, and RESOLUTION messages",
+        "",
+        "---",
+    ] + footer
+    _write_lines(os.path.join(docs_dir, 'error-codes-usage.md'), lines)
+
+    log_success("GitHub documentation generated:")
+    for name in ('README.md', 'error-codes-by-category.md', 'error-codes-usage.md'):
+        print(f"  - {docs_dir}/{name}")
+    return 0
+
+
+def validate_error_codes(project, prog):
+    """src中で使われているエラーコードのメッセージが揃っているか検証する"""
+    log_info("Validating error codes...")
+
+    registry = ErrorCodeRegistry.load(project.messages_path('en'))
+    missing = []
+    incomplete = []
+    for code in extract_used_error_codes(project):
+        if not all(registry.has(f'{code}_{suffix}') for suffix in SUFFIXES):
+            missing.append(code)
+            continue
+        user = _or(registry.message(code, 'USER'), '')
+        resolution = _or(registry.message(code, 'RESOLUTION'), '')
+        if '[TODO]' in str(user) or '[TODO]' in str(resolution):
+            incomplete.append(code)
+
+    if missing:
+        log_error("Missing error code messages:")
+        for code in missing:
+            print(f"   {code}: Missing _USER, _DEV, or _RESOLUTION keys")
+        print()
+        log_info(f"Run: {prog} reserve <category> to create missing messages")
+
+    if incomplete:
+        log_warning("Incomplete error code messages:")
+        for code in incomplete:
+            print(f"   {code}: Contains [TODO] placeholders")
+        print()
+        log_info("Update messages in public/_locales/en/messages.json")
+
+    if missing:
+        return 1
+    if not incomplete:
+        log_success("All error codes are valid")
+    return 0
+
+
+def _or(value, default):
+    """jq の `// default` と同じ（null / false のときだけdefault）"""
+    return default if value is None or value is False else value
+
+
+def _write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='エラーコードの一覧・予約・検証・ドキュメント生成')
+    parser.add_argument('command', choices=['list', 'reserve', 'validate', 'generate', 'generate-docs'])
+    parser.add_argument('category', nargs='?', help='reserve するカテゴリ（例: XPATH）')
+    parser.add_argument('--project-root', default=DEFAULT_PROJECT_ROOT,
+                        help='package.json のあるディレクトリ (default: このスクリプトの2階層上)')
+    parser.add_argument('--prog', default=os.path.basename(sys.argv[0]),
+                        help='使い方の表示に使うコマンド名（シェルスクリプトから呼ぶ場合は $0）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    project = Project(args.project_root)
+
+    if args.command == 'list':
+        return list_error_codes(project)
+    if args.command == 'reserve':
+        return reserve_error_code(project, args.category, args.prog)
+    if args.command == 'validate':
+        return validate_error_codes(project, args.prog)
+    if args.command == 'generate':
+        return generate_documentation(project)
+    return generate_docs(project)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
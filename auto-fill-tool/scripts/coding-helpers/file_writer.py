@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+書き換えスクリプト共通のファイル書き込み処理
+
+内容のハッシュを比較して変化がなければ書き込まない（mtimeを変えない）ため、
+eslint --cache / jestのtransformキャッシュ / tsc --watch が無駄に無効化されない。
+書き込みは同じディレクトリの一時ファイルに書いてからrenameするのでアトミックに行われる。
+"""
+
+import hashlib
+import os
+import stat
+import tempfile
+
+
+class WriteStats:
+    """書き込んだファイルとスキップしたファイルの集計"""
+
+    def __init__(self):
+        self.touched = []
+        self.skipped = 0
+        # dry-runで書き込まなかったが、書き込めば変わるファイルの数
+        self.pending = 0
+        # 処理時間の上限を超えて途中でやめたファイルの数
+        self.over_budget = 0
+
+    def record(self, file_path, written, pending=False, over_budget=False):
+        if written:
+            self.touched.append(file_path)
+        elif over_budget:
+            self.over_budget += 1
+        elif pending:
+            self.pending += 1
+        else:
+            self.skipped += 1
+
+    def summary(self):
+        parts = [f"{len(self.touched)} file(s) written"]
+        if self.pending:
+            parts.append(f"{self.pending} would change")
+        parts.append(f"{self.skipped} unchanged")
+        if self.over_budget:
+            parts.append(f"{self.over_budget} skipped over budget")
+        return ', '.join(parts)
+
+
+def content_hash(data):
+    """バイト列のSHA-256ハッシュ"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(file_path):
+    """ファイル内容のSHA-256ハッシュ（存在しなければNone）"""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def is_unchanged(file_path, data):
+    """ディスク上の内容がdataと同じならTrue（サイズが違えばハッシュ計算を省く）"""
+    try:
+        if os.path.getsize(file_path) != len(data):
+            return False
+    except OSError:
+        return False
+    return file_hash(file_path) == content_hash(data)
+
+
+def atomic_write(file_path, data):
+    """一時ファイルに書き込んでからrenameで置き換える（パーミッションは元ファイルを引き継ぐ）"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(file_path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_if_changed(file_path, content, stats=None, encoding='utf-8'):
+    """内容が変わった場合のみアトミックに書き込み、書き込んだかどうかを返す"""
+    data = content.encode(encoding)
+    written = not is_unchanged(file_path, data)
+    if written:
+        atomic_write(file_path, data)
+    if stats is not None:
+        stats.record(file_path, written)
+    return written
@@ -3,92 +3,50 @@
 全エンティティのcreate()呼び出しでIdGeneratorが不足している箇所を修正するスクリプト
 """
 
-import re
-import glob
+from codemod_engine import register_rule
+from create_calls import add_id_generator, anchors
+from file_writer import WriteStats, write_if_changed
+from targets import find_targets, parse_target_args
 
-def fix_entity_create_calls(file_path):
+def fix_entity_create_calls_content(content, file_path=None):
+    """IdGeneratorを受け取る全エンティティのcreate()にmockIdGeneratorを追加したcontentを返す"""
+    # 対象エンティティは src/domain/entities の create() のシグネチャから求める
+    return add_id_generator(content)
+
+def fix_entity_create_calls(file_path, stats=None):
     """エンティティのcreate()でIdGeneratorが不足している箇所を修正"""
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # 対象エンティティのリスト
-    entities = [
-        'AutomationVariables',
-        'StorageSyncConfig', 
-        'AutomationResult',
-        'SyncResult',
-        'Website',
-        'TabRecording',
-        'SyncHistory'
-    ]
-    
-    lines = content.split('\n')
-    new_lines = []
-    i = 0
-    
-    while i < len(lines):
-        line = lines[i]
-        
-        # エンティティ.create({で始まる行を検出
-        entity_found = None
-        for entity in entities:
-            if f'{entity}.create({{' in line and ', mockIdGenerator' not in line:
-                entity_found = entity
-                break
-        
-        if entity_found:
-            # 複数行にまたがるcreate呼び出しを処理
-            create_lines = [line]
-            i += 1
-            
-            # });で終わる行まで収集
-            while i < len(lines) and not lines[i].strip().endswith('});'):
-                create_lines.append(lines[i])
-                i += 1
-            
-            if i < len(lines):
-                # });で終わる行を処理
-                end_line = lines[i]
-                if ', mockIdGenerator);' not in end_line:
-                    end_line = end_line.replace('});', '}, mockIdGenerator);')
-                create_lines.append(end_line)
-                i += 1
-            
-            new_lines.extend(create_lines)
-        else:
-            new_lines.append(line)
-            i += 1
-    
     # 修正された内容を書き戻し
-    new_content = '\n'.join(new_lines)
+    new_content = fix_entity_create_calls_content(content, file_path)
     if new_content != content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        print(f"Fixed entity create calls in: {file_path}")
+        if write_if_changed(file_path, new_content, stats):
+            print(f"Fixed entity create calls in: {file_path}")
+    elif stats is not None:
+        stats.record(file_path, False)
 
-def main():
+register_rule('entity-create-calls', fix_entity_create_calls_content,
+              anchors=anchors(),
+              description='Entity.create()にmockIdGeneratorを追加 (fix_all_create_calls.py)')
+
+def main(argv=None):
     """メイン処理"""
+    args = parse_target_args('全エンティティのcreate()呼び出しにmockIdGeneratorを追加する', argv)
     # テストファイルを検索
-    test_files = []
-    
-    patterns = [
-        'src/**/__tests__/*.test.ts',
-        'src/**/*.test.ts'
-    ]
-    
-    for pattern in patterns:
-        test_files.extend(glob.glob(pattern, recursive=True))
+    test_files = find_targets(args)
     
     print(f"Found {len(test_files)} test files")
     
     # 各ファイルを修正
+    stats = WriteStats()
     for file_path in test_files:
         try:
-            fix_entity_create_calls(file_path)
+            fix_entity_create_calls(file_path, stats)
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
     
-    print("全エンティティのcreate呼び出し修正完了")
+    print(f"全エンティティのcreate呼び出し修正完了 ({stats.summary()})")
 
 if __name__ == '__main__':
     main()
@@ -1,72 +1,27 @@
 #!/usr/bin/env python3
-import os
-import re
 
-def fix_test_file(file_path):
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    original_content = content
-    
-    # 1. Add Result import if needed
-    if 'Result.success' in content or 'Result.failure' in content:
-        if 'import { Result }' not in content:
-            # Find the last import
-            import_lines = []
-            lines = content.split('\n')
-            for i, line in enumerate(lines):
-                if line.strip().startswith('import '):
-                    import_lines.append(i)
-            
-            if import_lines:
-                last_import_line = import_lines[-1]
-                lines.insert(last_import_line + 1, "import { Result } from '@domain/values/result.value';")
-                content = '\n'.join(lines)
-    
-    # 2. Fix mockResolvedValue patterns
-    # Pattern: mockResolvedValue({ complex object })
-    pattern = r'\.mockResolvedValue\((\{[^}]*(?:\{[^}]*\}[^}]*)*\})\)'
-    matches = re.findall(pattern, content, re.DOTALL)
-    for match in matches:
-        if 'Result.success' not in match and "''" not in match:
-            content = content.replace(
-                f'.mockResolvedValue({match})',
-                f'.mockResolvedValue(Result.success({match}))'
-            )
-    
-    # 3. Fix string literals
-    content = re.sub(r'\.mockResolvedValue\((["\'][^"\']*["\'])\)', r'.mockResolvedValue(Result.success(\1))', content)
-    
-    # 4. Fix array literals (non-empty)
-    pattern = r'\.mockResolvedValue\((\[[^\]]+\])\)'
-    matches = re.findall(pattern, content)
-    for match in matches:
-        if 'Result.success' not in match:
-            content = content.replace(
-                f'.mockResolvedValue({match})',
-                f'.mockResolvedValue(Result.success({match}))'
-            )
-    
-    # 5. Fix specific object patterns with quotes
-    content = re.sub(
-        r"\.mockResolvedValue\((\{[^}]*'[^']*':[^}]*\})\)",
-        r'.mockResolvedValue(Result.success(\1))',
-        content,
-        flags=re.DOTALL
-    )
-    
-    if content != original_content:
-        with open(file_path, 'w') as f:
-            f.write(content)
-        return True
-    return False
+from codemod_engine import process_file, register_rule
+from file_writer import WriteStats, write_if_changed
+from import_block import RESULT_MODULE, ensure_imports
+from result_wrapping import wrap_mock_resolved_values
+from targets import find_targets, parse_target_args
 
-def fix_lint_issues(file_path):
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    original_content = content
-    
+def wrap_mock_results_content(content, file_path=None):
+    # Wrap object, string and non-empty array literals passed to mockResolvedValue
+    # (objects containing '' are left alone)
+    def accept(arg, kind):
+        return not kind.endswith('object') or "''" not in arg
+
+    return wrap_mock_resolved_values(content, {'empty-object', 'object', 'string', 'array'}, accept)
+
+def fix_test_content(content, file_path=None):
+    # Wrap mockResolvedValue literals, then add the Result import if Result is now used
+    return ensure_imports(wrap_mock_results_content(content, file_path), {'Result': RESULT_MODULE})[0]
+
+def fix_test_file(file_path, stats=None):
+    return _rewrite(file_path, fix_test_content, stats)
+
+def fix_lint_content(content, file_path=None):
     # Fix common lint issues
     # Remove unused imports (basic pattern)
     lines = content.split('\n')
@@ -78,30 +33,45 @@ def fix_lint_issues(file_path):
             continue
         new_lines.append(line)
     
-    content = '\n'.join(new_lines)
+    return '\n'.join(new_lines)
+
+def fix_lint_issues(file_path, stats=None):
+    return _rewrite(file_path, fix_lint_content, stats)
+
+def organize_imports_content(content, file_path=None):
+    # Merge duplicate imports, drop unused ones and sort named imports (one parse of the import block)
+    return ensure_imports(content, {}, organize=True)[0]
+
+def _rewrite(file_path, transform, stats=None):
+    with open(file_path, 'r') as f:
+        content = f.read()
     
-    if content != original_content:
-        with open(file_path, 'w') as f:
-            f.write(content)
-        return True
+    new_content = transform(content, file_path)
+    if new_content != content:
+        return write_if_changed(file_path, new_content, stats)
+    if stats is not None:
+        stats.record(file_path, False)
     return False
 
-# Process all TypeScript files
-fixed_files = []
-for root, dirs, files in os.walk('/home/developer/workspace/auto-fill-tool/src'):
-    for file in files:
-        if file.endswith('.ts'):
-            file_path = os.path.join(root, file)
-            fixed = False
-            
-            if file.endswith('.test.ts'):
-                if fix_test_file(file_path):
-                    fixed = True
-            
-            if fix_lint_issues(file_path):
-                fixed = True
-            
-            if fixed:
-                fixed_files.append(file_path)
+ISSUE_RULES = [
+    register_rule('issues-test', wrap_mock_results_content, imports={'Result': RESULT_MODULE},
+                  anchors=('Result.success', 'Result.failure', '.mockResolvedValue'),
+                  description='Result import追加とmockResolvedValueのResult.successラップ (fix_all_issues.py)'),
+    register_rule('leading-blank-lines', fix_lint_content, suffixes=('.ts',),
+                  description='ファイル先頭の空行を削除 (fix_all_issues.py)'),
+]
+
+# 未使用の判定は識別子の字句的な検索なので、--rules で明示した場合のみ実行
+register_rule('organize-imports', organize_imports_content, suffixes=('.ts',), enabled=False,
+              description='重複importの統合・未使用importの削除・名前付きimportの並べ替え (fix_all_issues.py)')
+
+if __name__ == '__main__':
+    # Process all TypeScript files (each file is read once and written at most once)
+    args = parse_target_args('TypeScriptファイルの既知の問題をまとめて修正する', include=('src/**/*.ts',))
+    stats = WriteStats()
+    fixed_files = []
+    for file_path in find_targets(args):
+        if process_file(file_path, ISSUE_RULES, stats):
+            fixed_files.append(file_path)
 
-print(f"Fixed {len(fixed_files)} files")
+    print(f"Fixed {len(fixed_files)} files ({stats.summary()})")
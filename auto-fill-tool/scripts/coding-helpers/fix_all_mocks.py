@@ -1,58 +1,41 @@
 #!/usr/bin/env python3
-import os
-import re
 
-def fix_all_mock_patterns(file_path):
+from codemod_engine import register_rule
+from file_writer import WriteStats, write_if_changed
+from import_block import RESULT_MODULE
+from result_wrapping import wrap_mock_resolved_values
+from targets import find_targets, parse_target_args
+
+MOCK_PATTERN_KINDS = {'empty-object', 'object', 'string', 'number', 'boolean', 'array'}
+
+def fix_mock_pattern_content(content, file_path=None):
+    # Wrap object, string, number, boolean and non-empty array literals
+    return wrap_mock_resolved_values(content, MOCK_PATTERN_KINDS)
+
+def fix_all_mock_patterns(file_path, stats=None):
     with open(file_path, 'r') as f:
         content = f.read()
     
-    original_content = content
-    
-    # Pattern 1: Fix complex object literals in mockResolvedValue
-    # Match multi-line object literals
-    pattern = r'\.mockResolvedValue\((\{[^}]*(?:\{[^}]*\}[^}]*)*\})\)'
-    def replace_complex_object(match):
-        obj = match.group(1)
-        if 'Result.success' not in obj:
-            return f'.mockResolvedValue(Result.success({obj}))'
-        return match.group(0)
-    
-    content = re.sub(pattern, replace_complex_object, content, flags=re.DOTALL)
-    
-    # Pattern 2: Fix string literals
-    content = re.sub(r'\.mockResolvedValue\((["\'][^"\']*["\'])\)', r'.mockResolvedValue(Result.success(\1))', content)
-    
-    # Pattern 3: Fix number literals
-    content = re.sub(r'\.mockResolvedValue\((\d+)\)', r'.mockResolvedValue(Result.success(\1))', content)
-    
-    # Pattern 4: Fix boolean literals that aren't already wrapped
-    content = re.sub(r'\.mockResolvedValue\((true|false)\)(?!\))', r'.mockResolvedValue(Result.success(\1))', content)
-    
-    # Pattern 5: Fix array literals that aren't empty
-    pattern = r'\.mockResolvedValue\((\[[^\]]+\])\)'
-    def replace_array(match):
-        arr = match.group(1)
-        if 'Result.success' not in arr and arr != '[]':
-            return f'.mockResolvedValue(Result.success({arr}))'
-        return match.group(0)
-    
-    content = re.sub(pattern, replace_array, content)
-    
-    if content != original_content:
-        with open(file_path, 'w') as f:
-            f.write(content)
-        return True
+    new_content = fix_mock_pattern_content(content, file_path)
+    if new_content != content:
+        return write_if_changed(file_path, new_content, stats)
+    if stats is not None:
+        stats.record(file_path, False)
     return False
 
-# Process all test files
-fixed_files = []
-for root, dirs, files in os.walk('/home/developer/workspace/auto-fill-tool/src'):
-    for file in files:
-        if file.endswith('.test.ts'):
-            file_path = os.path.join(root, file)
-            if fix_all_mock_patterns(file_path):
-                fixed_files.append(file_path)
+register_rule('all-mocks', fix_mock_pattern_content, anchors=('.mockResolvedValue',), imports={'Result': RESULT_MODULE},
+              description='mockResolvedValueのリテラル引数をResult.successでラップ (fix_all_mocks.py)')
+
+if __name__ == '__main__':
+    args = parse_target_args('テストファイルのすべてのモックパターンをResult型で包む')
+    stats = WriteStats()
+    # Process all test files
+    fixed_files = []
+    for file_path in find_targets(args):
+        if fix_all_mock_patterns(file_path, stats):
+            fixed_files.append(file_path)
 
-print(f"Fixed {len(fixed_files)} files:")
-for file_path in fixed_files:
-    print(f"  {file_path}")
+    print(f"Fixed {len(fixed_files)} files:")
+    for file_path in fixed_files:
+        print(f"  {file_path}")
+    print(stats.summary())
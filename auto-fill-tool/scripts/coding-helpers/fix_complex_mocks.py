@@ -1,46 +1,41 @@
 #!/usr/bin/env python3
-import os
 import re
 
-def fix_complex_mocks(file_path):
+from codemod_engine import register_rule
+from file_writer import WriteStats, write_if_changed
+from import_block import RESULT_MODULE
+from result_wrapping import wrap_mock_resolved_values
+from targets import find_targets, parse_target_args
+
+QUOTED_KEY_OBJECT = re.compile(r"\{\s*'[^']+'\s*:")
+
+def fix_complex_mock_content(content, file_path=None):
+    # Wrap object literals keyed by quoted strings (e.g. mockResolvedValue({ 'key': { ... } }))
+    # and non-empty array literals
+    def accept(arg, kind):
+        return kind == 'array' or QUOTED_KEY_OBJECT.match(arg) is not None
+
+    return wrap_mock_resolved_values(content, {'object', 'array'}, accept)
+
+def fix_complex_mocks(file_path, stats=None):
     with open(file_path, 'r') as f:
         content = f.read()
     
-    original_content = content
-    
-    # Fix object literals that are not wrapped in Result.success
-    # Pattern: mockResolvedValue({ 'key': { ... } })
-    pattern = r'\.mockResolvedValue\((\{\s*\'[^\']+\':\s*\{[^}]+\}[^}]*\})\)'
-    matches = re.findall(pattern, content, re.DOTALL)
-    
-    for match in matches:
-        if 'Result.success' not in match:
-            content = content.replace(
-                f'.mockResolvedValue({match})',
-                f'.mockResolvedValue(Result.success({match}))'
-            )
-    
-    # Fix array literals
-    pattern = r'\.mockResolvedValue\((\[[^\]]+\])\)'
-    matches = re.findall(pattern, content)
-    
-    for match in matches:
-        if 'Result.success' not in match and match != '[]':
-            content = content.replace(
-                f'.mockResolvedValue({match})',
-                f'.mockResolvedValue(Result.success({match}))'
-            )
-    
-    if content != original_content:
-        with open(file_path, 'w') as f:
-            f.write(content)
-        return True
+    new_content = fix_complex_mock_content(content, file_path)
+    if new_content != content:
+        return write_if_changed(file_path, new_content, stats)
+    if stats is not None:
+        stats.record(file_path, False)
     return False
 
-# Find all test files
-for root, dirs, files in os.walk('/home/developer/workspace/auto-fill-tool/src'):
-    for file in files:
-        if file.endswith('.test.ts'):
-            file_path = os.path.join(root, file)
-            if fix_complex_mocks(file_path):
-                print(f"Fixed complex mocks in: {file_path}")
+register_rule('complex-mocks', fix_complex_mock_content, anchors=('.mockResolvedValue',), imports={'Result': RESULT_MODULE},
+              description='ネストしたオブジェクト/配列のmockResolvedValueをResult.successでラップ (fix_complex_mocks.py)')
+
+if __name__ == '__main__':
+    args = parse_target_args('テストファイルの複雑なモックの戻り値をResult型で包む')
+    stats = WriteStats()
+    # Find all test files
+    for file_path in find_targets(args):
+        if fix_complex_mocks(file_path, stats):
+            print(f"Fixed complex mocks in: {file_path}")
+    print(stats.summary())
@@ -5,33 +5,29 @@ IdGenerator関連のテストエラーを一括修正するスクリプト
 
 import os
 import re
-import glob
 
-def fix_duplicate_mockidgenerator(file_path):
-    """重複するmockIdGenerator宣言を修正"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 重複するIdGeneratorインポートと宣言を検出・修正
+from codemod_engine import process_file, register_rule
+from create_calls import add_id_generator, anchors
+from file_writer import WriteStats, write_if_changed
+from import_block import ID_GENERATOR_MODULE, ImportBlock, ensure_imports
+from targets import find_targets, parse_target_args
+
+# create()にIdGeneratorが必要なエンティティ
+CREATE_CALL_ENTITIES = ['AutomationVariables', 'StorageSyncConfig', 'AutomationResult', 'SyncResult']
+ID_GENERATOR_IMPORT = {'IdGenerator': ID_GENERATOR_MODULE}
+
+def dedupe_mockidgenerator_content(content, file_path=None):
+    """重複するmockIdGenerator宣言を取り除いたcontentを返す"""
+    # 重複するIdGeneratorインポートは import_block でまとめる（ルールの imports）
     lines = content.split('\n')
     new_lines = []
-    idgenerator_import_added = False
-    mockidgenerator_declared = False
+    # 共通のフィクスチャ（mock_fixtures.py --hoist）からimportしていれば、ローカルの宣言はすべて重複
+    mockidgenerator_declared = _imports_mock_idgenerator(content)
     
     i = 0
     while i < len(lines):
         line = lines[i]
         
-        # IdGeneratorのインポートが重複している場合をスキップ
-        if 'import { IdGenerator }' in line and idgenerator_import_added:
-            i += 1
-            continue
-        elif 'import { IdGenerator }' in line:
-            idgenerator_import_added = True
-            new_lines.append(line)
-            i += 1
-            continue
-        
         # mockIdGeneratorの宣言が重複している場合をスキップ
         if 'const mockIdGenerator' in line and mockidgenerator_declared:
             # 宣言部分をスキップ（複数行の場合もある）
@@ -52,59 +48,28 @@ def fix_duplicate_mockidgenerator(file_path):
         new_lines.append(line)
         i += 1
     
-    # 修正された内容を書き戻し
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(new_lines))
-    
-    print(f"Fixed duplicate declarations in: {file_path}")
+    return '\n'.join(new_lines)
+
+def fix_duplicate_mockidgenerator(file_path):
+    """重複するmockIdGenerator宣言とIdGeneratorのインポートを修正"""
+    if _rewrite(file_path, lambda content, path: ensure_imports(
+            dedupe_mockidgenerator_content(content, path), ID_GENERATOR_IMPORT)[0]):
+        print(f"Fixed duplicate declarations in: {file_path}")
+
+def add_idgenerator_to_create_calls_content(content, file_path=None):
+    """AutomationVariables.create()等の呼び出しにmockIdGeneratorを追加したcontentを返す"""
+    # create({ ... }) → create({ ... }, mockIdGenerator)（ネストしたオブジェクトを含む複数行の呼び出しにも対応）
+    return add_id_generator(content, CREATE_CALL_ENTITIES)
 
 def fix_missing_idgenerator_in_create_calls(file_path):
     """AutomationVariables.create()やStorageSyncConfig.create()でIdGeneratorが不足している箇所を修正"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # AutomationVariables.create()の修正
-    # パターン1: create({ ... }) → create({ ... }, mockIdGenerator)
-    pattern1 = r'(AutomationVariables\.create\(\{[^}]+\}\))'
-    replacement1 = r'\1.replace(")", ", mockIdGenerator)")'
-    
-    # より正確なパターンマッチング
-    def replace_create_calls(match):
-        call = match.group(1)
-        if ', mockIdGenerator' not in call:
-            return call.replace('})', '}, mockIdGenerator)')
-        return call
-    
-    content = re.sub(r'(AutomationVariables\.create\(\{[^}]+\}\))', replace_create_calls, content)
-    content = re.sub(r'(StorageSyncConfig\.create\(\{[^}]+\}\))', replace_create_calls, content)
-    content = re.sub(r'(AutomationResult\.create\(\{[^}]+\}\))', replace_create_calls, content)
-    content = re.sub(r'(SyncResult\.create\(\{[^}]+\}\))', replace_create_calls, content)
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    print(f"Fixed missing IdGenerator in create calls: {file_path}")
+    if _rewrite(file_path, add_idgenerator_to_create_calls_content):
+        print(f"Fixed missing IdGenerator in create calls: {file_path}")
 
-def add_missing_idgenerator_import_and_mock(file_path):
-    """IdGeneratorのインポートとmockが不足している場合に追加"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # IdGeneratorのインポートがない場合は追加
-    if 'import { IdGenerator }' not in content:
-        # 最初のimport文の後に追加
-        lines = content.split('\n')
-        import_index = -1
-        for i, line in enumerate(lines):
-            if line.startswith('import ') and 'from ' in line:
-                import_index = i
-        
-        if import_index >= 0:
-            lines.insert(import_index + 1, "import { IdGenerator } from '@domain/types/id-generator.types';")
-            content = '\n'.join(lines)
-    
-    # mockIdGeneratorの宣言がない場合は追加
-    if 'const mockIdGenerator' not in content:
+def add_mock_idgenerator_content(content, file_path=None):
+    """mockIdGeneratorの宣言が不足している場合に追加したcontentを返す"""
+    # mockIdGeneratorを使っているのに宣言もimportもない場合は追加
+    if _mock_idgenerator_missing(content):
         # describe文の前に追加
         describe_match = re.search(r'(describe\()', content)
         if describe_match:
@@ -118,43 +83,65 @@ const mockIdGenerator: IdGenerator = {
 """
             content = content[:insert_pos] + mock_declaration + content[insert_pos:]
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    return content
+
+def add_idgenerator_import_and_mock_content(content, file_path=None):
+    """IdGeneratorのインポートとmockが不足している場合に追加したcontentを返す"""
+    return ensure_imports(add_mock_idgenerator_content(content, file_path), ID_GENERATOR_IMPORT)[0]
+
+def add_missing_idgenerator_import_and_mock(file_path):
+    """IdGeneratorのインポートとmockが不足している場合に追加"""
+    if _rewrite(file_path, add_idgenerator_import_and_mock_content):
+        print(f"Added missing IdGenerator import and mock: {file_path}")
+
+def _imports_mock_idgenerator(content):
+    return 'mockIdGenerator' in content and ImportBlock(content).imported('mockIdGenerator') is not None
+
+def _mock_idgenerator_missing(content):
+    """mockIdGeneratorを（import文以外で）使っていて、宣言もimportもしていないか"""
+    if 'mockIdGenerator' not in content or 'const mockIdGenerator' in content:
+        return False
+    block = ImportBlock(content)
+    return 'mockIdGenerator' in block.used and block.imported('mockIdGenerator') is None
+
+def _rewrite(file_path, transform):
+    """ファイルにtransformを適用し、内容が変わった場合のみ書き戻す"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
     
-    print(f"Added missing IdGenerator import and mock: {file_path}")
+    return write_if_changed(file_path, transform(content, file_path))
+
+IDGENERATOR_RULES = [
+    register_rule('idgenerator-dedupe', dedupe_mockidgenerator_content, imports=ID_GENERATOR_IMPORT,
+                  anchors=('import { IdGenerator }', 'const mockIdGenerator'),
+                  description='重複したIdGenerator import/mockIdGenerator宣言を削除 (fix_idgenerator.py)'),
+    register_rule('idgenerator-create-calls', add_idgenerator_to_create_calls_content,
+                  anchors=anchors(CREATE_CALL_ENTITIES),
+                  description='Entity.create({...})にmockIdGeneratorを追加 (fix_idgenerator.py)'),
+    # create()への追加で使われ始めたmockIdGeneratorも同じ1回で宣言できるよう、create系ルールの後に置く
+    register_rule('idgenerator-import-mock', add_mock_idgenerator_content, imports=ID_GENERATOR_IMPORT,
+                  description='使われているのに宣言のないmockIdGeneratorの宣言とIdGeneratorのimportを追加 (fix_idgenerator.py)'),
+]
 
-def main():
+def main(argv=None):
     """メイン処理"""
+    args = parse_target_args('IdGenerator関連のテストエラーを一括修正する', argv)
     # テストファイルを検索
-    test_files = []
-    
-    # 各ディレクトリからテストファイルを検索
-    patterns = [
-        'src/**/__tests__/*.test.ts',
-        'src/**/*.test.ts'
-    ]
-    
-    for pattern in patterns:
-        test_files.extend(glob.glob(pattern, recursive=True))
+    test_files = find_targets(args)
     
     print(f"Found {len(test_files)} test files")
     
-    # 各ファイルを修正
+    # 各ファイルを1回だけ読み込み、重複宣言の修正 → create呼び出し修正 → import/mock追加を順に適用
+    stats = WriteStats()
     for file_path in test_files:
         try:
-            # 重複宣言を修正
-            fix_duplicate_mockidgenerator(file_path)
-            
-            # 不足しているIdGeneratorを追加
-            add_missing_idgenerator_import_and_mock(file_path)
-            
-            # create呼び出しでIdGeneratorが不足している箇所を修正
-            fix_missing_idgenerator_in_create_calls(file_path)
-            
+            applied = process_file(file_path, IDGENERATOR_RULES, stats)
+            if applied:
+                print(f"Fixed IdGenerator ({', '.join(applied)}): {file_path}")
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
     
-    print("IdGenerator修正完了")
+    print(f"IdGenerator修正完了 ({stats.summary()})")
 
 if __name__ == '__main__':
     main()
@@ -1,42 +1,37 @@
 #!/usr/bin/env python3
-import os
-import re
 
-def fix_mock_calls(file_path):
+from codemod_engine import register_rule
+from file_writer import WriteStats, write_if_changed
+from import_block import RESULT_MODULE
+from result_wrapping import wrap_mock_resolved_values
+from targets import find_targets, parse_target_args
+
+# {} / null / undefined / true / false / [] / object and array literals
+MOCK_CALL_KINDS = {'empty-object', 'object', 'null', 'undefined', 'boolean', 'empty-array', 'array'}
+
+def fix_mock_call_content(content, file_path=None):
+    # Wrap empty/simple literals and object/array literals in mockResolvedValue
+    return wrap_mock_resolved_values(content, MOCK_CALL_KINDS)
+
+def fix_mock_calls(file_path, stats=None):
     with open(file_path, 'r') as f:
         content = f.read()
     
-    # Fix various mockResolvedValue patterns
-    patterns = [
-        (r'\.mockResolvedValue\(\{\}\)', '.mockResolvedValue(Result.success({}))'),
-        (r'\.mockResolvedValue\(null\)', '.mockResolvedValue(Result.success(null))'),
-        (r'\.mockResolvedValue\(undefined\)', '.mockResolvedValue(Result.success(undefined))'),
-        (r'\.mockResolvedValue\(true\)', '.mockResolvedValue(Result.success(true))'),
-        (r'\.mockResolvedValue\(false\)', '.mockResolvedValue(Result.success(false))'),
-        (r'\.mockResolvedValue\(\[\]\)', '.mockResolvedValue(Result.success([]))'),
-    ]
-    
-    changed = False
-    for pattern, replacement in patterns:
-        new_content = re.sub(pattern, replacement, content)
-        if new_content != content:
-            content = new_content
-            changed = True
-    
-    # Fix object literals in mockResolvedValue
-    content = re.sub(r'\.mockResolvedValue\((\{[^}]+\})\)', r'.mockResolvedValue(Result.success(\1))', content)
-    content = re.sub(r'\.mockResolvedValue\((\[[^\]]+\])\)', r'.mockResolvedValue(Result.success(\1))', content)
-    
-    if changed or content != open(file_path, 'r').read():
-        with open(file_path, 'w') as f:
-            f.write(content)
-        return True
+    new_content = fix_mock_call_content(content, file_path)
+    if new_content != content:
+        return write_if_changed(file_path, new_content, stats)
+    if stats is not None:
+        stats.record(file_path, False)
     return False
 
-# Find all test files
-for root, dirs, files in os.walk('/home/developer/workspace/auto-fill-tool/src'):
-    for file in files:
-        if file.endswith('.test.ts'):
-            file_path = os.path.join(root, file)
-            if fix_mock_calls(file_path):
-                print(f"Fixed: {file_path}")
+register_rule('mocks', fix_mock_call_content, anchors=('.mockResolvedValue',), imports={'Result': RESULT_MODULE},
+              description='空/単純リテラルのmockResolvedValueをResult.successでラップ (fix_mocks.py)')
+
+if __name__ == '__main__':
+    args = parse_target_args('テストファイルのモックの戻り値をResult型で包む')
+    stats = WriteStats()
+    # Find all test files
+    for file_path in find_targets(args):
+        if fix_mock_calls(file_path, stats):
+            print(f"Fixed: {file_path}")
+    print(stats.summary())
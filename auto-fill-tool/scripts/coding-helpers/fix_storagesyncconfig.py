@@ -3,98 +3,69 @@
 StorageSyncConfig.create()呼び出しでIdGeneratorが不足している箇所を修正するスクリプト
 """
 
-import re
-import glob
+from codemod_engine import register_rule
+from create_calls import add_id_generator, anchors
+from file_writer import WriteStats, write_if_changed
+from targets import find_targets, parse_target_args
 
-def fix_storagesyncconfig_create_calls(file_path):
-    """StorageSyncConfig.create()でIdGeneratorが不足している箇所を修正"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+STORAGE_SYNC_CONFIG = ('StorageSyncConfig',)
+
+def fix_storagesyncconfig_content(content, file_path=None):
+    """StorageSyncConfig.create()にmockIdGeneratorを追加したcontentを返す"""
     # StorageSyncConfig.create({ ... }) → StorageSyncConfig.create({ ... }, mockIdGenerator)
-    # 複数行にまたがるcreate呼び出しを処理
-    pattern = r'(StorageSyncConfig\.create\(\{[^}]*(?:\{[^}]*\}[^}]*)*\}\))'
-    
-    def replace_create_call(match):
-        call = match.group(1)
-        if ', mockIdGenerator' not in call:
-            # 最後の })を }, mockIdGenerator)に置換
-            return call.replace('})', '}, mockIdGenerator)')
-        return call
-    
-    # 単純なパターンマッチングでは複数行対応が困難なため、行ベースで処理
-    lines = content.split('\n')
-    new_lines = []
-    i = 0
-    
-    while i < len(lines):
-        line = lines[i]
-        
-        # StorageSyncConfig.create({で始まる行を検出
-        if 'StorageSyncConfig.create({' in line and ', mockIdGenerator' not in line:
-            # 複数行にまたがるcreate呼び出しを処理
-            create_lines = [line]
-            i += 1
-            
-            # });で終わる行まで収集
-            while i < len(lines) and not lines[i].strip().endswith('});'):
-                create_lines.append(lines[i])
-                i += 1
-            
-            if i < len(lines):
-                # });で終わる行を処理
-                end_line = lines[i]
-                if ', mockIdGenerator);' not in end_line:
-                    end_line = end_line.replace('});', '}, mockIdGenerator);')
-                create_lines.append(end_line)
-                i += 1
-            
-            new_lines.extend(create_lines)
-        else:
-            new_lines.append(line)
-            i += 1
+    # 括弧の対応で呼び出しの範囲を特定するため、複数行・ネストしたオブジェクトにも対応する
+    return add_id_generator(content, STORAGE_SYNC_CONFIG)
+
+def fix_storagesyncconfig_create_calls(file_path, content=None, stats=None):
+    """StorageSyncConfig.create()でIdGeneratorが不足している箇所を修正"""
+    if content is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
     
-    # 修正された内容を書き戻し
-    new_content = '\n'.join(new_lines)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    # 内容が変わった場合のみ書き戻し
+    new_content = fix_storagesyncconfig_content(content, file_path)
+    if new_content == content:
+        if stats is not None:
+            stats.record(file_path, False)
+        return False
     
-    print(f"Fixed StorageSyncConfig.create calls in: {file_path}")
+    written = write_if_changed(file_path, new_content, stats)
+    if written:
+        print(f"Fixed StorageSyncConfig.create calls in: {file_path}")
+    return written
+
+register_rule('storagesyncconfig-create', fix_storagesyncconfig_content,
+              anchors=anchors(STORAGE_SYNC_CONFIG),
+              description='StorageSyncConfig.create()にmockIdGeneratorを追加 (fix_storagesyncconfig.py)')
 
-def main():
+def main(argv=None):
     """メイン処理"""
+    args = parse_target_args('StorageSyncConfig.create()呼び出しにmockIdGeneratorを追加する', argv)
     # StorageSyncConfigを使用するテストファイルを検索
-    test_files = []
-    
-    patterns = [
-        'src/**/__tests__/*.test.ts',
-        'src/**/*.test.ts'
-    ]
-    
-    for pattern in patterns:
-        test_files.extend(glob.glob(pattern, recursive=True))
+    test_files = find_targets(args)
     
-    # StorageSyncConfigを使用するファイルのみを対象
-    target_files = []
+    # StorageSyncConfigを使用するファイルのみを対象（読み込んだ内容は修正時にそのまま使う）
+    targets = []
     for file_path in test_files:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                if 'StorageSyncConfig.create(' in content:
-                    target_files.append(file_path)
+            if 'StorageSyncConfig.create(' in content:
+                targets.append((file_path, content))
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
     
-    print(f"Found {len(target_files)} files with StorageSyncConfig.create calls")
+    print(f"Found {len(targets)} files with StorageSyncConfig.create calls")
     
     # 各ファイルを修正
-    for file_path in target_files:
+    stats = WriteStats()
+    for file_path, content in targets:
         try:
-            fix_storagesyncconfig_create_calls(file_path)
+            fix_storagesyncconfig_create_calls(file_path, content, stats)
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
     
-    print("StorageSyncConfig修正完了")
+    print(f"StorageSyncConfig修正完了 ({stats.summary()})")
 
 if __name__ == '__main__':
     main()
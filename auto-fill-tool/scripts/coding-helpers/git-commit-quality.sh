@@ -17,22 +17,13 @@ if [ -n "$MY_SLACK_OAUTH_TOKEN" ] && [ -n "$MY_SLACK_USER_ID" ]; then
 fi
 
 echo "## 🏗️ ステップ1: アーキテクチャ準拠確認"
-npm run lint:architecture
+# レイヤー間の依存ルールをimportグラフでチェック（importが変わったファイルだけチェックし直す）
+python3 "$(dirname "$0")/layer_rules.py"
 
 echo ""
 echo "## 🧪 ステップ2: 変更ファイルのテスト実行"
-# ステージされたTypeScriptファイルに関連するテストを実行
-CHANGED_FILES=$(git diff --cached --name-only --diff-filter=AM | grep '\.ts$' | grep -v '\.test\.ts$' | head -5)
-if [ -n "$CHANGED_FILES" ]; then
-    echo "変更されたファイル:"
-    echo "$CHANGED_FILES"
-    echo ""
-
-    # ディレクトリごとにテストを実行
-    echo "$CHANGED_FILES" | xargs -I {} dirname {} | sort | uniq | xargs -I {} npm test -- --testPathPattern="{}" --passWithNoTests
-else
-    echo "テスト対象のTypeScriptファイルの変更はありません"
-fi
+# ステージされたファイルに直接・間接に依存するテストだけを、1回のjest実行でまとめて実行
+python3 "$(dirname "$0")/affected_tests.py" --run
 
 echo ""
 echo "## 🔍 ステップ3: 変更ファイルのLintチェック"
@@ -59,7 +50,8 @@ echo "- Domain層 → 他レイヤー（禁止）"
 echo "- Application層 → Infrastructure/Presentation層（禁止）"
 echo "- 循環依存（禁止）"
 echo ""
-npm run analyze:circular
+# madgeで全ファイルを解決し直す代わりに、変更されたファイルだけを読み直すimportグラフで検出する
+python3 "$(dirname "$0")/import_graph.py" --circular
 
 echo ""
 echo "## ✅ コミット品質チェック完了"
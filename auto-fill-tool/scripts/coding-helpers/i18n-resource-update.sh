@@ -129,6 +129,15 @@ else
     echo "⚠️ メッセージファイルが不足しているため、整合性チェックをスキップします"
 fi
 
+echo ""
+echo "## 🔎 メッセージキー使用状況チェック"
+if command -v python3 &> /dev/null; then
+    # 未使用キー・コードから参照されているのに未定義のキー・ロケール別カバレッジ（不足があっても続行）
+    python3 "$(dirname "$0")/source_index.py" --project-root . || true
+else
+    echo "⚠️ python3 が見つからないため、使用状況チェックをスキップします"
+fi
+
 echo ""
 echo "## ✅ 多言語リソース更新完了"
 echo ""
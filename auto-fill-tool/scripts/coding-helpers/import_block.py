@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+TypeScriptファイルのimport文のモデル
+
+ファイルを1回だけ走査して行頭の import 文（複数行を含む）を解析し、名前付きimportの
+追加（冪等）・重複の統合・未使用の削除・並べ替えをモデル上で行い、最後に変更のあった文だけを書き戻す。
+codemodエンジンはルールが宣言した import（Rule.imports）をファイルごとにまとめ、
+全ルールの適用後に ensure_imports() で1回だけ反映する。
+
+    block = ImportBlock(content)
+    block.add('Result', RESULT_MODULE)
+    content = block.render()
+"""
+
+import re
+
+RESULT_MODULE = '@domain/values/result.value'
+ID_GENERATOR_MODULE = '@domain/types/id-generator.types'
+# 移動したモジュール（古いパスのimportは新しいパスに付け替える）
+MOVED_MODULES = {
+    '@domain/types/result.types': RESULT_MODULE,
+}
+
+_IMPORT = re.compile(
+    r'''^import[ \t]+(?:(?P<type>type)[ \t]+(?=[{*\w$]))?(?P<clause>[^;'"]*?)\s*from[ \t]*(?P<q>['"])(?P<module>[^'"\n]+)(?P=q)[ \t]*;?'''
+    r'''|^import[ \t]*(?P<sq>['"])(?P<side>[^'"\n]+)(?P=sq)[ \t]*;?''',
+    re.MULTILINE)
+# 使用箇所の判定で読み飛ばすコメントと文字列（テンプレートリテラルは ${} を含むのでコードとして扱う）
+_NAME_OR_SKIP = re.compile(
+    r'''//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|(?<![.\w$])([A-Za-z_$][\w$]*)''',
+    re.DOTALL)
+_LEADING_COMMENTS = re.compile(r'(?:[ \t]*(?://[^\n]*|/\*.*?\*/)[ \t]*\n)*', re.DOTALL)
+_SPECIFIER = re.compile(r'^(?:(type)\s+)?([\w$]+)(?:\s+as\s+([\w$]+))?$')
+
+
+class ImportDecl:
+    """1つの import 文"""
+
+    def __init__(self, start, end, text, module, type_only=False, default=None, namespace=None,
+                 names=None, side_effect=False, opaque=False, quote="'"):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.module = module
+        self.type_only = type_only
+        self.default = default
+        self.namespace = namespace
+        # [(importされる名前, ローカル名, type指定)]
+        self.names = names if names is not None else []
+        self.side_effect = side_effect
+        # 解析できない形（句中のコメント等）は書き換えない
+        self.opaque = opaque
+        self.quote = quote
+        self.multiline = '\n' in text
+        self.dirty = False
+        self.removed = False
+
+    @property
+    def locals(self):
+        found = [local for _, local, _ in self.names]
+        if self.default:
+            found.append(self.default)
+        if self.namespace:
+            found.append(self.namespace)
+        return found
+
+    @property
+    def editable(self):
+        return not (self.opaque or self.side_effect or self.namespace or self.removed)
+
+    def render(self):
+        if not self.dirty:
+            return self.text
+        specifiers = [(f'type {imported}' if is_type else imported) + (f' as {local}' if local != imported else '')
+                      for imported, local, is_type in self.names]
+        clause = []
+        if self.default:
+            clause.append(self.default)
+        if specifiers:
+            if self.multiline:
+                clause.append('{\n' + ''.join(f'  {s},\n' for s in specifiers) + '}')
+            else:
+                clause.append('{ ' + ', '.join(specifiers) + ' }')
+        q = self.quote
+        return f"import {'type ' if self.type_only else ''}{', '.join(clause)} from {q}{self.module}{q};"
+
+
+def _parse_clause(decl, clause):
+    if not clause or '/' in clause:
+        decl.opaque = True
+        return
+    clause = ' '.join(clause.split())
+    if clause.startswith('* as '):
+        decl.namespace = clause[5:].strip()
+        return
+    default, _, rest = clause.partition(',') if not clause.startswith('{') else ('', '', clause)
+    decl.default = default.strip() or None
+    rest = rest.strip()
+    if rest.startswith('* as '):
+        decl.namespace = rest[5:].strip()
+    elif rest:
+        if not (rest.startswith('{') and rest.endswith('}')):
+            decl.opaque = True
+            return
+        for part in rest[1:-1].split(','):
+            part = part.strip()
+            if not part:
+                continue
+            match = _SPECIFIER.match(part)
+            if match is None:
+                decl.opaque = True
+                return
+            imported = match.group(2)
+            decl.names.append((imported, match.group(3) or imported, bool(match.group(1))))
+
+
+class ImportBlock:
+    """ファイル内の import 文の一覧と、それ以外の部分で使われている識別子"""
+
+    def __init__(self, content):
+        self.content = content
+        self.decls = []
+        self.added = []
+        for match in _IMPORT.finditer(content):
+            if match.group('side') is not None:
+                decl = ImportDecl(match.start(), match.end(), match.group(0), match.group('side'),
+                                  side_effect=True, quote=match.group('sq'))
+            else:
+                decl = ImportDecl(match.start(), match.end(), match.group(0), match.group('module'),
+                                  type_only=bool(match.group('type')), quote=match.group('q'))
+                _parse_clause(decl, match.group('clause'))
+            self.decls.append(decl)
+        self._used = None
+
+    @property
+    def used(self):
+        """import 文以外で使われている識別子（コメントと文字列の中は除く）"""
+        if self._used is None:
+            used = set()
+            position = 0
+            for decl in self.decls + [None]:
+                end = len(self.content) if decl is None else decl.start
+                for match in _NAME_OR_SKIP.finditer(self.content, position, end):
+                    if match.group(1):
+                        used.add(match.group(1))
+                position = end if decl is None else decl.end
+            self._used = used
+        return self._used
+
+    def declares(self, name):
+        """nameをファイル内で宣言しているか（同名のimportを追加すると衝突する）"""
+        pattern = rf'(?<![\w$.])(?:const|let|var|function|class|interface|type|enum)\s+{re.escape(name)}(?![\w$])'
+        return re.search(pattern, self.content) is not None
+
+    def _live(self):
+        return [decl for decl in self.decls + self.added if not decl.removed]
+
+    def _all_locals(self):
+        return [local for decl in self._live() for local in decl.locals]
+
+    def imported(self, name):
+        """nameをローカル名としてimportしている文（なければNone）"""
+        return next((decl for decl in self._live() if name in decl.locals), None)
+
+    def add(self, name, module, type_only=False, imported=None):
+        """名前付きimportを追加する（既にimportされていれば何もしない）。追加したらTrue
+
+        importedを指定すると `import { imported as name }` の形で追加する。
+        """
+        if self.imported(name) is not None:
+            return False
+        target = next((decl for decl in self._live()
+                       if decl.module == module and decl.editable and decl.type_only == type_only), None)
+        if target is None:
+            last = self._live()[-1] if self._live() else None
+            target = ImportDecl(None, None, '', module, type_only=type_only, quote=last.quote if last else "'")
+            target.dirty = True
+            self.added.append(target)
+        target.names.append((imported or name, name, False))
+        target.dirty = True
+        return True
+
+    def relocate(self, moved=MOVED_MODULES):
+        """移動したモジュールからのimportを新しいパスに付け替える。付け替えた数を返す"""
+        count = 0
+        for decl in self._live():
+            if decl.module in moved:
+                decl.module = moved[decl.module]
+                decl.dirty = True
+                count += 1
+        return count
+
+    def dedupe(self, merge=False):
+        """同じローカル名の重複したimportを取り除く（最初のimportを残す）。変更があればTrue
+
+        mergeがTrueなら、同じモジュールからの名前付きimportも1つの文にまとめる。
+        """
+        changed = False
+        owner = {}
+        for decl in self._live():
+            for local in decl.locals:
+                owner.setdefault(local, decl)
+        first = {}
+        for decl in self._live():
+            if not decl.editable:
+                continue
+            seen = set()
+            names = []
+            for spec in decl.names:
+                if owner[spec[1]] is decl and spec[1] not in seen:
+                    seen.add(spec[1])
+                    names.append(spec)
+            if names != decl.names:
+                decl.names = names
+                decl.dirty = changed = True
+                if not names and not decl.default:
+                    decl.removed = True
+                    continue
+            if not merge:
+                continue
+            key = (decl.module, decl.type_only)
+            target = first.setdefault(key, decl)
+            if target is decl or (decl.default and target.default):
+                continue
+            target.names.extend(decl.names)
+            target.default = target.default or decl.default
+            target.dirty = decl.removed = changed = True
+        return changed
+
+    def remove_unused(self, only=None):
+        """どこからも使われていない名前付き・デフォルトimportを取り除く。変更があればTrue
+
+        onlyを指定するとその中のローカル名だけを対象にする。
+        """
+        changed = False
+        keep = self.used if only is None else self.used | (set(self._all_locals()) - set(only))
+        for decl in self._live():
+            if not decl.editable:
+                continue
+            names = [spec for spec in decl.names if spec[1] in keep]
+            default = decl.default if decl.default in keep else None
+            if names == decl.names and default == decl.default:
+                continue
+            decl.names, decl.default = names, default
+            if not names and not default:
+                decl.removed = True
+            decl.dirty = changed = True
+        return changed
+
+    def sort(self):
+        """各文の名前付きimportを名前順（大文字小文字を区別しない）に並べ替える。変更があればTrue"""
+        changed = False
+        for decl in self._live():
+            if not decl.editable:
+                continue
+            names = sorted(decl.names, key=lambda spec: (spec[0].lower(), spec[0]))
+            if names != decl.names:
+                decl.names = names
+                decl.dirty = changed = True
+        return changed
+
+    def render(self):
+        """変更のあった文だけを置き換えたcontentを返す（追加した文は最後のimport文の行の後に置く）"""
+        if not self.added and not any(decl.dirty or decl.removed for decl in self.decls):
+            return self.content
+        added = '\n'.join(decl.render() for decl in self.added if not decl.removed)
+        anchor = next((decl for decl in reversed(self.decls) if not decl.removed), None)
+        pieces = []
+        position = 0
+        if added and anchor is None:
+            # import文がなければ先頭のコメント（@jest-environment 等）の後に置く
+            position = _LEADING_COMMENTS.match(self.content).end()
+            pieces.append(self.content[:position] + added + '\n')
+            added = ''
+        for decl in self.decls:
+            pieces.append(self.content[position:decl.start])
+            position = decl.end
+            if decl.removed:
+                # 行末のコメントごと行を削除する
+                newline = self.content.find('\n', position)
+                rest = self.content[position:] if newline < 0 else self.content[position:newline]
+                if not rest.strip() or rest.strip().startswith('//'):
+                    position = len(self.content) if newline < 0 else newline + 1
+                continue
+            pieces.append(decl.render())
+            if decl is anchor and added:
+                newline = self.content.find('\n', position)
+                newline = len(self.content) if newline < 0 else newline
+                pieces.append(self.content[position:newline] + '\n' + added)
+                position = newline
+        pieces.append(self.content[position:])
+        return ''.join(pieces)
+
+
+def ensure_imports(content, imports, organize=False):
+    """imports（ローカル名 -> モジュール）のうち、使われていてimportも宣言もされていない名前を追加する
+
+    MOVED_MODULES の古いパスのimportは付け替え、同じ名前の重複したimportは取り除く。
+    organizeがTrueなら、同じモジュールからのimportを1つの文にまとめ、未使用のimportを削除し、名前付きimportを並べ替える。
+    (新しいcontent, 追加した名前の一覧) を返す。
+    """
+    if not imports and not organize:
+        return content, []
+    block = ImportBlock(content)
+    block.relocate()
+    block.dedupe(merge=organize)
+    added = [name for name, module in imports.items()
+             if name in block.used and not block.declares(name) and block.add(name, module)]
+    if organize:
+        block.remove_unused()
+        block.sort()
+    return block.render(), added
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+TypeScriptのimportグラフ
+
+src 配下の *.ts から import / export ... from / import('...') / require('...') を抽出し、
+相対パスと tsconfig.json の paths（@domain/* などのエイリアス）を解決してファイル間の依存グラフを作る。
+- ファイルごとのimport指定子を内容のハッシュ付きでキャッシュし、変更されたファイルだけを読み直す
+  （抽出処理か tsconfig.json の paths が変わったらキャッシュ全体を作り直す）
+- madge --json と同じ形式の <layer>-deps.json（domain-deps.json 互換）を4レイヤー分出力できる
+- 循環依存を強連結成分（Tarjan）で検出する（npm run analyze:circular の madge の代わり）
+
+使い方（プロジェクトルートで実行）:
+    python3 scripts/coding-helpers/import_graph.py --circular          # 循環依存があれば終了コード1
+    python3 scripts/coding-helpers/import_graph.py --deps-dir .        # domain-deps.json 等を出力
+    python3 scripts/coding-helpers/import_graph.py --deps src/domain/entities/Website.ts
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from codemod_manifest import DEFAULT_CACHE_DIR
+from file_writer import atomic_write, content_hash
+
+GRAPH_FORMAT = 1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+DEFAULT_ROOTS = ('src',)
+LAYERS = ('domain', 'application', 'infrastructure', 'presentation')
+SOURCE_SUFFIXES = ('.ts', '.tsx')
+SKIP_DIRS = {'node_modules', 'dist', 'coverage', '.git'}
+# import指定子に付け足して試す拡張子（moduleResolution: bundler と同じ順）
+RESOLVE_SUFFIXES = ('', '.ts', '.tsx', '.d.ts', '/index.ts', '/index.tsx')
+
+# tsconfig.json が読めない場合に使うエイリアス
+DEFAULT_ALIASES = {
+    '@/*': 'src/*',
+    '@domain/*': 'src/domain/*',
+    '@application/*': 'src/application/*',
+    '@infrastructure/*': 'src/infrastructure/*',
+    '@presentation/*': 'src/presentation/*',
+    '@usecases/*': 'src/application/usecases/*',
+    '@tests/*': 'tests/*',
+}
+
+# 行頭の import / export ... from '...'（関数本体などを跨がないよう、途中に引用符・括弧・;を含まないもの）
+_STATIC_IMPORT = re.compile(r'''
+    ^[ \t]*(?P<keyword>import|export)\b
+    (?P<clause>[^;'"`()]*?\bfrom\s*|\s*)
+    (?P<q>['"])(?P<spec>[^'"\n]+)(?P=q)
+''', re.VERBOSE | re.MULTILINE)
+_DYNAMIC_IMPORT = re.compile(r'''
+    (?P<prefix>\btypeof\s+)?(?<![\w$.])(?:import|require)\s*\(\s*(?P<q>['"])(?P<spec>[^'"\n]+)(?P=q)\s*\)
+''', re.VERBOSE)
+_TYPE_CLAUSE = re.compile(r'^\s*type\b(?!\s*(?:,|from\b))')
+
+
+def extract_imports(content):
+    """import指定子を [[指定子, 行番号, 型のみか]] で出現順に返す"""
+    found = []
+    for match in _STATIC_IMPORT.finditer(content):
+        clause = match.group('clause')
+        if match.group('keyword') == 'export' and 'from' not in clause:
+            continue
+        found.append((match.start('spec'), match.group('spec'), bool(_TYPE_CLAUSE.match(clause))))
+    for match in _DYNAMIC_IMPORT.finditer(content):
+        found.append((match.start('spec'), match.group('spec'), match.group('prefix') is not None))
+    found.sort()
+
+    imports = []
+    line = 1
+    last = 0
+    for index, spec, type_only in found:
+        line += content.count('\n', last, index)
+        last = index
+        imports.append([spec, line, type_only])
+    return imports
+
+
+def _strip_json_comments(text):
+    """tsconfig.json の // と /* */ コメントを取り除く（文字列中は残す）"""
+    return re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or '', text, flags=re.DOTALL)
+
+
+def load_aliases(root):
+    """tsconfig.json の compilerOptions.paths を {エイリアス: baseUrlからのパス} で返す（先頭の候補のみ）"""
+    try:
+        with open(os.path.join(root, 'tsconfig.json'), 'r', encoding='utf-8') as f:
+            options = json.loads(_strip_json_comments(f.read())).get('compilerOptions', {})
+    except (OSError, ValueError):
+        return dict(DEFAULT_ALIASES)
+    base = options.get('baseUrl', '.')
+    aliases = {}
+    for alias, targets in options.get('paths', {}).items():
+        if targets:
+            aliases[alias] = os.path.normpath(os.path.join(base, targets[0])).replace(os.sep, '/')
+    return aliases or dict(DEFAULT_ALIASES)
+
+
+def graph_version(aliases):
+    """キャッシュのキー（このファイルの抽出処理とエイリアスが変わったらキャッシュを捨てる）"""
+    digest = hashlib.sha256()
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    digest.update(json.dumps(aliases, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class Resolver:
+    """import指定子をプロジェクト内のファイル（ルートからの相対パス）に解決する"""
+
+    def __init__(self, files, aliases, root=None):
+        self.files = files
+        self.root = root
+        # 長いエイリアスを優先する（@/* より @domain/* を先に試す）
+        self.aliases = []
+        for alias, target in sorted(aliases.items(), key=lambda item: len(item[0]), reverse=True):
+            if alias.endswith('*'):
+                self.aliases.append((alias[:-1], target[:-1] if target.endswith('*') else target, True))
+            else:
+                self.aliases.append((alias, target, False))
+
+    def candidates(self, importer, spec):
+        """指定子が指すパス（拡張子を補う前）の候補"""
+        if spec.startswith('.'):
+            yield os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace(os.sep, '/')
+            return
+        for prefix, target, wildcard in self.aliases:
+            if wildcard and spec.startswith(prefix):
+                yield os.path.normpath(target + spec[len(prefix):]).replace(os.sep, '/')
+                return
+            if not wildcard and spec == prefix:
+                yield target
+                return
+
+    def resolve(self, importer, spec):
+        """解決できたファイルの相対パス、外部パッケージや走査対象外のファイルなら None、存在しなければ False"""
+        for base in self.candidates(importer, spec):
+            # ESM形式の './foo.js' は foo.ts を指す
+            bases = [base, base[:-3]] if base.endswith('.js') else [base]
+            for stem in bases:
+                for suffix in RESOLVE_SUFFIXES:
+                    if stem + suffix in self.files:
+                        return stem + suffix
+            # tests/ のヘルパーや messages.json など、グラフに含めないファイル
+            if self.root is not None:
+                for stem in bases:
+                    for suffix in RESOLVE_SUFFIXES:
+                        if os.path.isfile(os.path.join(self.root, stem + suffix)):
+                            return None
+            return False
+        return None
+
+
+class ImportGraph:
+    """プロジェクト内の *.ts の依存グラフ（パスはすべてプロジェクトルートからの相対パス）"""
+
+    def __init__(self, root, roots=DEFAULT_ROOTS, cache_path=None, aliases=None, skip_type_imports=False):
+        self.root = root
+        self.roots = tuple(roots)
+        self.cache_path = cache_path
+        self.aliases = load_aliases(root) if aliases is None else aliases
+        self.version = graph_version(self.aliases)
+        self.skip_type_imports = skip_type_imports
+        # 相対パス -> {'size', 'mtime_ns', 'hash', 'imports': [[指定子, 行, 型のみか]]}
+        self.files = {}
+        self.scanned = 0
+        self.reused = 0
+        self._cached = {}
+        self._edges = None
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == GRAPH_FORMAT and data.get('version') == self.version:
+                    self._cached = data.get('files', {})
+            except (OSError, ValueError):
+                pass
+
+    @classmethod
+    def build(cls, root, roots=DEFAULT_ROOTS, cache_path=None, **kwargs):
+        """rootsを走査してグラフを作る（cache_pathがあれば変更のないファイルは読み直さない）"""
+        graph = cls(root, roots, cache_path, **kwargs)
+        graph.update()
+        return graph
+
+    def update(self):
+        """rootsを走査し直して、追加・変更・削除されたファイルを反映する"""
+        seen = set()
+        for top in self.roots:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(self.root, top)):
+                dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+                for filename in sorted(filenames):
+                    if filename.endswith(SOURCE_SUFFIXES):
+                        seen.add(self.update_file(os.path.join(dirpath, filename)))
+        for rel in set(self.files) - seen:
+            del self.files[rel]
+            self._edges = None
+
+    def update_file(self, path):
+        """1ファイル分を反映して相対パスを返す（サイズ・更新時刻・内容のハッシュが同じなら読み直さない）"""
+        rel = os.path.relpath(path, self.root).replace(os.sep, '/')
+        try:
+            st = os.stat(path)
+        except OSError:
+            if self.files.pop(rel, None) is not None:
+                self._edges = None
+            return rel
+
+        cached = self.files.get(rel) or self._cached.get(rel)
+        if cached is not None and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+            if self.files.get(rel) is not cached:
+                self.files[rel] = cached
+                self._edges = None
+            self.reused += 1
+            return rel
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = content_hash(data)
+        if cached is not None and cached['hash'] == digest:
+            # touchされただけ（内容は同じ）
+            entry = dict(cached, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            self.reused += 1
+        else:
+            entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': digest,
+                     'imports': extract_imports(data.decode('utf-8', errors='replace'))}
+            self.scanned += 1
+        self.files[rel] = entry
+        self._edges = None
+        return rel
+
+    def save(self):
+        """変更があればキャッシュに保存する（走査対象外のディレクトリのエントリは残す）"""
+        if self.cache_path is None:
+            return
+        prefixes = tuple(f'{top.rstrip("/")}/' for top in self.roots)
+        files = {rel: entry for rel, entry in self._cached.items() if not rel.startswith(prefixes)}
+        files.update(self.files)
+        if files == self._cached:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        data = {'format': GRAPH_FORMAT, 'version': self.version, 'files': files}
+        atomic_write(self.cache_path, json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+        self._cached = files
+
+    def _resolve_all(self):
+        resolver = Resolver(self.files, self.aliases, self.root)
+        edges = {}
+        externals = {}
+        unresolved = []
+        for rel in sorted(self.files):
+            targets = {}
+            for spec, line, type_only in self.files[rel]['imports']:
+                if type_only and self.skip_type_imports:
+                    continue
+                target = resolver.resolve(rel, spec)
+                if target is None:
+                    externals.setdefault(spec, []).append(rel)
+                elif target is False:
+                    unresolved.append((rel, line, spec))
+                elif target not in targets:
+                    targets[target] = line
+            edges[rel] = targets
+        self._edges = edges
+        self._externals = externals
+        self._unresolved = unresolved
+
+    @property
+    def edges(self):
+        """{ファイル: {依存先ファイル: 最初にimportした行}}"""
+        if self._edges is None:
+            self._resolve_all()
+        return self._edges
+
+    @property
+    def externals(self):
+        """{外部パッケージ・走査対象外のファイルの指定子: [importしているファイル]}"""
+        self.edges
+        return self._externals
+
+    @property
+    def unresolved(self):
+        """解決できなかった相対パス・エイリアスの [(ファイル, 行, 指定子)]"""
+        self.edges
+        return self._unresolved
+
+    def dependents(self):
+        """逆向きのグラフ {ファイル: {そのファイルをimportしているファイル}}"""
+        reverse = {rel: set() for rel in self.edges}
+        for rel, targets in self.edges.items():
+            for target in targets:
+                reverse[target].add(rel)
+        return reverse
+
+    def strongly_connected_components(self):
+        """Tarjanのアルゴリズムで強連結成分を求める（再帰を使わない版）"""
+        edges = self.edges
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+        for start in sorted(edges):
+            if start in index:
+                continue
+            work = [(start, iter(sorted(edges[start])))]
+            index[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(edges[child]))))
+                    elif child in on_stack:
+                        low[node] = min(low[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+        return components
+
+    def cycles(self):
+        """循環依存の強連結成分ごとに、その成分内の最短の循環経路を1つずつ返す"""
+        edges = self.edges
+        cycles = []
+        for component in self.strongly_connected_components():
+            start = component[0]
+            if len(component) == 1 and start not in edges[start]:
+                continue
+            members = set(component)
+            # startからstartへ戻る最短経路（成分内のBFS）
+            previous = {}
+            queue = [start]
+            found = None
+            while queue and found is None:
+                following = []
+                for node in queue:
+                    for child in sorted(edges[node]):
+                        if child == start:
+                            found = node
+                            break
+                        if child in members and child not in previous:
+                            previous[child] = node
+                            following.append(child)
+                    if found is not None:
+                        break
+                queue = following
+            path = [found]
+            while path[-1] != start:
+                path.append(previous[path[-1]])
+            cycles.append({'path': list(reversed(path)), 'files': component})
+        return sorted(cycles, key=lambda cycle: cycle['path'])
+
+    def layer_deps(self, layer):
+        """madge --json src/<layer> と同じ形式 {ファイル: [依存先]}（パスは src/<layer> からの相対パス）"""
+        base = f'src/{layer}'
+        deps = {}
+        for rel, targets in self.edges.items():
+            if rel.startswith(base + '/') and not rel.endswith('.d.ts'):
+                deps[os.path.relpath(rel, base)] = sorted(
+                    os.path.relpath(target, base).replace(os.sep, '/') for target in targets
+                    if not target.endswith('.d.ts'))
+        return dict(sorted(deps.items()))
+
+
+def default_cache_path(root):
+    return os.path.join(root, DEFAULT_CACHE_DIR, 'import-graph.json')
+
+
+def write_layer_deps(graph, directory, layers=LAYERS):
+    """<directory>/<layer>-deps.json を書き出し、書き出したパスの一覧を返す"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for layer in layers:
+        path = os.path.join(directory, f'{layer}-deps.json')
+        data = json.dumps(graph.layer_deps(layer), indent=2, ensure_ascii=False) + '\n'
+        atomic_write(path, data.encode('utf-8'))
+        paths.append(path)
+    return paths
+
+
+def print_cycles(cycles, out=sys.stdout):
+    if not cycles:
+        print("✔ No circular dependency found!", file=out)
+        return
+    print(f"✖ Found {len(cycles)} circular dependenc{'y' if len(cycles) == 1 else 'ies'}!\n", file=out)
+    for number, cycle in enumerate(cycles, 1):
+        print(f"{number}) {' > '.join(cycle['path'])}", file=out)
+        if len(cycle['files']) > len(cycle['path']):
+            print(f"   ({len(cycle['files'])} files in the same strongly connected component)", file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='TypeScriptのimportグラフを作成し、循環依存を検出する')
+    parser.add_argument('--project-root', default=DEFAULT_PROJECT_ROOT,
+                        help='プロジェクトルート (default: このスクリプトの2つ上のディレクトリ)')
+    parser.add_argument('--roots', default=','.join(DEFAULT_ROOTS),
+                        help=f'走査するディレクトリをカンマ区切りで指定 (default: {",".join(DEFAULT_ROOTS)})')
+    parser.add_argument('--no-cache', action='store_true', help='キャッシュを使わずに全ファイルを読み直す')
+    parser.add_argument('--skip-type-imports', action='store_true', help='import type / export type を依存に含めない')
+    parser.add_argument('--circular', action='store_true', help='循環依存を表示し、あれば終了コード1で終了')
+    parser.add_argument('--deps-dir', help='<layer>-deps.json（domain-deps.json 互換）を出力するディレクトリ')
+    parser.add_argument('--layers', default=','.join(LAYERS),
+                        help=f'--deps-dir で出力するレイヤー (default: {",".join(LAYERS)})')
+    parser.add_argument('--deps', metavar='FILE', help='指定したファイルの依存先を表示')
+    parser.add_argument('--dependents', metavar='FILE', help='指定したファイルをimportしているファイルを表示')
+    parser.add_argument('--json', metavar='PATH', help='グラフ全体（依存・循環・未解決のimport）をJSONで保存')
+    parser.add_argument('--verbose', '-v', action='store_true', help='解決できなかったimportを1件ずつ表示')
+    return parser.parse_args(argv)
+
+
+def _relative(root, path):
+    return os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/')
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root)
+    roots = [r.strip() for r in args.roots.split(',') if r.strip()]
+
+    started = time.perf_counter()
+    graph = ImportGraph.build(root, roots, None if args.no_cache else default_cache_path(root),
+                              skip_type_imports=args.skip_type_imports)
+    graph.save()
+    edges = graph.edges
+    print(f"Processed {len(edges)} files ({graph.scanned} scanned, {graph.reused} reused from cache) "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+    if graph.unresolved:
+        print(f"Warning: {len(graph.unresolved)} import(s) could not be resolved"
+              f"{'' if args.verbose else ' (use -v to list them)'}", file=sys.stderr)
+        if args.verbose:
+            for rel, line, spec in graph.unresolved:
+                print(f"  {rel}:{line}: '{spec}'", file=sys.stderr)
+
+    if args.deps:
+        for target in sorted(edges.get(_relative(root, args.deps), {})):
+            print(target)
+    if args.dependents:
+        for source in sorted(graph.dependents().get(_relative(root, args.dependents), ())):
+            print(source)
+
+    if args.deps_dir:
+        layers = [layer.strip() for layer in args.layers.split(',') if layer.strip()]
+        for path in write_layer_deps(graph, args.deps_dir, layers):
+            print(f"Wrote {path}", file=sys.stderr)
+
+    cycles = graph.cycles() if args.circular or args.json else []
+    if args.json:
+        data = {
+            'format': GRAPH_FORMAT,
+            'edges': {rel: sorted(targets) for rel, targets in edges.items()},
+            'cycles': cycles,
+            'unresolved': [{'file': rel, 'line': line, 'spec': spec} for rel, line, spec in graph.unresolved],
+            'externals': {spec: sorted(set(files)) for spec, files in sorted(graph.externals.items())},
+        }
+        atomic_write(args.json, (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    if args.circular:
+        print_cycles(cycles)
+        return 1 if cycles else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+jestの失敗結果の解析と、失敗したテストファイルだけへのcodemodルールの適用
+
+jestのテキスト出力（npm run test:coverage > coverage-output.txt 等）を1行ずつ読み、
+または jest --json の結果を読み込み、失敗したテスト（ファイル・テスト名・メッセージ・行番号）を取り出す。
+各失敗はメッセージの特徴（SIGNATURES）で分類し、--fix を付けると、分類ごとに対応するルールだけを
+その失敗が出たテストファイルだけに適用する。--rerun でそれらのテストファイルだけを1回のjestで再実行する。
+
+使い方（プロジェクトルートで実行）:
+    python3 scripts/coding-helpers/jest_failures.py coverage-output.txt            # 分類ごとの一覧
+    npm test -- --json --outputFile=jest-results.json; python3 scripts/coding-helpers/jest_failures.py jest-results.json
+    python3 scripts/coding-helpers/jest_failures.py coverage-output.txt --fix --dry-run > fix.diff
+    python3 scripts/coding-helpers/jest_failures.py coverage-output.txt --fix --rerun
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+import codemod
+import codemod_engine
+from affected_tests import run_jest
+from targets import find_project_root
+
+# 失敗の分類: メッセージのいずれかの行に patterns のどれかが一致したら、その rules を適用する（上から順に判定）
+SIGNATURES = [
+    {
+        'name': 'missing-result-import',
+        'patterns': [r"Cannot find name 'Result'"],
+        'rules': ['result-import'],
+        'description': 'Result のimportがない',
+    },
+    {
+        'name': 'duplicate-idgenerator',
+        'patterns': [r"(Duplicate identifier|Cannot redeclare block-scoped variable) '(mockIdGenerator|IdGenerator)'"],
+        'rules': ['idgenerator-dedupe'],
+        'description': 'IdGenerator のimportや mockIdGenerator の宣言が重複している',
+    },
+    {
+        'name': 'missing-idgenerator',
+        'patterns': [r"Cannot find name '(mockIdGenerator|IdGenerator)'"],
+        'rules': ['idgenerator-import-mock'],
+        'description': 'IdGenerator のimportや mockIdGenerator の宣言がない',
+    },
+    {
+        'name': 'create-arguments',
+        'patterns': [r'TS2554: Expected \d+ arguments?, but got \d+',
+                     r"Cannot read propert(y|ies) of undefined \(reading 'generate'\)"],
+        'rules': ['idgenerator-create-calls', 'storagesyncconfig-create', 'entity-create-calls'],
+        'description': 'Entity.create() に IdGenerator が渡されていない',
+    },
+    {
+        'name': 'result-wrapping',
+        'patterns': [r'Resolved to value: \{"_?(success|data|error)',
+                     r'^\s*[-+]\s+"_?(success|isSuccess|value)":',
+                     r"Cannot read propert(y|ies) of undefined \(reading '(isSuccess|isFailure|value|error)'\)",
+                     r'\.(isSuccess|isFailure|unwrap) is not a function'],
+        'rules': ['mocks', 'all-mocks', 'complex-mocks', 'issues-test'],
+        'description': 'Result型でラップされた値とラップされていない値の不一致',
+    },
+]
+
+_ANSI = re.compile(r'\x1b\[[0-9;]*m')
+_SUITE = re.compile(r'^(PASS|FAIL)\s+(\S+)')
+_TITLE = re.compile(r'^\s{2}● (.+)$')
+_STACK = re.compile(r'\(?([^\s():]+\.[jt]sx?):(\d+):(\d+)\)?$')
+_TS_ERROR = re.compile(r'^\s*([^\s:]+\.[jt]sx?):(\d+):(\d+) - error TS\d+')
+_CODE_FRAME = re.compile(r'^\s*>\s*(\d+) \|')
+# 1件の失敗について保持するメッセージの最大行数（巨大なdiffでもメモリ使用量を抑える）
+MAX_MESSAGE_LINES = 60
+
+
+class Failure:
+    """失敗した1つのテスト（またはテストスイート）"""
+
+    __slots__ = ('file', 'title', 'message', 'line', 'signature')
+
+    def __init__(self, file, title, message, line=None):
+        self.file = file
+        self.title = title
+        self.message = message
+        self.line = line
+        self.signature = None
+
+
+def compile_signatures(signatures=SIGNATURES):
+    return [(signature, [re.compile(p, re.MULTILINE) for p in signature['patterns']]) for signature in signatures]
+
+
+def classify(failure, compiled):
+    """最初に一致した分類の名前（なければNone）を failure.signature に入れて返す"""
+    for signature, patterns in compiled:
+        if any(pattern.search(failure.message) for pattern in patterns):
+            failure.signature = signature['name']
+            return failure.signature
+    return None
+
+
+def _location(file, lines):
+    """テストファイル内の行番号（スタックトレース → TSエラー → コードフレームの順に探す）"""
+    frame = None
+    for text in lines:
+        match = _STACK.search(text.strip()) or _TS_ERROR.match(text)
+        if match and (match.group(1) == file or match.group(1).endswith('/' + file)):
+            return int(match.group(2))
+        if frame is None:
+            match = _CODE_FRAME.match(text)
+            if match:
+                frame = int(match.group(1))
+    return frame
+
+
+def parse_text(lines):
+    """jestのテキスト出力（行のイテレータ）から Failure を順に返す
+
+    Summary of all failing tests で繰り返される失敗や console 出力のブロックは除く。
+    """
+    seen = set()
+    file = None
+    title = None
+    message = []
+
+    def finish():
+        if file is None or title is None or (file, title) in seen:
+            return None
+        seen.add((file, title))
+        while message and not message[-1].strip():
+            message.pop()
+        return Failure(file, title, '\n'.join(line.strip() for line in message), _location(file, message))
+
+    for raw in lines:
+        line = _ANSI.sub('', raw.rstrip('\n'))
+        match = _SUITE.match(line)
+        if match or line.startswith(('Summary of all failing tests', 'Test Suites:')):
+            failure = finish()
+            if failure:
+                yield failure
+            title = None
+            file = match.group(2) if match and match.group(1) == 'FAIL' else None
+            continue
+        match = _TITLE.match(line)
+        if match and file is not None:
+            failure = finish()
+            if failure:
+                yield failure
+            title = None if match.group(1) == 'Console' else match.group(1)
+            message = []
+            continue
+        if title is not None and len(message) < MAX_MESSAGE_LINES:
+            message.append(line)
+    failure = finish()
+    if failure:
+        yield failure
+
+
+def parse_json(data, root):
+    """jest --json の結果から Failure を順に返す（パスはrootからの相対パスにする）"""
+    for suite in data.get('testResults', []):
+        file = os.path.relpath(suite.get('name', ''), root).replace(os.sep, '/')
+        failed = [test for test in suite.get('assertionResults', []) if test.get('status') == 'failed']
+        if not failed and suite.get('status') == 'failed':
+            # コンパイルエラー等でテストスイート自体が実行できなかった
+            message = _ANSI.sub('', suite.get('message', ''))
+            yield Failure(file, 'Test suite failed to run', message.strip(), _location(file, message.splitlines()))
+        for test in failed:
+            message = _ANSI.sub('', '\n'.join(test.get('failureMessages', [])))
+            line = (test.get('location') or {}).get('line') or _location(file, message.splitlines())
+            yield Failure(file, test.get('fullName') or test.get('title', ''), message.strip(), line)
+
+
+def read_failures(path, root):
+    """テキスト出力かJSON（先頭が '{'）かを判定して Failure を順に返す（'-' は標準入力）"""
+    stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', errors='replace')
+    try:
+        first = ''
+        while not first.strip():
+            first = stream.readline()
+            if not first:
+                return
+        if first.lstrip().startswith('{'):
+            yield from parse_json(json.loads(first + stream.read()), root)
+        else:
+            yield from parse_text(_chain(first, stream))
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def plan_fixes(failures, signatures=SIGNATURES):
+    """{ルール名のタプル: [テストファイル]}（分類できなかった失敗しかないファイルは含めない）"""
+    rules_of = {signature['name']: signature['rules'] for signature in signatures}
+    per_file = {}
+    for failure in failures:
+        if failure.signature is not None:
+            per_file.setdefault(failure.file, [])
+            for name in rules_of[failure.signature]:
+                if name not in per_file[failure.file]:
+                    per_file[failure.file].append(name)
+    plan = {}
+    for file, names in sorted(per_file.items()):
+        # ルールの適用順は登録順に合わせる
+        ordered = tuple(rule.name for rule in codemod_engine.all_rules() if rule.name in names)
+        plan.setdefault(ordered, []).append(file)
+    return plan
+
+
+def print_report(failures, signatures=SIGNATURES, out=sys.stdout, verbose=False):
+    descriptions = {signature['name']: signature['description'] for signature in signatures}
+    groups = {}
+    for failure in failures:
+        groups.setdefault(failure.signature, []).append(failure)
+    for name in [s['name'] for s in signatures if s['name'] in groups] + ([None] if None in groups else []):
+        group = groups[name]
+        files = sorted({failure.file for failure in group})
+        label = f"{name}: {descriptions[name]}" if name else 'unclassified'
+        print(f"\n## {label} ({len(group)} test(s) in {len(files)} file(s))", file=out)
+        for failure in group:
+            location = f"{failure.file}:{failure.line}" if failure.line else failure.file
+            print(f"{location}: {failure.title}", file=out)
+            if verbose or name is None:
+                summary = next((line for line in failure.message.splitlines() if line.strip()), '')
+                print(f"    {summary}", file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='jestの失敗結果を分類し、失敗したテストファイルだけにルールを適用する')
+    parser.add_argument('results', nargs='+', help="jestのテキスト出力または --json の結果のファイル（'-' で標準入力）")
+    parser.add_argument('--project-root',
+                        help='プロジェクトルート (default: カレントディレクトリから package.json / tsconfig.json を探す)')
+    parser.add_argument('--fix', action='store_true', help='分類に対応するルールを失敗したテストファイルに適用する')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='--fix でファイルを書き換えず、unified diffを標準出力に出力する')
+    parser.add_argument('--rerun', action='store_true', help='失敗したテストファイルだけを1回のjestで再実行する')
+    parser.add_argument('-v', '--verbose', action='store_true', help='分類済みの失敗もメッセージの1行目を表示')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root) if args.project_root else find_project_root()
+    compiled = compile_signatures()
+
+    failures = []
+    seen = set()
+    try:
+        for path in args.results:
+            for failure in read_failures(path, root):
+                # 複数の結果ファイルに同じ失敗があれば1件にする
+                if (failure.file, failure.title) in seen:
+                    continue
+                seen.add((failure.file, failure.title))
+                classify(failure, compiled)
+                failures.append(failure)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    # 移動・削除されたテストファイルの失敗（古い出力）は対象にしない
+    missing = sorted({f.file for f in failures if not os.path.isfile(os.path.join(root, f.file))})
+    for file in missing:
+        print(f"Warning: {file} no longer exists; ignoring its failures", file=sys.stderr)
+    failures = [f for f in failures if f.file not in missing]
+
+    log = sys.stderr if args.dry_run else sys.stdout
+    print_report(failures, out=log, verbose=args.verbose)
+    files = sorted({failure.file for failure in failures})
+    classified = sum(1 for failure in failures if failure.signature)
+    print(f"\n{len(failures)} failing test(s) in {len(files)} file(s), {classified} classified", file=log)
+
+    if args.fix:
+        codemod.load_rule_modules()
+        for names, targets in plan_fixes(failures).items():
+            rules = codemod_engine.get_rules(list(names))
+            paths = [os.path.relpath(os.path.join(root, file)) for file in targets]
+
+            def on_outcome(outcome):
+                if outcome.diff:
+                    sys.stdout.write(outcome.diff)
+
+            results = codemod_engine.run(root, rules, files=paths, dry_run=args.dry_run, on_outcome=on_outcome)
+            verb = 'Would fix' if args.dry_run else 'Fixed'
+            print(f"{verb} {len(results)}/{len(targets)} file(s) with {', '.join(names)}", file=log)
+
+    if args.rerun and files and not args.dry_run:
+        return run_jest(root, files, [])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
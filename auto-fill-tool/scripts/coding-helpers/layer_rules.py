@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Clean Architectureのレイヤー間の依存ルールのチェック
+
+import_graph のファイルごとのimportを解決し、宣言的なルール（どのファイルから・どのファイルやパッケージを
+importしてはいけないか）に違反しているimportを file:line で報告する。
+チェック結果はファイルごとに内容のハッシュ付きでキャッシュし、importが変わったファイルだけをチェックし直す。
+
+ルールは RULES の形式のリスト（--config でJSONファイルから読み込むこともできる）:
+    name            ルール名
+    severity        'error'（終了コード1）または 'warning'
+    files           対象ファイルのパターン（fnmatch。'*' は '/' もまたぐ）
+    exclude         対象から外すファイルのパターン
+    include_tests   __tests__ / *.test.ts も対象にするか（default: False）
+    forbid          importしてはいけないファイルのパターン
+    forbid_packages 外部パッケージのimportを禁止するか（allow_packages に挙げたものは除く）
+    message         報告するメッセージ
+
+使い方（プロジェクトルートで実行）:
+    python3 scripts/coding-helpers/layer_rules.py
+    python3 scripts/coding-helpers/layer_rules.py --config architecture-rules.json
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import time
+
+from codemod_manifest import DEFAULT_CACHE_DIR
+from file_writer import atomic_write
+from import_graph import DEFAULT_PROJECT_ROOT, DEFAULT_ROOTS, ImportGraph, Resolver, default_cache_path
+
+RESULTS_FORMAT = 1
+
+# src/__tests__/architecture/dependency-rules.test.ts と .eslintrc-architecture.js のルール
+RULES = [
+    {
+        'name': 'domain-independence',
+        'severity': 'error',
+        'files': ['src/domain/*'],
+        'forbid': ['src/application/*', 'src/infrastructure/*', 'src/presentation/*'],
+        'message': 'Domain層は他のレイヤーに依存してはいけない',
+    },
+    {
+        'name': 'domain-purity',
+        'severity': 'error',
+        'files': ['src/domain/*'],
+        # 型宣言ファイルは外部APIの型を記述するためのもの
+        'exclude': ['*.d.ts'],
+        'forbid_packages': True,
+        'allow_packages': ['uuid'],
+        'message': 'Domain層は外部ライブラリを直接importせず、ポートインターフェースを使う',
+    },
+    {
+        'name': 'application-independence',
+        'severity': 'error',
+        'files': ['src/application/*'],
+        'forbid': ['src/infrastructure/*', 'src/presentation/*'],
+        'message': 'Application層はInfrastructure層・Presentation層に依存してはいけない',
+    },
+    {
+        'name': 'presentation-no-domain-entities',
+        'severity': 'error',
+        'files': ['src/presentation/*'],
+        # 現状はこれらのファイルでのDomainエンティティの直接使用を許可している（ViewModelへの移行は今後の改善項目）
+        'exclude': ['*ViewModel*', '*Presenter*', '*Coordinator*', '*Handler*', '*Manager*',
+                    '*/index.ts', 'src/presentation/background/*', '*View.ts'],
+        'forbid': ['src/domain/entities/*'],
+        'message': 'Presentation層はDomainエンティティを直接importせず、ViewModelを使う',
+    },
+    {
+        'name': 'presentation-no-domain-repositories',
+        'severity': 'warning',
+        'files': ['src/presentation/*'],
+        'forbid': ['src/domain/repositories/*'],
+        'message': 'Presentation層はリポジトリを直接使わず、UseCase経由でアクセスする',
+    },
+]
+
+
+def is_test_file(path):
+    return '/__tests__/' in path or path.endswith('.test.ts')
+
+
+def _matches(path, patterns):
+    return any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns)
+
+
+def rules_version(rules):
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def load_rules(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    for rule in rules:
+        for key in ('name', 'files'):
+            if key not in rule:
+                raise ValueError(f"rule {rule.get('name', '?')}: '{key}' is required")
+        if rule.setdefault('severity', 'error') not in ('error', 'warning'):
+            raise ValueError(f"rule {rule['name']}: severity must be 'error' or 'warning'")
+    return rules
+
+
+def check_file(rel, imports, resolver, rules):
+    """1ファイル分のimportをチェックし、違反を [[行, ルール名, severity, 指定子, 解決先]] で返す"""
+    applicable = [rule for rule in rules
+                  if _matches(rel, rule['files'])
+                  and not _matches(rel, rule.get('exclude', ()))
+                  and (rule.get('include_tests') or not is_test_file(rel))]
+    if not applicable:
+        return []
+
+    violations = []
+    for spec, line, _ in imports:
+        target = resolver.resolve(rel, spec)
+        is_package = target is None and not any(True for _ in resolver.candidates(rel, spec))
+        for rule in applicable:
+            if target and _matches(target, rule.get('forbid', ())):
+                violations.append([line, rule['name'], rule['severity'], spec, target])
+            elif is_package and rule.get('forbid_packages'):
+                package = spec.split('/')[0] if not spec.startswith('@') else '/'.join(spec.split('/')[:2])
+                if package not in rule.get('allow_packages', ()):
+                    violations.append([line, rule['name'], rule['severity'], spec, None])
+    return violations
+
+
+class LayerChecker:
+    """ルール違反のファイルごとのキャッシュ付きチェッカー"""
+
+    def __init__(self, graph, rules=RULES, cache_path=None):
+        self.graph = graph
+        self.rules = rules
+        self.cache_path = cache_path
+        # importの抽出・エイリアスが変わると解決先も変わるので、グラフのバージョンもキーに含める
+        self.version = f'{rules_version(rules)}-{graph.version}'
+        # ファイルの追加・削除でimportの解決先が変わるので、ファイル一覧もキャッシュのキーに含める
+        self.file_set = hashlib.sha256('\n'.join(sorted(graph.files)).encode('utf-8')).hexdigest()[:16]
+        self.checked = 0
+        self.reused = 0
+        self._cached = {}
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if (data.get('format') == RESULTS_FORMAT and data.get('rules') == self.version
+                        and data.get('files_digest') == self.file_set):
+                    self._cached = data.get('files', {})
+            except (OSError, ValueError):
+                pass
+        self.results = {}
+
+    def check(self, paths=None):
+        """paths（省略時は全ファイル）をチェックし、{ファイル: 違反の一覧} を返す"""
+        resolver = Resolver(self.graph.files, self.graph.aliases, self.graph.root)
+        for rel in sorted(self.graph.files if paths is None else paths):
+            entry = self.graph.files.get(rel)
+            if entry is None:
+                continue
+            cached = self._cached.get(rel)
+            if cached is not None and cached['hash'] == entry['hash']:
+                self.results[rel] = cached
+                self.reused += 1
+                continue
+            self.results[rel] = {'hash': entry['hash'],
+                                 'violations': check_file(rel, entry['imports'], resolver, self.rules)}
+            self.checked += 1
+        return {rel: result['violations'] for rel, result in self.results.items() if result['violations']}
+
+    def save(self):
+        if self.cache_path is None or self.checked == 0:
+            return
+        files = dict(self._cached)
+        files.update(self.results)
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        data = {'format': RESULTS_FORMAT, 'rules': self.version, 'files_digest': self.file_set, 'files': files}
+        atomic_write(self.cache_path, json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+
+def print_violations(violations, rules, out=sys.stdout, show_warnings=True):
+    """違反を file:line 形式で表示し、(エラー数, 警告数) を返す"""
+    messages = {rule['name']: rule.get('message', '') for rule in rules}
+    errors = warnings = 0
+    for rel in sorted(violations):
+        for line, name, severity, spec, target in violations[rel]:
+            if severity == 'error':
+                errors += 1
+            else:
+                warnings += 1
+                if not show_warnings:
+                    continue
+            imported = spec if target is None or target == spec else f"{spec} ({target})"
+            print(f"{rel}:{line}: {severity}: [{name}] {messages[name]}: {imported}", file=out)
+    return errors, warnings
+
+
+def default_results_path(root):
+    return os.path.join(root, DEFAULT_CACHE_DIR, 'layer-rules.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Clean Architectureのレイヤー間の依存ルールをチェックする')
+    parser.add_argument('files', nargs='*', help='チェックするファイル（省略時は全ファイル）')
+    parser.add_argument('--project-root', default=DEFAULT_PROJECT_ROOT,
+                        help='プロジェクトルート (default: このスクリプトの2つ上のディレクトリ)')
+    parser.add_argument('--config', help='ルールを定義したJSONファイル（省略時は組み込みのルール）')
+    parser.add_argument('--no-cache', action='store_true', help='キャッシュを使わずにすべてチェックし直す')
+    parser.add_argument('--no-warnings', action='store_true', help='warningのルールの違反を表示しない')
+    parser.add_argument('--strict', action='store_true', help='warningも終了コード1にする')
+    parser.add_argument('--list-rules', action='store_true', help='ルールの一覧を表示')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root)
+    try:
+        rules = load_rules(args.config) if args.config else RULES
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.list_rules:
+        for rule in rules:
+            print(f"{rule['name']} ({rule['severity']}): {rule.get('message', '')}")
+        return 0
+
+    started = time.perf_counter()
+    graph = ImportGraph.build(root, DEFAULT_ROOTS, None if args.no_cache else default_cache_path(root))
+    graph.save()
+    checker = LayerChecker(graph, rules, None if args.no_cache else default_results_path(root))
+    paths = [os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/') for path in args.files] or None
+    violations = checker.check(paths)
+    checker.save()
+
+    errors, warnings = print_violations(violations, rules, show_warnings=not args.no_warnings)
+    print(f"{errors} error(s), {warnings} warning(s) in {len(checker.results)} files "
+          f"({checker.checked} checked, {checker.reused} reused from cache) "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+テスト間で重複しているモックの宣言の検出と src/__mocks__/helpers への集約
+
+__tests__ 配下の各テストファイルから `mock*` の宣言・代入（`const mockIdGenerator: IdGenerator = {...};`、
+beforeEach 内の `mockLogger = {...} as any;` 等）を取り出し、初期化式を空白・コメント・末尾カンマを除いて正規化した
+フィンガープリントでまとめる。重複の多さ（ファイル数 × 正規化後の大きさ）の順に報告し、
+--hoist を付けると --min-count 以上のファイルで重複しているものを src/__mocks__/helpers/fixtures.ts に移してimportに書き換える。
+
+- トップレベルの const: fixtures.ts の `export const` にして、テストファイルの宣言はimportに置き換える
+  （jestはテストファイルごとにモジュールを読み込み直すので、インスタンスがファイル間で共有されることはない）
+- それ以外（beforeEach 内の代入等）: fixtures.ts の `export function createMockXxx()` にして、初期化式をその呼び出しに置き換える
+名前はモックする型X（`as jest.Mocked<X>`・変数の型注釈・キーをすべて持つinterface）から mockX / createMockX とし、
+同じ型の別の形のモックは番号を付けずに集約しない（型が分からなければローカル名から付ける）。
+初期化式が参照する名前はテストファイルの名前付きimportから解決し、fixtures.ts にも同じimportを追加する。
+テストファイル内の変数を参照するもの、jest.mock() のファクトリから参照されるものは集約しない。
+
+使い方（どのディレクトリから実行してもプロジェクトルートを探して使う）:
+    python3 scripts/coding-helpers/mock_fixtures.py                          # 重複の多い順に上位20件
+    python3 scripts/coding-helpers/mock_fixtures.py --top 50 --json mocks.json
+    python3 scripts/coding-helpers/mock_fixtures.py --hoist --min-count 5 --dry-run > hoist.diff
+    python3 scripts/coding-helpers/mock_fixtures.py --hoist --min-count 5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from codemod_engine import unified_diff
+from file_writer import WriteStats, atomic_write, write_if_changed
+from import_block import ImportBlock
+from targets import add_target_arguments, find_project_root, find_targets, walk_targets
+from ts_scanner import find_calls, line_col, scan, skip_string, skip_template
+
+FIXTURES_PATH = 'src/__mocks__/helpers/fixtures.ts'
+FIXTURES_MODULE = '@/__mocks__/helpers/fixtures'
+FIXTURES_HEADER = '// scripts/coding-helpers/mock_fixtures.py --hoist で生成（複数のテストで重複していたモック）\n'
+TEST_GLOBS = ('src/**/__tests__/**/*.test.ts',)
+
+# `mockXxx = ...` / `const mockXxx: Type = ...`（型注釈に '=' を含む宣言は対象外）
+_DECL = re.compile(
+    r'^(?P<indent>[ \t]*)(?:(?P<keyword>const|let|var)[ \t]+)?(?P<name>mock[A-Z_$][\w$]*)'
+    r'[ \t]*(?::[ \t]*(?P<type>[^=;\n]+?))?[ \t]*=(?![=>])[ \t]*', re.MULTILINE)
+_EXPORT = re.compile(
+    r'^export[ \t]+(?:const[ \t]+(?P<const>[\w$]+)[ \t]*(?::[ \t]*(?P<type>[^=;\n]+?))?[ \t]*=[ \t]*'
+    r'|function[ \t]+(?P<function>[\w$]+)\(\)[ \t]*\{\s*return[ \t]+)', re.MULTILINE)
+_TOKEN = re.compile(r'''//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|[\w$]+|\S''', re.DOTALL)
+_NAME_OR_SKIP = re.compile(
+    r'''//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|(?<![.\w$])([A-Za-z_$][\w$]*)''', re.DOTALL)
+_MOCKED_TYPE = re.compile(r'\bas\s+jest\.Mocked<\s*([A-Z][\w$]*)\s*>\s*$')
+# 初期化式のない宣言（`let mockRepository: jest.Mocked<AutomationResultRepository>;`）
+_VAR_TYPE = re.compile(r'^[ \t]*(?:let|var|const)[ \t]+(?P<name>mock[\w$]*)[ \t]*:[ \t]*(?P<type>[^=;\n]+?)[ \t]*;',
+                       re.MULTILINE)
+# 型注釈からモックする型の名前を取り出す（`jest.Mocked<X>` / `Partial<X>` / `X`）
+_TYPE_NAME = re.compile(r'^(?:(?:jest\.)?(?:Mocked|MockedObject)<|Partial<)?\s*([A-Z][\w$]*)\s*>?$')
+_INTERFACE = re.compile(r'\binterface[ \t]+([A-Z][\w$]*)[^{;]*\{')
+_MEMBER = re.compile(r'^([ \t]*)(?:readonly[ \t]+)?([A-Za-z_$][\w$]*)\??[ \t]*[(:<]', re.MULTILINE)
+_ARROW_PARAMS = re.compile(r'\(([^()]*)\)[ \t]*(?::[^=;]+?)?=>|([A-Za-z_$][\w$]*)[ \t]*=>')
+# import しなくても参照できる名前（グローバル・組み込み型・キーワード）
+_BUILTINS = frozenset('''
+    jest expect Promise Date Error TypeError Object Array JSON Math String Number Boolean Symbol Map Set WeakMap
+    RegExp Function Uint8Array ArrayBuffer console window document global globalThis chrome crypto setTimeout
+    clearTimeout undefined null true false NaN Infinity Partial Required Readonly Record Pick Omit ReturnType
+    Parameters Awaited InstanceType any unknown string number boolean void never object as new async await return
+    function typeof keyof in of const let var this if else throw instanceof satisfies readonly extends delete
+'''.split())
+
+
+def normalize(text):
+    """コメント・空白・末尾カンマを除いたトークン列（フィンガープリントの元）"""
+    tokens = [token for token in _TOKEN.findall(text) if not token.startswith(('//', '/*'))]
+    kept = []
+    for index, token in enumerate(tokens):
+        if token == ',' and index + 1 < len(tokens) and tokens[index + 1] in ')]}':
+            continue
+        kept.append(token)
+    out = []
+    for token in kept:
+        if out and (out[-1][-1].isalnum() or out[-1][-1] in '_$') and (token[0].isalnum() or token[0] in '_$'):
+            out.append(' ')
+        out.append(token)
+    return ''.join(out)
+
+
+def references(text):
+    """textが参照する名前（プロパティ名・オブジェクトのキー・アロー関数の引数・組み込みの名前を除く）"""
+    params = set()
+    for match in _ARROW_PARAMS.finditer(text):
+        if match.group(2):
+            params.add(match.group(2))
+            continue
+        for part in match.group(1).split(','):
+            params.update(re.findall(r'[A-Za-z_$][\w$]*', part.split(':', 1)[0]))
+    names = set()
+    for match in _NAME_OR_SKIP.finditer(text):
+        name = match.group(1)
+        if not name:
+            continue
+        before = text[:match.start()].rstrip()[-1:]
+        after = text[match.end():].lstrip()[:1]
+        if after == ':' and before in ('{', ','):
+            continue
+        names.add(name)
+    return names - params - _BUILTINS
+
+
+def statement_end(content, start, pairs):
+    """start から始まる式の終わりの ';' の位置（括弧・文字列を読み飛ばす。';' で終わらなければNone）"""
+    i = start
+    n = len(content)
+    while i < n:
+        c = content[i]
+        if c in '([{':
+            close = pairs.get(i)
+            if close is None:
+                return None
+            i = close + 1
+        elif c in '\'"':
+            end = skip_string(content, i)
+            if end < 0:
+                return None
+            i = end
+        elif c == '`':
+            i = skip_template(content, i, pairs)
+        elif c == '/' and content.startswith('//', i):
+            newline = content.find('\n', i)
+            i = n if newline < 0 else newline
+        elif c == ';':
+            return i
+        elif c in ')]}':
+            return None
+        else:
+            i += 1
+    return None
+
+
+def _module_path(module, file_path, root):
+    """テストファイルからの相対パスのimportを '@/' からのパスにする"""
+    if not module.startswith('.'):
+        return module
+    target = os.path.normpath(os.path.join(os.path.dirname(file_path), module))
+    rel = os.path.relpath(target, os.path.join(root, 'src')).replace(os.sep, '/')
+    return None if rel.startswith('../') else '@/' + rel
+
+
+def resolve_imports(names, block, file_path, root):
+    """names を block の名前付きimportから解決して [(モジュール, importされる名前, ローカル名, type指定)] を返す
+
+    テストファイル内の変数・デフォルトimport・名前空間importを参照していればNone。
+    """
+    resolved = []
+    for name in sorted(names):
+        decl = block.imported(name)
+        if decl is None or decl.opaque or decl.side_effect:
+            return None
+        spec = next((spec for spec in decl.names if spec[1] == name), None)
+        module = _module_path(decl.module, file_path, root)
+        if spec is None or module is None:
+            return None
+        resolved.append((module, spec[0], name, decl.type_only or spec[2]))
+    return tuple(resolved)
+
+
+class Occurrence:
+    """テストファイル内の1つのモックの宣言・代入"""
+
+    __slots__ = ('file', 'name', 'kind', 'start', 'end', 'init_start', 'init', 'type', 'indent',
+                 'imports', 'reason', 'size', 'key', 'unused', 'mocked')
+
+    def __init__(self, file, name, kind, start, end, init_start, init, type_, indent):
+        self.file = file
+        self.name = name
+        # shared: トップレベルの const（exportしてimportする） / factory: それ以外（関数にして呼び出す）
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.init_start = init_start
+        self.init = init
+        self.type = type_
+        self.indent = indent
+        self.imports = None
+        # 集約できない理由（集約できればNone）
+        self.reason = None
+        self.size = len(normalize(init))
+        self.key = None
+        # トップレベルの const がファイル内で使われていない（importせずに削除する）
+        self.unused = False
+        # モックする型の名前（`as jest.Mocked<X>` か変数の型注釈から。分からなければNone）
+        typed = _MOCKED_TYPE.search(init)
+        self.mocked = typed.group(1) if typed else type_name(type_)
+
+    def fingerprint(self):
+        """種類・正規化した初期化式（と型注釈）・解決したimportからキーを求める"""
+        parts = [self.kind, normalize(self.init), normalize(self.type) if self.kind == 'shared' else '',
+                 repr(self.imports)]
+        self.key = hashlib.sha1('\0'.join(parts).encode('utf-8')).hexdigest()[:12]
+        return self.key
+
+
+def type_name(annotation):
+    """型注釈がモックする型の名前（`jest.Mocked<X>` 等の形でなければNone）"""
+    match = _TYPE_NAME.match(annotation.strip()) if annotation else None
+    return match.group(1) if match else None
+
+
+def object_keys(init):
+    """オブジェクトリテラル（`{...} as X` も含む）の最上位のキー（オブジェクトでなければ空）"""
+    tokens = [token for token in _TOKEN.findall(init) if not token.startswith(('//', '/*'))]
+    if not tokens or tokens[0] != '{':
+        return frozenset()
+    keys = set()
+    depth = 0
+    for index, token in enumerate(tokens):
+        if token in '([{':
+            depth += 1
+        elif token in ')]}':
+            depth -= 1
+            if depth == 0:
+                break
+        elif depth == 1 and tokens[index - 1] in ('{', ',') and index + 1 < len(tokens) \
+                and tokens[index + 1] in (':', '(') and re.match(r'[A-Za-z_$]', token):
+            keys.add(token)
+    return frozenset(keys)
+
+
+def load_interfaces(root):
+    """src 配下（テスト以外）の interface の {メンバー名の集合: [interface名]}"""
+    interfaces = {}
+    for rel in walk_targets(root, ('src/**/*.ts',)):
+        if '__tests__' in rel or '__mocks__' in rel or rel.endswith('.test.ts'):
+            continue
+        with open(os.path.join(root, rel), 'r', encoding='utf-8') as f:
+            content = f.read()
+        if 'interface' not in content:
+            continue
+        pairs = scan(content).pairs
+        for match in _INTERFACE.finditer(content):
+            close = pairs.get(match.end() - 1)
+            if close is None:
+                continue
+            members = _MEMBER.findall(content, match.end(), close)
+            if not members:
+                continue
+            # ネストした型リテラルのメンバーを除くため、最も浅いインデントの行だけを使う
+            indent = min(len(member_indent) for member_indent, _ in members)
+            names = frozenset(name for member_indent, name in members if len(member_indent) == indent)
+            interfaces.setdefault(names, []).append(match.group(1))
+    return interfaces
+
+
+def find_occurrences(content, file_path, root):
+    """contentの `mock*` の宣言・代入を [Occurrence] で返す"""
+    result = scan(content)
+    if not result.ok:
+        return []
+    block = ImportBlock(content)
+    factories = find_calls(content, 'jest.mock', result)
+    declared = {}
+    for match in _DECL.finditer(content):
+        if match.group('keyword'):
+            declared[match.group('name')] = declared.get(match.group('name'), 0) + 1
+    var_types = {match.group('name'): match.group('type') for match in _VAR_TYPE.finditer(content)}
+
+    found = []
+    for match in _DECL.finditer(content):
+        end = statement_end(content, match.end(), result.pairs)
+        if end is None:
+            continue
+        name = match.group('name')
+        shared = match.group('keyword') == 'const' and not match.group('indent')
+        occurrence = Occurrence(file_path, name, 'shared' if shared else 'factory', match.start(), end + 1,
+                                match.end(), content[match.end():end].rstrip(), (match.group('type') or '').strip(),
+                                match.group('indent'))
+        if occurrence.mocked is None:
+            occurrence.mocked = type_name(var_types.get(name))
+        refs = references(occurrence.init)
+        if shared:
+            refs |= references(occurrence.type)
+        if name in refs:
+            occurrence.reason = 'refers to itself'
+        elif shared and declared.get(name, 0) > 1:
+            occurrence.reason = 'declared more than once'
+        elif shared and any(re.search(rf'(?<![\w$.]){re.escape(name)}(?![\w$])', content[open_:close])
+                            for open_, close in factories):
+            occurrence.reason = 'used in a jest.mock() factory'
+        else:
+            occurrence.imports = resolve_imports(refs, block, file_path, root)
+            if occurrence.imports is None:
+                occurrence.reason = 'refers to names not imported by name'
+            elif any(module == FIXTURES_MODULE for module, _, _, _ in occurrence.imports):
+                # 集約済み（fixtures.ts の関数の呼び出し等）
+                continue
+        if shared:
+            pattern = rf'(?<![\w$.]){re.escape(name)}(?![\w$])'
+            occurrence.unused = not (re.search(pattern, content[:occurrence.start])
+                                     or re.search(pattern, content[occurrence.end:]))
+        occurrence.fingerprint()
+        found.append(occurrence)
+    return found
+
+
+class Group:
+    """同じフィンガープリントのOccurrenceの集まり"""
+
+    def __init__(self, key):
+        self.key = key
+        self.occurrences = []
+
+    @property
+    def files(self):
+        return sorted({occurrence.file for occurrence in self.occurrences})
+
+    @property
+    def size(self):
+        return self.occurrences[0].size
+
+    @property
+    def score(self):
+        return len(self.files) * self.size
+
+    @property
+    def kind(self):
+        return self.occurrences[0].kind
+
+    @property
+    def name(self):
+        """最も多く使われているローカル名"""
+        counts = {}
+        for occurrence in self.occurrences:
+            counts[occurrence.name] = counts.get(occurrence.name, 0) + 1
+        return max(sorted(counts), key=lambda name: counts[name])
+
+    @property
+    def reason(self):
+        return self.occurrences[0].reason
+
+    def mocked(self, interfaces):
+        """モックする型の名前（型注釈で最も多いもの。なければキーをすべて持つinterfaceが1つだけならその名前）"""
+        counts = {}
+        for occurrence in self.occurrences:
+            if occurrence.mocked:
+                counts[occurrence.mocked] = counts.get(occurrence.mocked, 0) + 1
+        if counts:
+            return max(sorted(counts), key=lambda name: counts[name])
+        keys = object_keys(self.occurrences[0].init)
+        if not keys:
+            return None
+        candidates = interfaces.get(keys, [])
+        if not candidates and len(keys) > 1:
+            # 一部のメソッドだけのモック
+            candidates = [name for members, names in interfaces.items() if keys < members for name in names]
+        return candidates[0] if len(candidates) == 1 else None
+
+
+def group_occurrences(occurrences):
+    groups = {}
+    for occurrence in occurrences:
+        groups.setdefault(occurrence.key, Group(occurrence.key)).occurrences.append(occurrence)
+    return sorted(groups.values(), key=lambda group: (-group.score, group.name, group.key))
+
+
+def _export_name(group, interfaces):
+    """モックする型Xが分かれば mockX（共有するconst）/ createMockX（関数）、分からなければローカル名から付ける"""
+    mocked = group.mocked(interfaces)
+    if group.kind == 'shared':
+        return f'mock{mocked}' if mocked else group.name
+    if mocked:
+        return f'createMock{mocked}'
+    return 'create' + group.name[0].upper() + group.name[1:]
+
+
+def read_fixtures(path, root):
+    """既存の fixtures.ts の {フィンガープリント: export名} と内容（なければ空）を返す"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError:
+        return {}, ''
+    result = scan(content)
+    block = ImportBlock(content)
+    exported = {}
+    for match in _EXPORT.finditer(content):
+        end = statement_end(content, match.end(), result.pairs)
+        if end is None:
+            continue
+        name = match.group('const') or match.group('function')
+        kind = 'shared' if match.group('const') else 'factory'
+        occurrence = Occurrence(path, name, kind, match.start(), end + 1, match.end(), content[match.end():end],
+                                (match.group('type') or '').strip(), '')
+        refs = references(occurrence.init) | (references(occurrence.type) if kind == 'shared' else set())
+        occurrence.imports = resolve_imports(refs, block, path, root)
+        if occurrence.imports is not None:
+            exported[occurrence.fingerprint()] = name
+    return exported, content
+
+
+def _reindent(text, indent, prefix):
+    lines = text.split('\n')
+    return '\n'.join([lines[0]] + [prefix + (line[len(indent):] if line.startswith(indent) else line.lstrip())
+                                   for line in lines[1:]])
+
+
+def render_export(occurrence, name):
+    if occurrence.kind == 'shared':
+        annotation = f': {occurrence.type}' if occurrence.type else ''
+        return f'export const {name}{annotation} = {occurrence.init};\n'
+    return f'export function {name}() {{\n  return {_reindent(occurrence.init, occurrence.indent, "  ")};\n}}\n'
+
+
+def _removal_span(content, start, end):
+    """宣言の文を、直前に付いたコメント行と行末の改行ごと削除する範囲"""
+    newline = content.find('\n', end)
+    end = len(content) if newline < 0 else newline + 1
+    while start > 0:
+        previous = content.rfind('\n', 0, start - 1) + 1
+        if not content[previous:start].strip().startswith('//'):
+            break
+        start = previous
+    # 前後が空行なら片方を詰める
+    if content[start - 2:start] == '\n\n' and content[end:end + 1] == '\n':
+        end += 1
+    return start, end
+
+
+def rewrite_test(content, occurrences, names):
+    """occurrences を fixtures.ts のimport・呼び出しに置き換えたcontentを返す（names: フィンガープリント -> export名）"""
+    block = ImportBlock(content)
+    edits = []
+    imports = []
+    hoisted_refs = set()
+    for occurrence in occurrences:
+        export = names[occurrence.key]
+        if occurrence.kind == 'shared':
+            start, end = _removal_span(content, occurrence.start, occurrence.end)
+            edits.append((start, end, ''))
+            if not occurrence.unused:
+                imports.append((occurrence.name, export))
+        else:
+            # 同じ名前を別のモジュールからimport・宣言していれば置き換えない
+            existing = block.imported(export)
+            if (existing is not None and existing.module != FIXTURES_MODULE) or block.declares(export):
+                continue
+            edits.append((occurrence.init_start, occurrence.end - 1, f'{export}()'))
+            imports.append((export, export))
+        hoisted_refs.update(local for _, _, local, _ in occurrence.imports)
+    for start, end, replacement in sorted(edits, reverse=True):
+        content = content[:start] + replacement + content[end:]
+    block = ImportBlock(content)
+    for local, export in sorted(imports, key=lambda item: item[1].lower()):
+        block.add(local, FIXTURES_MODULE, imported=export if export != local else None)
+    block.remove_unused(only=hoisted_refs)
+    return block.render()
+
+
+def build_fixtures(content, groups, names):
+    """fixtures.ts の新しい内容（既存のexportは残し、新しいものを末尾に追加する）"""
+    content = content or FIXTURES_HEADER
+    additions = []
+    block_imports = []
+    for group in groups:
+        if names[group.key] in _exported_names(content):
+            continue
+        occurrence = group.occurrences[0]
+        additions.append(render_export(occurrence, names[group.key]))
+        block_imports.extend(occurrence.imports)
+    if not additions:
+        return content
+    content = content.rstrip('\n') + '\n\n' + '\n'.join(additions)
+    block = ImportBlock(content)
+    for module, imported, local, type_only in block_imports:
+        block.add(local, module, type_only=False, imported=imported if imported != local else None)
+    return block.render()
+
+
+def _exported_names(content):
+    return {match.group('const') or match.group('function') for match in _EXPORT.finditer(content)}
+
+
+def plan_hoist(groups, existing, existing_content, min_count, min_size, interfaces):
+    """集約するグループ・{フィンガープリント: export名}・名前が重なるので集約しないグループを返す
+
+    既存のexportと同じものはその名前を使う。同じ型の別の形のモックは番号を付けず、スコアの高いものだけを集約する。
+    """
+    names = dict(existing)
+    taken = set(existing.values()) | _exported_names(existing_content)
+    selected = []
+    skipped = []
+    for group in groups:
+        hoistable = group.reason is None and len(group.files) >= min_count and group.size >= min_size
+        if group.key not in existing and not hoistable:
+            continue
+        if group.key not in names:
+            name = _export_name(group, interfaces)
+            if name in taken:
+                skipped.append((group, name))
+                continue
+            names[group.key] = name
+            taken.add(name)
+        selected.append(group)
+    return selected, names, skipped
+
+
+def print_report(groups, top, root, out=sys.stdout):
+    print(f"{'score':>7} {'files':>5} {'size':>5}  {'kind':<8} {'name':<32} {'id':<12}  example", file=out)
+    for group in groups[:top]:
+        occurrence = group.occurrences[0]
+        with open(os.path.join(root, occurrence.file), 'r', encoding='utf-8') as f:
+            line = line_col(f.read(), occurrence.start)[0]
+        note = f"  (not hoistable: {group.reason})" if group.reason else ''
+        print(f"{group.score:>7} {len(group.files):>5} {group.size:>5}  {group.kind:<8} {group.name:<32} "
+              f"{group.key:<12}  {occurrence.file}:{line}{note}", file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='テスト間で重複しているモックの宣言を検出し、src/__mocks__/helpers に集約する')
+    add_target_arguments(parser, TEST_GLOBS)
+    parser.add_argument('--top', type=int, default=20, help='報告する件数 (default: 20)')
+    parser.add_argument('--json', metavar='PATH', help='全グループをJSONで保存する')
+    parser.add_argument('--hoist', action='store_true', help=f'重複しているモックを {FIXTURES_PATH} に移してimportに書き換える')
+    parser.add_argument('--min-count', type=int, default=3, help='--hoist の対象にする最小のファイル数 (default: 3)')
+    parser.add_argument('--min-size', type=int, default=30,
+                        help='--hoist の対象にする正規化後の初期化式の最小の長さ (default: 30)')
+    parser.add_argument('--dry-run', action='store_true', help='--hoist でファイルを書き換えず、unified diffを標準出力に出力する')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    paths = find_targets(args)
+    root = os.path.abspath(args.project_root) if args.project_root else find_project_root()
+    fixtures_path = os.path.join(root, FIXTURES_PATH)
+
+    occurrences = []
+    contents = {}
+    for path in paths:
+        rel = os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/')
+        with open(path, 'r', encoding='utf-8') as f:
+            contents[rel] = f.read()
+        occurrences.extend(find_occurrences(contents[rel], os.path.join(root, rel), root))
+    for occurrence in occurrences:
+        occurrence.file = os.path.relpath(occurrence.file, root).replace(os.sep, '/')
+    groups = [group for group in group_occurrences(occurrences) if len(group.files) > 1]
+
+    log = sys.stderr if args.dry_run else sys.stdout
+    print_report(groups, args.top, root, out=log)
+    duplicated = sum(group.size * (len(group.files) - 1) for group in groups)
+    print(f"\n{len(groups)} duplicated mock(s) across {len({f for g in groups for f in g.files})} file(s) "
+          f"in {len(paths)} scanned, ~{duplicated} normalized byte(s) duplicated", file=log)
+    if args.json:
+        report = [{'id': group.key, 'name': group.name, 'kind': group.kind, 'files': group.files,
+                   'size': group.size, 'score': group.score, 'hoistable': group.reason is None,
+                   'reason': group.reason} for group in groups]
+        atomic_write(args.json, (json.dumps(report, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+        print(f"Report written to {args.json}", file=log)
+    if not args.hoist:
+        return 0
+
+    existing, fixtures_content = read_fixtures(fixtures_path, root)
+    selected, names, skipped = plan_hoist(groups, existing, fixtures_content, args.min_count, args.min_size,
+                                          load_interfaces(root))
+    for group, name in skipped:
+        print(f"Skipped {group.key} ({group.name} in {len(group.files)} file(s)): "
+              f"another variant is already hoisted as {name}", file=log)
+    if not selected:
+        print("Nothing to hoist", file=log)
+        return 0
+
+    per_file = {}
+    for group in selected:
+        for occurrence in group.occurrences:
+            per_file.setdefault(occurrence.file, []).append(occurrence)
+    updates = {FIXTURES_PATH: (fixtures_content, build_fixtures(fixtures_content, selected, names))}
+    for rel, file_occurrences in sorted(per_file.items()):
+        updates[rel] = (contents[rel], rewrite_test(contents[rel], file_occurrences, names))
+
+    stats = WriteStats()
+    for rel, (before, after) in updates.items():
+        if before == after:
+            continue
+        if args.dry_run:
+            sys.stdout.write(unified_diff(rel, before, after))
+        else:
+            write_if_changed(os.path.join(root, rel), after, stats)
+    verb = 'Would hoist' if args.dry_run else 'Hoisted'
+    print(f"{verb} {len(selected)} mock(s) into {FIXTURES_PATH}, rewriting {len(per_file)} test file(s)"
+          + ('' if args.dry_run else f" ({stats.summary()})"), file=log)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
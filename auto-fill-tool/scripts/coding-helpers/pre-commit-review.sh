@@ -20,55 +20,9 @@ echo "## 📊 Git状態確認"
 git status --porcelain
 
 echo ""
-echo "## 📈 変更ファイル数確認"
-CHANGED_FILES_COUNT=$(git diff --cached --name-only | wc -l)
-echo "ステージされたファイル数: $CHANGED_FILES_COUNT"
-
-if [ "$CHANGED_FILES_COUNT" -ge 10 ]; then
-    echo "⚠️ 10ファイル以上の変更が検出されました。詳細レビューを実行します。"
-else
-    echo "✅ 変更ファイル数は適切です。"
-fi
-
-echo ""
-echo "## 🔍 デバッグコードの検出"
-DEBUG_CODE=$(git diff --cached | grep -n -E '(console\.(log|debug|info|warn|error)|debugger;|alert\(|confirm\()' || true)
-if [ -n "$DEBUG_CODE" ]; then
-    echo "⚠️ デバッグコードが検出されました:"
-    echo "$DEBUG_CODE"
-else
-    echo "✅ デバッグコードは検出されませんでした"
-fi
-
-echo ""
-echo "## 🔒 機密情報の検出"
-SENSITIVE_INFO=$(git diff --cached | grep -n -i -E '(api[_-]?key|password|secret|token|credential)\s*[=:]\s*["'"'"'][^"'"'"'\\n]{8,}' || true)
-if [ -n "$SENSITIVE_INFO" ]; then
-    echo "🚨 機密情報の可能性があるコードが検出されました:"
-    echo "$SENSITIVE_INFO"
-else
-    echo "✅ 機密情報は検出されませんでした"
-fi
-
-echo ""
-echo "## 🗑️ 不要ファイルの検出"
-UNWANTED_FILES=$(git diff --cached --name-only | grep -E '\.(DS_Store|log|tmp|cache)$|node_modules/|dist/|coverage/' || true)
-if [ -n "$UNWANTED_FILES" ]; then
-    echo "⚠️ 不要ファイルが検出されました:"
-    echo "$UNWANTED_FILES"
-else
-    echo "✅ 不要ファイルは検出されませんでした"
-fi
-
-echo ""
-echo "## 📝 空白変更の検出"
-WHITESPACE_ISSUES=$(git diff --cached --check || true)
-if [ -n "$WHITESPACE_ISSUES" ]; then
-    echo "⚠️ 空白変更の問題が検出されました:"
-    echo "$WHITESPACE_ISSUES"
-else
-    echo "✅ 空白変更の問題は検出されませんでした"
-fi
+# git diff --cached を1回だけ読み、ファイル数・デバッグコード・機密情報・不要ファイル・空白・
+# 同一パターン変更・権限変更をまとめて検出する
+python3 "$(dirname "$0")/staged_diff_review.py"
 
 echo ""
 echo "## 🎯 コミットメッセージ規約確認"
@@ -4,6 +4,7 @@ set -e
 echo "## ✅ 品質ゲート完全チェックを開始します"
 echo ""
 echo "### チェック項目"
+echo "0. 構造チェック（途中で切れたファイル・括弧の不整合・未終端の文字列）"
 echo "1. カバレッジ測定"
 echo "2. テスト実行"
 echo "3. Lint自動修正"
@@ -17,6 +18,11 @@ if [ -n "$MY_SLACK_OAUTH_TOKEN" ] && [ -n "$MY_SLACK_USER_ID" ]; then
     bash slackNotification.sh "[$]品質ゲート開始" "6ステップ品質保証プロセスを開始しました。"
 fi
 
+# 壊れたファイルがあれば型チェックやjestを待たずに止める
+echo "## 🧱 ステップ0: 構造チェック"
+python3 "$(dirname "$0")/structure_check.py"
+
+echo ""
 echo "## 📊 ステップ1: カバレッジ測定"
 npm run test:coverage
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+mockResolvedValue(...) の引数を Result.success(...) でラップする共通処理
+
+ts_scanner で引数の範囲を正確に特定するため、深くネストしたオブジェクトや文字列中の括弧でも誤変換せず、
+ファイルサイズに対して線形時間で動作する。既に Result.success(...) などでラップ済みの引数は
+リテラルとして扱わないので、何度実行しても結果は変わらない（冪等）。
+"""
+
+import re
+
+from ts_scanner import find_calls, scan, skip_string
+
+MOCK_RESOLVED_VALUE = '.mockResolvedValue'
+
+_NUMBER = re.compile(r'-?\d[\d_]*(?:\.\d+)?')
+_KEYWORD_KINDS = {'null': 'null', 'undefined': 'undefined', 'true': 'boolean', 'false': 'boolean'}
+
+
+def _trim(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def literal_span(text, start, end):
+    """引数範囲text[start:end]から前後の空白と末尾カンマを除いた範囲を返す"""
+    start, end = _trim(text, start, end)
+    if end > start and text[end - 1] == ',':
+        start, end = _trim(text, start, end - 1)
+    return start, end
+
+
+def classify_argument(text, start, end, pairs):
+    """text[start:end]（literal_spanで整えた範囲）が単一のリテラルならその種類を返す
+
+    'object' / 'empty-object' / 'array' / 'empty-array' / 'string' / 'number' / 'boolean' / 'null' / 'undefined'
+    のいずれか。変数・関数呼び出し・複数引数などリテラル以外は None。
+    """
+    if start >= end:
+        return None
+
+    c = text[start]
+    if c in '{[':
+        if pairs.get(start) != end - 1:
+            return None
+        empty = not text[start + 1:end - 1].strip()
+        kind = 'object' if c == '{' else 'array'
+        return f'empty-{kind}' if empty else kind
+    if c in '\'"':
+        return 'string' if skip_string(text, start) == end else None
+    if c == '`':
+        # ${...} を含まない単純なテンプレートリテラルのみ
+        body = text[start + 1:end - 1]
+        if end - start >= 2 and text[end - 1] == '`' and '`' not in body and '${' not in body:
+            return 'string'
+        return None
+    word = text[start:end]
+    if word in _KEYWORD_KINDS:
+        return _KEYWORD_KINDS[word]
+    if _NUMBER.fullmatch(word):
+        return 'number'
+    return None
+
+
+def wrap_mock_resolved_values(content, kinds, accept=None):
+    """mockResolvedValue(<リテラル>) のうち、種類がkindsに含まれるものを Result.success(...) でラップする
+
+    acceptを渡すと (引数テキスト, 種類) -> bool で追加の絞り込みができる。
+    """
+    if MOCK_RESOLVED_VALUE not in content:
+        return content
+
+    result = scan(content)
+    insertions = []
+    for open_index, close_index in find_calls(content, MOCK_RESOLVED_VALUE, result):
+        start, end = literal_span(content, open_index + 1, close_index)
+        kind = classify_argument(content, start, end, result.pairs)
+        if kind is None or kind not in kinds:
+            continue
+        if accept is not None and not accept(content[start:end], kind):
+            continue
+        insertions.append((start, 'Result.success('))
+        insertions.append((end, ')'))
+
+    if not insertions:
+        return content
+
+    # 挿入位置順に1回で組み立てる（同じ位置では登録順を保つ）
+    insertions.sort(key=lambda item: item[0])
+    parts = []
+    last = 0
+    for index, text in insertions:
+        parts.append(content[last:index])
+        parts.append(text)
+        last = index
+    parts.append(content[last:])
+    return ''.join(parts)
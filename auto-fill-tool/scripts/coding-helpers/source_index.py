@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+StandardErrorのエラーコードとi18nメッセージキーの使用箇所の索引
+
+src と public を1回だけ走査し、各ファイルから1つの正規表現で次を抽出する。
+- new StandardError('<code>') のエラーコード（<code>_USER / _DEV / _RESOLUTION を使用とみなす）
+- I18nAdapter / chrome.i18n の getMessage / format / hasMessage に渡したキー
+- data-i18n / data-i18n-placeholder / -title / -aria 等の属性値と manifest.json 等の __MSG_<key>__
+- キー名として使われ得る文字列リテラル（動的に組み立てたキーの候補）
+抽出結果はファイルごとに (size, mtime) 付きでキャッシュし、変更されたファイルだけを読み直す。
+
+使い方（プロジェクトルートで実行）:
+    python3 scripts/coding-helpers/source_index.py              # 未使用キー・ロケール別の不足キー・カバレッジを表示
+    python3 scripts/coding-helpers/source_index.py --json i18n-report.json
+    python3 scripts/coding-helpers/source_index.py --prune      # 未使用キーを全ロケールから削除
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from codemod_manifest import DEFAULT_CACHE_DIR
+from file_writer import atomic_write
+
+INDEX_FORMAT = 1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+DEFAULT_ROOTS = ('src', 'public')
+DEFAULT_LOCALE = 'en'
+SCAN_SUFFIXES = ('.ts', '.js', '.html', '.json')
+SKIP_DIRS = {'node_modules', 'dist', 'coverage', '.git', '_locales'}
+ERROR_SUFFIXES = ('USER', 'DEV', 'RESOLUTION')
+
+_TOKEN = re.compile(r'''
+    (?:I18nAdapter|i18n)\s*\.\s*(?:getMessage|format|hasMessage)\s*\(\s*
+        (?P<cq>['"`])(?P<call>[A-Za-z0-9_@]+)(?P=cq)
+  | new\s+StandardError\s*\(\s*(?P<eq>['"`])(?P<error>[A-Za-z0-9_]+)(?P=eq)
+  | data-i18n(?:-(?!attr\b)[a-z]+)?\s*=\s*(?P<aq>['"])(?P<attr>[A-Za-z0-9_@]+)(?P=aq)
+  | __MSG_(?P<msg>[A-Za-z0-9_@]+)__
+  | (?P<lq>['"`])(?P<literal>[A-Za-z][A-Za-z0-9_]*)(?P=lq)
+''', re.VERBOSE)
+
+
+def _extractor_version():
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def is_test_file(path):
+    return '/__tests__/' in f'/{path}' or path.endswith(('.test.ts', '.spec.ts', '.test.js'))
+
+
+def extract(content):
+    """1ファイル分の抽出結果 {'errors': [[code, line]], 'keys': [[key, line, kind]], 'literals': [...]}"""
+    errors = []
+    keys = []
+    literals = set()
+    line = 1
+    last = 0
+    for match in _TOKEN.finditer(content):
+        kind = match.lastgroup
+        if kind == 'literal':
+            literals.add(match.group(kind))
+            continue
+        line += content.count('\n', last, match.start())
+        last = match.start()
+        if kind == 'error':
+            errors.append([match.group(kind), line])
+        else:
+            keys.append([match.group(kind), line, kind])
+    return {'errors': errors, 'keys': keys, 'literals': sorted(literals)}
+
+
+class SourceIndex:
+    """プロジェクト内のファイルごとの抽出結果（相対パス -> エントリ）"""
+
+    def __init__(self, root, cache_path=None):
+        self.root = root
+        self.cache_path = cache_path
+        self.version = _extractor_version()
+        self.files = {}
+        self.scanned = 0
+        self.reused = 0
+        self._cached = {}
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == INDEX_FORMAT and data.get('version') == self.version:
+                    self._cached = data.get('files', {})
+            except (OSError, ValueError):
+                pass
+
+    @classmethod
+    def build(cls, root, roots=DEFAULT_ROOTS, cache_path=None):
+        """rootsを走査して索引を作る（cache_pathがあれば変更のないファイルは読み直さない）"""
+        index = cls(root, cache_path)
+        index.update(roots)
+        return index
+
+    def update(self, roots=DEFAULT_ROOTS):
+        for top in roots:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(self.root, top)):
+                dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+                for filename in sorted(filenames):
+                    if filename.endswith(SCAN_SUFFIXES):
+                        self._index_file(os.path.join(dirpath, filename))
+
+    def _index_file(self, path):
+        rel = os.path.relpath(path, self.root).replace(os.sep, '/')
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        cached = self._cached.get(rel)
+        if cached is not None and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+            self.files[rel] = cached
+            self.reused += 1
+            return
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            entry = extract(f.read())
+        entry['size'] = st.st_size
+        entry['mtime_ns'] = st.st_mtime_ns
+        self.files[rel] = entry
+        self.scanned += 1
+
+    def save(self):
+        """変更があれば索引をキャッシュに保存する（削除されたファイルのエントリは落とす）"""
+        if self.cache_path is None or (self.scanned == 0 and len(self.files) == len(self._cached)):
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        data = {'format': INDEX_FORMAT, 'version': self.version, 'files': self.files}
+        atomic_write(self.cache_path, json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+    def _entries(self, include_tests):
+        for rel, entry in sorted(self.files.items()):
+            if include_tests or not is_test_file(rel):
+                yield rel, entry
+
+    def error_codes(self, include_tests=False):
+        """{エラーコード: [(path, line)]}"""
+        codes = {}
+        for rel, entry in self._entries(include_tests):
+            for code, line in entry['errors']:
+                codes.setdefault(code, []).append((rel, line))
+        return codes
+
+    def referenced_keys(self, include_tests=False):
+        """{メッセージキー: [(path, line, 種類)]}（エラーコードは3つのメッセージキーに展開する）"""
+        keys = {}
+        for rel, entry in self._entries(include_tests):
+            for key, line, kind in entry['keys']:
+                keys.setdefault(key, []).append((rel, line, kind))
+            for code, line in entry['errors']:
+                for suffix in ERROR_SUFFIXES:
+                    keys.setdefault(f'{code}_{suffix}', []).append((rel, line, 'error'))
+        return keys
+
+    def literals(self, include_tests=False):
+        return {literal for _, entry in self._entries(include_tests) for literal in entry['literals']}
+
+
+def load_locales(root):
+    """{ロケール: messages.json の内容} と、各ファイルのパス"""
+    locales_dir = os.path.join(root, 'public', '_locales')
+    locales = {}
+    paths = {}
+    if os.path.isdir(locales_dir):
+        for locale in sorted(os.listdir(locales_dir)):
+            path = os.path.join(locales_dir, locale, 'messages.json')
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    locales[locale] = json.load(f)
+                paths[locale] = path
+    return locales, paths
+
+
+def build_report(index, locales, default_locale=DEFAULT_LOCALE):
+    """未使用キー・ロケール別の不足キー・デフォルトロケールに対するカバレッジをまとめる"""
+    referenced = index.referenced_keys()
+    literals = index.literals()
+    defined = set(locales.get(default_locale, {}))
+
+    unreferenced = sorted(defined - set(referenced))
+    missing = {}
+    for locale, messages in locales.items():
+        missing[locale] = {key: referenced[key][0] for key in sorted(set(referenced) - set(messages))}
+    coverage = {}
+    for locale, messages in locales.items():
+        if locale == default_locale or not defined:
+            continue
+        absent = sorted(defined - set(messages))
+        coverage[locale] = {
+            'translated': len(defined) - len(absent),
+            'total': len(defined),
+            'percent': round((len(defined) - len(absent)) / len(defined) * 100, 1),
+            'missing': absent,
+        }
+    return {
+        'default_locale': default_locale,
+        'files': len(index.files),
+        'error_codes': sorted(index.error_codes()),
+        'referenced_keys': len(referenced),
+        'defined_keys': {locale: len(messages) for locale, messages in locales.items()},
+        # 直接の参照はないが文字列リテラルとして現れるキー（動的に組み立てている可能性がある）
+        'possibly_dynamic': [key for key in unreferenced if key in literals],
+        'unused': [key for key in unreferenced if key not in literals],
+        'missing': missing,
+        'coverage': coverage,
+    }
+
+
+def print_report(report, required=(), out=sys.stdout, verbose=False):
+    """レポートを表示（不足キーの一覧はrequiredのロケールだけ、verboseなら全ロケール）"""
+    print(f"Indexed {report['files']} files: {len(report['error_codes'])} error codes, "
+          f"{report['referenced_keys']} referenced message keys", file=out)
+    defined = ', '.join(f'{locale}={count}' for locale, count in report['defined_keys'].items())
+    print(f"Defined keys: {defined}", file=out)
+
+    print(f"\nUnused keys in {report['default_locale']}: {len(report['unused'])}", file=out)
+    for key in report['unused']:
+        print(f"  {key}", file=out)
+    print(f"Possibly used dynamically (string literal only): {len(report['possibly_dynamic'])}", file=out)
+    if verbose:
+        for key in report['possibly_dynamic']:
+            print(f"  {key}", file=out)
+
+    for locale, keys in report['missing'].items():
+        print(f"\nMissing in {locale}: {len(keys)}", file=out)
+        if locale not in required and not verbose:
+            continue
+        for key, (path, line, kind) in keys.items():
+            print(f"  {key}  ({path}:{line}, {kind})", file=out)
+
+    for locale, entry in report['coverage'].items():
+        print(f"\nCoverage {locale}: {entry['translated']}/{entry['total']} ({entry['percent']}%), "
+              f"{len(entry['missing'])} keys fall back to {report['default_locale']}", file=out)
+        if verbose:
+            for key in entry['missing']:
+                print(f"  {key}", file=out)
+
+
+def prune_unused(paths, locales, unused):
+    """未使用キーを全ロケールから削除し、削除したキー数を返す"""
+    removed = 0
+    unused = set(unused)
+    for locale, messages in locales.items():
+        kept = {key: value for key, value in messages.items() if key not in unused}
+        if len(kept) != len(messages):
+            removed += len(messages) - len(kept)
+            data = json.dumps(kept, indent=2, ensure_ascii=False) + '\n'
+            atomic_write(paths[locale], data.encode('utf-8'))
+    return removed
+
+
+def default_cache_path(root):
+    return os.path.join(root, DEFAULT_CACHE_DIR, 'source-index.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='エラーコードとi18nキーの使用箇所を索引して過不足を報告する')
+    parser.add_argument('--project-root', default=DEFAULT_PROJECT_ROOT,
+                        help='package.json のあるディレクトリ (default: このスクリプトの2階層上)')
+    parser.add_argument('--default-locale', default=DEFAULT_LOCALE, help=f'基準ロケール (default: {DEFAULT_LOCALE})')
+    parser.add_argument('--no-cache', action='store_true', help='キャッシュを使わず全ファイルを読み直す')
+    parser.add_argument('--json', metavar='PATH', help='レポートをJSONで保存する')
+    parser.add_argument('--verbose', '-v', action='store_true', help='動的キー候補と未翻訳キーの一覧も表示')
+    parser.add_argument('--prune', action='store_true',
+                        help='未使用キー（文字列リテラルとしても現れないもの）を全ロケールから削除する')
+    parser.add_argument('--require-locales', default='en,ja',
+                        help='参照キーの不足をエラー（終了コード1）とするロケール (default: en,ja)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root)
+    index = SourceIndex.build(root, cache_path=None if args.no_cache else default_cache_path(root))
+    index.save()
+
+    locales, paths = load_locales(root)
+    report = build_report(index, locales, args.default_locale)
+    required = [locale.strip() for locale in args.require_locales.split(',') if locale.strip()]
+    print_report(report, required, verbose=args.verbose)
+    print(f"\n({index.scanned} file(s) scanned, {index.reused} reused from cache)")
+
+    if args.json:
+        atomic_write(args.json, (json.dumps(report, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+        print(f"Report written to {args.json}")
+
+    if args.prune and report['unused']:
+        removed = prune_unused(paths, locales, report['unused'])
+        print(f"Pruned {len(report['unused'])} unused key(s) ({removed} entries across locales)")
+
+    return 1 if any(report['missing'].get(locale) for locale in required) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+ステージされた変更（git diff --cached）の1パスのレビュー
+
+git diff --cached を1回だけ起動して出力を1行ずつ読み、ハンクごとに次の検出をまとめて行う。
+- デバッグコード（console.* / debugger; / alert( / confirm(）の追加
+- 機密情報（APIキー・パスワード等の文字列リテラル）の追加
+- 不要なファイル（.DS_Store / *.log / node_modules/ 等）
+- 空白の問題（git diff --check と同じ: 行末の空白、インデントのタブ前の空白、コンフリクトマーカー）
+- 大量の同一パターン変更（同じ内容のハンクが多数のファイルにある＝一括置換ミスの可能性）
+- ファイル権限の変更
+ハンクの内容はハッシュを逐次更新するだけで保持しないため、メモリ使用量は差分全体の大きさに依存しない。
+
+使い方（pre-commit-review.sh から実行される）:
+    python3 scripts/coding-helpers/staged_diff_review.py
+    python3 scripts/coding-helpers/staged_diff_review.py --repeat-threshold 3 --strict
+"""
+
+import argparse
+import hashlib
+import re
+import subprocess
+import sys
+
+DEBUG_CODE = re.compile(r'(console\.(log|debug|info|warn|error)|debugger;|alert\(|confirm\()')
+SENSITIVE_INFO = re.compile(
+    r'''(api[_-]?key|password|secret|token|credential)\s*[=:]\s*["'][^"'\n]{8,}''', re.IGNORECASE)
+UNWANTED_FILE = re.compile(r'\.(DS_Store|log|tmp|cache)$|node_modules/|dist/|coverage/')
+CONFLICT_MARKER = re.compile(r'^(<{7} |>{7} |={7}$)')
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+MANY_FILES = 10
+
+
+class Hunk:
+    """ハンクの内容のフィンガープリント（削除行と追加行を前後の空白を除いて逐次ハッシュする）"""
+
+    def __init__(self, path, line):
+        self.path = path
+        self.line = line
+        self.digest = hashlib.sha1()
+        self.changes = 0
+        self.sample = None
+
+    def add(self, marker, text):
+        self.digest.update(marker.encode('utf-8'))
+        self.digest.update(text.strip().encode('utf-8', errors='replace'))
+        self.digest.update(b'\n')
+        self.changes += 1
+        if self.sample is None and text.strip():
+            self.sample = f"{marker}{text.strip()}"
+
+
+class Review:
+    """検出結果（セクションごとの一覧）"""
+
+    def __init__(self):
+        self.files = []
+        self.debug = []
+        self.sensitive = []
+        self.unwanted = []
+        self.whitespace = []
+        self.permissions = []
+        # フィンガープリント -> [ハンク数, 最初の例, {ファイル}]
+        self.fingerprints = {}
+
+    def finish_hunk(self, hunk):
+        if hunk is None or hunk.changes == 0:
+            return
+        key = hunk.digest.hexdigest()
+        entry = self.fingerprints.get(key)
+        if entry is None:
+            self.fingerprints[key] = [1, hunk.sample, {hunk.path}]
+        else:
+            entry[0] += 1
+            entry[2].add(hunk.path)
+
+    def repeated(self, threshold):
+        """threshold個以上のファイルに現れた同一ハンクを、ファイル数の多い順に返す"""
+        found = [(len(files), count, sample, sorted(files))
+                 for count, sample, files in self.fingerprints.values() if len(files) >= threshold]
+        return sorted(found, key=lambda item: (-item[0], item[2] or ''))
+
+
+_QUOTED_ESCAPES = {'a': 7, 'b': 8, 't': 9, 'n': 10, 'v': 11, 'f': 12, 'r': 13, '"': 34, '\\': 92}
+
+
+def _unquote(text):
+    """gitがダブルクォートで囲んだパス（"a/my\\tfile.ts"、非ASCIIは \\ooo の8進数）を元に戻す"""
+    if len(text) < 2 or not (text.startswith('"') and text.endswith('"')):
+        return text
+    out = bytearray()
+    i = 1
+    while i < len(text) - 1:
+        c = text[i]
+        if c == '\\' and i + 1 < len(text) - 1:
+            escape = text[i + 1]
+            if escape in '01234567':
+                out.append(int(text[i + 1:i + 4], 8))
+                i += 4
+                continue
+            out.append(_QUOTED_ESCAPES.get(escape, ord(escape)))
+            i += 2
+            continue
+        out.extend(c.encode('utf-8'))
+        i += 1
+    return out.decode('utf-8', errors='replace')
+
+
+def _file_path(text, prefix):
+    """'+++ b/X' や 'rename to X' のパス部分（空白を含むパスの後ろのタブ・クォート・接頭辞を除く）"""
+    path = _unquote(text.rstrip('\t'))
+    return path[len(prefix):] if prefix and path.startswith(prefix) else path
+
+
+def _header_path(rest):
+    """'diff --git a/X b/X' の X（リネーム以外）"""
+    if rest.startswith('"'):
+        # "a/my file.ts" "b/my file.ts" のようにクォートされたパス
+        quoted = re.findall(r'"(?:\\.|[^"\\])*"|\S+', rest)
+        return _file_path(quoted[-1], 'b/') if quoted else rest
+    if rest.startswith('a/'):
+        half = (len(rest) - 1) // 2
+        old, new = rest[:half], rest[half + 1:]
+        if new.startswith('b/') and old[2:] == new[2:]:
+            return new[2:]
+    return rest.rsplit(' b/', 1)[-1]
+
+
+def check_added_line(review, path, line, text):
+    if DEBUG_CODE.search(text):
+        review.debug.append(f"{path}:{line}: {text.strip()}")
+    if SENSITIVE_INFO.search(text):
+        review.sensitive.append(f"{path}:{line}: {text.strip()}")
+    if text != text.rstrip(' \t\r'):
+        review.whitespace.append(f"{path}:{line}: trailing whitespace.\n+{text}")
+    indent = text[:len(text) - len(text.lstrip(' \t'))]
+    if ' \t' in indent:
+        review.whitespace.append(f"{path}:{line}: space before tab in indent.\n+{text}")
+    if CONFLICT_MARKER.match(text):
+        review.whitespace.append(f"{path}:{line}: leftover conflict marker\n+{text}")
+
+
+def scan(lines):
+    """git diff の出力（行のイテレータ）を1パスで処理して Review を返す"""
+    review = Review()
+    path = None
+    old_mode = None
+    hunk = None
+    new_line = 0
+    in_header = False
+
+    for raw in lines:
+        line = raw.rstrip('\n')
+        if line.startswith('diff --git '):
+            review.finish_hunk(hunk)
+            hunk = None
+            path = _header_path(line[len('diff --git '):])
+            review.files.append(path)
+            old_mode = None
+            in_header = True
+            continue
+        if in_header:
+            if line.startswith('@@'):
+                in_header = False
+            else:
+                if line.startswith('+++ ') and line[4:].rstrip('\t') != '/dev/null':
+                    path = _file_path(line[4:], 'b/')
+                    review.files[-1] = path
+                elif line.startswith('rename to '):
+                    path = _file_path(line[len('rename to '):], None)
+                    review.files[-1] = path
+                elif line.startswith('old mode '):
+                    old_mode = line[len('old mode '):]
+                elif line.startswith('new mode ') and old_mode is not None:
+                    review.permissions.append(f"{path}: {old_mode} → {line[len('new mode '):]}")
+                elif line.startswith('new file mode ') and line.endswith('755'):
+                    review.permissions.append(f"{path}: new file with mode {line[len('new file mode '):]}")
+                continue
+
+        if line.startswith('@@'):
+            review.finish_hunk(hunk)
+            match = HUNK_HEADER.match(line)
+            new_line = int(match.group(1)) if match else 0
+            hunk = Hunk(path, new_line)
+        elif line.startswith('+'):
+            check_added_line(review, path, new_line, line[1:])
+            hunk.add('+', line[1:])
+            new_line += 1
+        elif line.startswith('-'):
+            hunk.add('-', line[1:])
+        elif line.startswith(' '):
+            new_line += 1
+    review.finish_hunk(hunk)
+
+    review.unwanted = [p for p in review.files if UNWANTED_FILE.search(p)]
+    return review
+
+
+def staged_diff():
+    """git diff --cached を起動し、(プロセス, 出力の行イテレータ) を返す"""
+    process = subprocess.Popen(
+        ['git', '-c', 'core.quotepath=false', 'diff', '--cached', '--no-color', '--no-ext-diff', '-M'],
+        stdout=subprocess.PIPE, encoding='utf-8', errors='replace')
+    return process, process.stdout
+
+
+def _section(title, items, found, clean, limit, out):
+    print(f"\n## {title}", file=out)
+    if not items:
+        print(f"✅ {clean}", file=out)
+        return
+    print(found, file=out)
+    for item in items[:limit] if limit else items:
+        print(item, file=out)
+    if limit and len(items) > limit:
+        print(f"... and {len(items) - limit} more", file=out)
+
+
+def print_review(review, repeat_threshold, limit=0, out=sys.stdout):
+    """pre-commit-review.sh と同じセクション構成で結果を表示する"""
+    print("## 📈 変更ファイル数確認", file=out)
+    print(f"ステージされたファイル数: {len(review.files)}", file=out)
+    if len(review.files) >= MANY_FILES:
+        print(f"⚠️ {MANY_FILES}ファイル以上の変更が検出されました。詳細レビューを実行します。", file=out)
+    else:
+        print("✅ 変更ファイル数は適切です。", file=out)
+
+    _section("🔍 デバッグコードの検出", review.debug,
+             "⚠️ デバッグコードが検出されました:", "デバッグコードは検出されませんでした", limit, out)
+    _section("🔒 機密情報の検出", review.sensitive,
+             "🚨 機密情報の可能性があるコードが検出されました:", "機密情報は検出されませんでした", limit, out)
+    _section("🗑️ 不要ファイルの検出", review.unwanted,
+             "⚠️ 不要ファイルが検出されました:", "不要ファイルは検出されませんでした", limit, out)
+    _section("📝 空白変更の検出", review.whitespace,
+             "⚠️ 空白変更の問題が検出されました:", "空白変更の問題は検出されませんでした", limit, out)
+
+    repeated = [f"{files}ファイル / {count}ハンク: {sample}\n  " + ', '.join(paths[:5])
+                + (f", ... (+{len(paths) - 5})" if len(paths) > 5 else '')
+                for files, count, sample, paths in review.repeated(repeat_threshold)]
+    _section("🔁 大量の同一パターン変更の検出", repeated,
+             f"⚠️ {repeat_threshold}ファイル以上で同一の変更が検出されました（一括置換ミスの可能性）:",
+             "大量の同一パターン変更は検出されませんでした", limit, out)
+    _section("🔐 ファイル権限変更の検出", review.permissions,
+             "⚠️ ファイル権限の変更が検出されました:", "ファイル権限の変更は検出されませんでした", limit, out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='ステージされた変更を1パスでレビューする')
+    parser.add_argument('--repeat-threshold', type=int, default=5,
+                        help='同一パターン変更とみなすファイル数 (default: 5)')
+    parser.add_argument('--limit', type=int, default=100,
+                        help='セクションごとに表示する最大件数（0で無制限, default: 100）')
+    parser.add_argument('--strict', action='store_true',
+                        help='デバッグコード・機密情報・不要ファイル・空白の問題があれば終了コード1で終了')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    try:
+        process, lines = staged_diff()
+    except OSError as e:
+        print(f"Error: git diff --cached failed: {e}", file=sys.stderr)
+        return 1
+    with process:
+        review = scan(lines)
+    if process.returncode != 0:
+        print(f"Error: git diff --cached exited with {process.returncode}", file=sys.stderr)
+        return 1
+
+    print_review(review, args.repeat_threshold, args.limit)
+    if args.strict and (review.debug or review.sensitive or review.unwanted or review.whitespace):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+TypeScriptソースの構造チェック（途中で切れたファイル・括弧の不整合・未終端の文字列）
+
+ts_scanner で文字列・テンプレートリテラル・コメント・正規表現リテラルを読み飛ばしながら括弧の対応を1パスで調べ、
+壊れたファイルを file:line:col で報告する（書き換えはしない）。プロセスプールで並列に走査するので、
+src 配下の全 .ts でも tsc --noEmit よりはるかに速く、quality-gate.sh で型チェックやjestの前に実行する。
+
+- truncated: ファイルの終わりで括弧（やテンプレートリテラル・ブロックコメント）が閉じていない
+- unbalanced: 対応しない閉じ括弧、途中で閉じられていない開き括弧
+- unterminated-string / unterminated-template / unterminated-comment: 閉じていない文字列・テンプレート・コメント
+- empty: 空のファイル
+
+使い方（どのディレクトリから実行してもプロジェクトルートを探して使う）:
+    python3 scripts/coding-helpers/structure_check.py                      # src/**/*.ts
+    git diff --name-only main | python3 scripts/coding-helpers/structure_check.py --stdin
+    python3 scripts/coding-helpers/structure_check.py --json structure.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from file_writer import atomic_write
+from targets import add_target_arguments, find_targets
+from ts_scanner import line_col, scan
+
+DEFAULT_INCLUDE = ('src/**/*.ts',)
+# ts_scanner のエラーメッセージの先頭 -> 種類
+_KINDS = {
+    'unterminated string': 'unterminated-string',
+    'unterminated template': 'unterminated-template',
+    'unterminated block comment': 'unterminated-comment',
+}
+
+
+def check_content(content):
+    """contentの構造の問題を [(行, 列, 種類, メッセージ)]（位置順）で返す"""
+    if not content.strip():
+        return [(1, 1, 'empty', 'file is empty')]
+    result = scan(content)
+    at_end = {index for _, index in result.open_at_end}
+    problems = []
+    for index, message in result.errors:
+        if index in at_end:
+            continue
+        kind = next((kind for prefix, kind in _KINDS.items() if message.startswith(prefix)), 'unbalanced')
+        problems.append((*line_col(content, index), kind, message))
+    if result.open_at_end:
+        outer_char, outer = result.open_at_end[0]
+        inner_char, inner = result.open_at_end[-1]
+        detail = f"outermost '{outer_char}' at {':'.join(map(str, line_col(content, outer)))}"
+        if len(result.open_at_end) > 1:
+            detail += f", innermost '{inner_char}' at {':'.join(map(str, line_col(content, inner)))}"
+        end = len(content.rstrip())
+        problems.append((*line_col(content, end), 'truncated',
+                         f"file ends with {len(result.open_at_end)} unclosed bracket(s) ({detail})"))
+    return sorted(problems)
+
+
+def check_file(path):
+    """(path, 問題の一覧, 読み込みエラー) を返す（プロセスプールのワーカーでも実行される）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return path, check_content(f.read()), None
+    except (OSError, UnicodeDecodeError) as e:
+        return path, [], str(e)
+
+
+def check_files(paths, jobs=1):
+    """pathsを（jobs > 1ならプロセスプールで）チェックし、入力順で check_file() の結果を返す"""
+    if jobs <= 1 or len(paths) < 2:
+        return [check_file(path) for path in paths]
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, -(-len(paths) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(check_file, paths, chunksize=chunksize))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='TypeScriptソースの途中で切れたファイル・括弧の不整合・未終端の文字列を報告する')
+    add_target_arguments(parser, DEFAULT_INCLUDE)
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='並列に処理するプロセス数 (default: 0 = CPUコア数)')
+    parser.add_argument('--json', metavar='PATH', help='問題の一覧をJSONで保存する')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    started = time.perf_counter()
+    paths = find_targets(args)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    results = check_files(paths, jobs)
+
+    report = []
+    for path, problems, error in results:
+        if error:
+            print(f"{path}: error: {error}", file=sys.stderr)
+            report.append({'file': path, 'line': None, 'column': None, 'kind': 'unreadable', 'message': error})
+        for line, column, kind, message in problems:
+            print(f"{path}:{line}:{column}: {kind}: {message}")
+            report.append({'file': path, 'line': line, 'column': column, 'kind': kind, 'message': message})
+
+    broken = len({problem['file'] for problem in report})
+    print(f"\nChecked {len(paths)} file(s) in {time.perf_counter() - started:.2f} s: "
+          f"{len(report)} problem(s) in {broken} file(s)")
+    if args.json:
+        atomic_write(args.json, (json.dumps(report, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+        print(f"Report written to {args.json}")
+    return 1 if report else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
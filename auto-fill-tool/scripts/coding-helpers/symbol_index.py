@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+プロジェクトのシンボル索引（SQLite）
+
+src 配下の *.ts を ts_scanner / import_block で解析し、次を .codemod-cache/symbols.sqlite に保存する。
+- files: パス・内容のハッシュ・テストファイルかどうか
+- imports: import文（モジュール、解決したファイル、importされる名前とローカル名、type指定）
+- symbols: トップレベルの宣言（class / interface / type / enum / function / const 等）とexportされているか
+- parameters: クラスの `static create(...)` と `constructor(...)` の引数（位置・名前・型）
+- calls: `<Name>.create(...)` と `new <Name>(...)` の呼び出し箇所と引数の数
+- refs: new StandardError('<code>') のエラーコードと i18n メッセージキー（source_index と同じ抽出）
+- constants: `export const TOKENS = { KEY: 'value', ... }` のような大文字の定数オブジェクトの要素（ServiceTokens 等）
+更新はファイルごとのインクリメンタル: size/mtime が同じファイルは開かず、変わっていても内容のハッシュが同じなら解析しない。
+抽出処理（このスクリプト）が変わると索引を作り直す。
+
+    index = SymbolIndex.open()          # プロジェクトルートを探して開き、変更されたファイルだけ更新する
+    for row in index.missing_argument('IdGenerator', tests_only=True):
+        ...
+
+使い方（どのディレクトリから実行してもプロジェクトルートを探して使う）:
+    python3 scripts/coding-helpers/symbol_index.py                               # 更新して件数を表示
+    python3 scripts/coding-helpers/symbol_index.py --query missing-idgenerator   # IdGeneratorを渡していない create() 呼び出し
+    python3 scripts/coding-helpers/symbol_index.py --query missing-idgenerator --files \\
+        | python3 scripts/coding-helpers/codemod.py --stdin --rules entity-create-calls
+    python3 scripts/coding-helpers/symbol_index.py --query importers --name Result
+    python3 scripts/coding-helpers/symbol_index.py --sql "SELECT owner, name, type FROM parameters WHERE method = 'constructor'"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+
+from affected_tests import is_test_file
+from codemod_manifest import DEFAULT_CACHE_DIR
+from file_writer import content_hash
+from import_block import ImportBlock
+from import_graph import Resolver, load_aliases
+from source_index import extract as extract_references
+from targets import find_project_root, walk_targets
+from ts_scanner import find_calls, line_col, scan, split_arguments
+
+INDEX_FORMAT = 1
+SOURCE_GLOBS = ('src/**/*.ts',)
+
+_SCHEMA = '''
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, hash TEXT NOT NULL,
+                    size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, is_test INTEGER NOT NULL);
+CREATE TABLE imports (file_id INTEGER NOT NULL, module TEXT NOT NULL, resolved TEXT, kind TEXT NOT NULL,
+                      imported TEXT, local TEXT, type_only INTEGER NOT NULL, line INTEGER NOT NULL);
+CREATE TABLE symbols (file_id INTEGER NOT NULL, name TEXT NOT NULL, kind TEXT NOT NULL,
+                      exported INTEGER NOT NULL, line INTEGER NOT NULL);
+CREATE TABLE parameters (file_id INTEGER NOT NULL, owner TEXT NOT NULL, method TEXT NOT NULL,
+                         position INTEGER NOT NULL, name TEXT NOT NULL, type TEXT, optional INTEGER NOT NULL,
+                         line INTEGER NOT NULL);
+CREATE TABLE calls (file_id INTEGER NOT NULL, kind TEXT NOT NULL, receiver TEXT NOT NULL, method TEXT,
+                    arg_count INTEGER NOT NULL, line INTEGER NOT NULL, col INTEGER NOT NULL);
+CREATE TABLE refs (file_id INTEGER NOT NULL, kind TEXT NOT NULL, value TEXT NOT NULL, line INTEGER NOT NULL);
+CREATE TABLE constants (file_id INTEGER NOT NULL, object TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+                        line INTEGER NOT NULL);
+CREATE INDEX imports_local ON imports (local);
+CREATE INDEX imports_resolved ON imports (resolved);
+CREATE INDEX imports_file ON imports (file_id);
+CREATE INDEX symbols_name ON symbols (name);
+CREATE INDEX symbols_file ON symbols (file_id);
+CREATE INDEX parameters_owner ON parameters (owner, method);
+CREATE INDEX parameters_file ON parameters (file_id);
+CREATE INDEX calls_receiver ON calls (receiver, method);
+CREATE INDEX calls_file ON calls (file_id);
+CREATE INDEX refs_value ON refs (kind, value);
+CREATE INDEX refs_file ON refs (file_id);
+CREATE INDEX constants_object ON constants (object, key);
+CREATE INDEX constants_file ON constants (file_id);
+'''
+_TABLES = ('imports', 'symbols', 'parameters', 'calls', 'refs', 'constants')
+
+_DECLARATION = re.compile(
+    r'^(?P<export>export[ \t]+(?:default[ \t]+)?)?(?:declare[ \t]+)?(?:abstract[ \t]+)?(?:async[ \t]+)?'
+    r'(?P<kind>class|interface|type|enum|function\*?|const|let|var)[ \t]+(?P<name>[A-Za-z_$][\w$]*)', re.MULTILINE)
+_EXPORT_LIST = re.compile(r'^export[ \t]*(?:type[ \t]*)?\{(?P<names>[^}]*)\}(?![ \t]*from)', re.MULTILINE)
+_CLASS = re.compile(r'(?<![\w$.])class[ \t]+([A-Za-z_$][\w$]*)')
+_STATIC_CALL = re.compile(r'(?<![\w$.])([A-Z][\w$]*)\s*\.\s*(create)\s*\(')
+_NEW = re.compile(r'(?<![\w$.])new\s+([A-Z][\w$]*)\s*(?:<[^<>()]*>)?\s*\(')
+_PARAMETER = re.compile(
+    r'^(?:(?:public|private|protected|readonly|override)\s+)*(?P<name>[A-Za-z_$][\w$]*)\s*(?P<optional>\?)?'
+    r'\s*(?::\s*(?P<type>.*?))?\s*(?P<default>=.*)?$', re.DOTALL)
+_CONSTANT_OBJECT = re.compile(r'^export[ \t]+const[ \t]+([A-Z][A-Z0-9_]*)[ \t]*(?::[^=\n]+)?=[ \t]*\{', re.MULTILINE)
+_CONSTANT_ENTRY = re.compile(r'''^[ \t]*([A-Za-z_$][\w$]*)[ \t]*:[ \t]*(['"])((?:\\.|(?!\2).)*)\2''', re.MULTILINE)
+
+
+def _extractor_version(root):
+    """索引の行を作る処理（このファイルと使っているモジュール）と tsconfig.json のエイリアスのハッシュ"""
+    digest = hashlib.sha256()
+    dependencies = (scan, ImportBlock, extract_references, Resolver, is_test_file)
+    for path in [__file__] + sorted({sys.modules[dependency.__module__].__file__ for dependency in dependencies}):
+        with open(os.path.abspath(path), 'rb') as f:
+            digest.update(f.read())
+    digest.update(json.dumps(load_aliases(root), sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def default_index_path(root):
+    return os.path.join(root, DEFAULT_CACHE_DIR, 'symbols.sqlite')
+
+
+def _line(content, index):
+    return content.count('\n', 0, index) + 1
+
+
+def extract(content):
+    """1ファイル分の行を {テーブル名: [行のタプル（file_id を除く）]} で返す"""
+    rows = {table: [] for table in _TABLES}
+    result = scan(content)
+
+    for decl in ImportBlock(content).decls:
+        line = _line(content, decl.start)
+        if decl.side_effect or decl.opaque:
+            rows['imports'].append((decl.module, 'side-effect' if decl.side_effect else 'opaque',
+                                    None, None, int(decl.type_only), line))
+            continue
+        if decl.default:
+            rows['imports'].append((decl.module, 'default', 'default', decl.default, int(decl.type_only), line))
+        if decl.namespace:
+            rows['imports'].append((decl.module, 'namespace', '*', decl.namespace, int(decl.type_only), line))
+        for imported, local, is_type in decl.names:
+            rows['imports'].append((decl.module, 'named', imported, local, int(decl.type_only or is_type), line))
+
+    for match in _DECLARATION.finditer(content):
+        rows['symbols'].append((match.group('name'), match.group('kind').rstrip('*'),
+                                int(bool(match.group('export'))), _line(content, match.start())))
+    for match in _EXPORT_LIST.finditer(content):
+        for part in match.group('names').split(','):
+            names = part.replace('type ', '').split(' as ')
+            if names[0].strip():
+                rows['symbols'].append((names[-1].strip(), 'export', 1, _line(content, match.start())))
+
+    classes = [(match.start(), match.group(1)) for match in _CLASS.finditer(content)]
+    for method, callee in (('create', 'static create'), ('constructor', 'constructor')):
+        for open_index, _ in find_calls(content, callee, result):
+            owner = next((name for start, name in reversed(classes) if start < open_index), None)
+            if owner is None:
+                continue
+            for position, (start, end) in enumerate(split_arguments(content, open_index, result)):
+                match = _PARAMETER.match(' '.join(content[start:end].split()))
+                if match is None:
+                    continue
+                rows['parameters'].append((owner, method, position, match.group('name'),
+                                           match.group('type'), int(bool(match.group('optional') or match.group('default'))),
+                                           _line(content, start)))
+
+    for pattern, kind in ((_STATIC_CALL, 'static'), (_NEW, 'new')):
+        for match in pattern.finditer(content):
+            open_index = match.end() - 1
+            if open_index not in result.pairs:
+                continue
+            line, col = line_col(content, match.start())
+            method = match.group(2) if kind == 'static' else None
+            count = len(split_arguments(content, open_index, result))
+            rows['calls'].append((kind, match.group(1), method, count, line, col))
+
+    references = extract_references(content)
+    rows['refs'].extend(('error-code', code, line) for code, line in references['errors'])
+    rows['refs'].extend(('i18n-key', key, line) for key, line, _ in references['keys'])
+
+    for match in _CONSTANT_OBJECT.finditer(content):
+        close = result.pairs.get(match.end() - 1)
+        if close is None:
+            continue
+        body_start = match.end()
+        for entry in _CONSTANT_ENTRY.finditer(content, body_start, close):
+            rows['constants'].append((match.group(1), entry.group(1), entry.group(3),
+                                      _line(content, entry.start(1))))
+    return rows
+
+
+class SymbolIndex:
+    """SQLiteのシンボル索引（パスはすべてプロジェクトルートからの相対パス）"""
+
+    def __init__(self, root, path=None):
+        self.root = root
+        self.path = path or default_index_path(root)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.scanned = 0
+        self.reused = 0
+        self.removed = 0
+        version = f'{INDEX_FORMAT}:{_extractor_version(root)}'
+        try:
+            current = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError:
+            current = None
+        if current is None or current[0] != version:
+            self._create(version)
+
+    def _create(self, version):
+        self.db.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        with self.db:
+            self.db.executescript(_SCHEMA)
+            self.db.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (version,))
+
+    @classmethod
+    def open(cls, root=None, path=None, update=True):
+        """rootの索引を開く（updateがTrueなら変更されたファイルだけ読み直す）"""
+        index = cls(root or find_project_root(), path)
+        if update:
+            index.update()
+        return index
+
+    def close(self):
+        self.db.close()
+
+    def update(self, include=SOURCE_GLOBS):
+        """includeに一致するファイルを走査し、変更・追加・削除されたファイルの行を更新する"""
+        known = {row['path']: row for row in self.db.execute('SELECT id, path, hash, size, mtime_ns FROM files')}
+        present = walk_targets(self.root, include)
+        changed = []
+        with self.db:
+            for rel in present:
+                path = os.path.join(self.root, rel)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                row = known.get(rel)
+                if row is not None and row['size'] == st.st_size and row['mtime_ns'] == st.st_mtime_ns:
+                    self.reused += 1
+                    continue
+                with open(path, 'rb') as f:
+                    data = f.read()
+                digest = content_hash(data)
+                if row is not None and row['hash'] == digest:
+                    self.db.execute('UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?',
+                                    (st.st_size, st.st_mtime_ns, row['id']))
+                    self.reused += 1
+                    continue
+                file_id = self._replace(rel, row, digest, st, data.decode('utf-8', errors='replace'))
+                changed.append((file_id, rel))
+                self.scanned += 1
+            removed = set(known) - set(present)
+            for rel in removed:
+                self._delete(known[rel]['id'])
+                self.db.execute('DELETE FROM files WHERE id = ?', (known[rel]['id'],))
+            self.removed = len(removed)
+            added = any(rel not in known for _, rel in changed)
+            # ファイルが増減すると他のファイルのimportの解決先も変わり得る
+            self._resolve(None if added or removed else [file_id for file_id, _ in changed], present)
+        return self
+
+    def _delete(self, file_id):
+        for table in _TABLES:
+            self.db.execute(f'DELETE FROM {table} WHERE file_id = ?', (file_id,))
+
+    def _replace(self, rel, row, digest, st, content):
+        if row is None:
+            file_id = self.db.execute(
+                'INSERT INTO files (path, hash, size, mtime_ns, is_test) VALUES (?, ?, ?, ?, ?)',
+                (rel, digest, st.st_size, st.st_mtime_ns, int(is_test_file(rel)))).lastrowid
+        else:
+            file_id = row['id']
+            self._delete(file_id)
+            self.db.execute('UPDATE files SET hash = ?, size = ?, mtime_ns = ? WHERE id = ?',
+                            (digest, st.st_size, st.st_mtime_ns, file_id))
+        rows = extract(content)
+        self.db.executemany('INSERT INTO imports (file_id, module, kind, imported, local, type_only, line) '
+                            'VALUES (?, ?, ?, ?, ?, ?, ?)', [(file_id, *r) for r in rows['imports']])
+        self.db.executemany('INSERT INTO symbols VALUES (?, ?, ?, ?, ?)', [(file_id, *r) for r in rows['symbols']])
+        self.db.executemany('INSERT INTO parameters VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                            [(file_id, *r) for r in rows['parameters']])
+        self.db.executemany('INSERT INTO calls VALUES (?, ?, ?, ?, ?, ?, ?)', [(file_id, *r) for r in rows['calls']])
+        self.db.executemany('INSERT INTO refs VALUES (?, ?, ?, ?)', [(file_id, *r) for r in rows['refs']])
+        self.db.executemany('INSERT INTO constants VALUES (?, ?, ?, ?, ?)',
+                            [(file_id, *r) for r in rows['constants']])
+        return file_id
+
+    def _resolve(self, file_ids, present):
+        """imports.resolved を求める（file_idsがNoneなら全ファイル）"""
+        if file_ids == []:
+            return
+        resolver = Resolver(set(present), load_aliases(self.root), self.root)
+        query = ('SELECT imports.rowid, imports.module, files.path FROM imports JOIN files ON files.id = imports.file_id')
+        if file_ids is None:
+            rows = self.db.execute(query).fetchall()
+        else:
+            rows = []
+            for file_id in file_ids:
+                rows.extend(self.db.execute(query + ' WHERE files.id = ?', (file_id,)).fetchall())
+        updates = []
+        for rowid, module, importer in rows:
+            resolved = resolver.resolve(importer, module)
+            updates.append((resolved or None, rowid))
+        self.db.executemany('UPDATE imports SET resolved = ? WHERE rowid = ?', updates)
+
+    # --- 問い合わせ ---
+
+    def query(self, sql, params=()):
+        return self.db.execute(sql, params).fetchall()
+
+    def select(self, sql, params=()):
+        """外部から渡されたSQLを読み取り専用の接続で実行する（索引を書き換える文は sqlite3.Error になる）"""
+        db = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        db.row_factory = sqlite3.Row
+        try:
+            return db.execute(sql, params).fetchall()
+        finally:
+            db.close()
+
+    def counts(self):
+        return {table: self.db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('files',) + _TABLES}
+
+    def importers(self, name, module=None):
+        """nameをローカル名としてimportしているファイル（moduleで絞り込める）"""
+        sql = ('SELECT files.path, imports.module, imports.line FROM imports JOIN files ON files.id = imports.file_id '
+               'WHERE imports.local = ?')
+        params = [name]
+        if module is not None:
+            sql += ' AND imports.module = ?'
+            params.append(module)
+        return self.query(sql + ' ORDER BY files.path', params)
+
+    def dependents(self, rel):
+        """relをimportしているファイル"""
+        return self.query('SELECT DISTINCT files.path FROM imports JOIN files ON files.id = imports.file_id '
+                          'WHERE imports.resolved = ? ORDER BY files.path', (rel,))
+
+    def signature(self, owner, method='create'):
+        """クラスの `static create(...)`（または constructor）の引数"""
+        return self.query('SELECT parameters.position, parameters.name, parameters.type, parameters.optional, '
+                          'files.path FROM parameters JOIN files ON files.id = parameters.file_id '
+                          'WHERE parameters.owner = ? AND parameters.method = ? AND files.is_test = 0 '
+                          'ORDER BY parameters.position', (owner, method))
+
+    def missing_argument(self, type_name, method='create', tests_only=False):
+        """type_name 型の引数の位置まで引数が届いていない `<Owner>.create(...)` / `new <Owner>(...)` の呼び出し"""
+        kind, call_method = ('static', method) if method != 'constructor' else ('new', None)
+        sql = ('SELECT files.path, calls.line, calls.col, calls.receiver, calls.arg_count, parameters.position '
+               'FROM calls JOIN files ON files.id = calls.file_id '
+               'JOIN parameters ON parameters.owner = calls.receiver AND parameters.method = ? '
+               'JOIN files AS declared ON declared.id = parameters.file_id AND declared.is_test = 0 '
+               'WHERE calls.kind = ? AND calls.method IS ? AND calls.arg_count <= parameters.position '
+               'AND parameters.type = ?')
+        if tests_only:
+            sql += ' AND files.is_test = 1'
+        return self.query(sql + ' ORDER BY files.path, calls.line', (method, kind, call_method, type_name))
+
+    def references(self, kind, value):
+        """エラーコード（kind='error-code'）または i18n キー（kind='i18n-key'）の参照箇所"""
+        return self.query('SELECT files.path, refs.line FROM refs JOIN files ON files.id = refs.file_id '
+                          'WHERE refs.kind = ? AND refs.value = ? ORDER BY files.path, refs.line', (kind, value))
+
+    def constants(self, object_name):
+        """`export const <object_name> = {...}` の要素（例: TOKENS）"""
+        return self.query('SELECT constants.key, constants.value, files.path, constants.line FROM constants '
+                          'JOIN files ON files.id = constants.file_id WHERE constants.object = ? '
+                          'ORDER BY constants.line', (object_name,))
+
+
+# --query の定義済みの問い合わせ（name は --name の値）
+QUERIES = {
+    'missing-idgenerator': lambda index, name: index.missing_argument('IdGenerator', tests_only=True),
+    'importers': lambda index, name: index.importers(name),
+    'dependents': lambda index, name: index.dependents(name),
+    'signature': lambda index, name: index.signature(name),
+    'constructor': lambda index, name: index.signature(name, 'constructor'),
+    'error-code': lambda index, name: index.references('error-code', name),
+    'i18n-key': lambda index, name: index.references('i18n-key', name),
+    'constants': lambda index, name: index.constants(name or 'TOKENS'),
+}
+_NEEDS_NAME = {'importers', 'dependents', 'signature', 'constructor', 'error-code', 'i18n-key'}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='src 配下のTypeScriptのシンボル索引（SQLite）を更新して問い合わせる')
+    parser.add_argument('--project-root',
+                        help='プロジェクトルート (default: カレントディレクトリから package.json / tsconfig.json を探す)')
+    parser.add_argument('--index', metavar='PATH', help='索引のパス (default: <project-root>/.codemod-cache/symbols.sqlite)')
+    parser.add_argument('--query', choices=sorted(QUERIES), help='定義済みの問い合わせ')
+    parser.add_argument('--name', help='--query の対象（クラス名・ローカル名・ファイル・エラーコード・キー等）')
+    parser.add_argument('--sql', help='任意のSELECT文を実行する（読み取り専用の接続で実行するので索引は書き換えない）')
+    parser.add_argument('--json', action='store_true', help='結果をJSONで出力する')
+    parser.add_argument('--files', action='store_true', help='結果のファイルパスだけを重複なしで1行ずつ出力する')
+    parser.add_argument('--rebuild', action='store_true', help='索引を作り直す')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root) if args.project_root else find_project_root()
+    if args.query in _NEEDS_NAME and not args.name:
+        print(f"Error: --query {args.query} requires --name", file=sys.stderr)
+        return 1
+    if args.rebuild:
+        path = args.index or default_index_path(root)
+        if os.path.exists(path):
+            os.remove(path)
+
+    index = SymbolIndex.open(root, args.index)
+    try:
+        if args.sql:
+            try:
+                rows = index.select(args.sql)
+            except sqlite3.Error as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+        elif args.query:
+            rows = QUERIES[args.query](index, args.name)
+        else:
+            print(f"Indexed {index.scanned} file(s), {index.reused} unchanged, {index.removed} removed "
+                  f"({os.path.relpath(index.path)})", file=sys.stderr)
+            for table, count in index.counts().items():
+                print(f"{table:<11} {count:>7}")
+            return 0
+
+        if args.files:
+            seen = set()
+            for row in rows:
+                if 'path' in row.keys() and row['path'] not in seen:
+                    seen.add(row['path'])
+                    print(row['path'])
+        elif args.json:
+            json.dump([dict(row) for row in rows], sys.stdout, indent=2, ensure_ascii=False)
+            print()
+        else:
+            for row in rows:
+                print('\t'.join('' if value is None else str(value) for value in row))
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+ベンチマーク用の合成TypeScriptテストツリーを生成するスクリプト
+
+実際のテスト（src/**/__tests__/*.test.ts）に多い書き方を組み合わせて、
+<root>/<layer>/<feature>/__tests__/*.test.ts を指定した数だけ生成する。
+- import（Result / IdGenerator のimportの有無を混在）
+- mockIdGenerator の宣言（未宣言・重複宣言を混在）
+- mockResolvedValue(...) のオブジェクト・配列・文字列・数値・undefined・ラップ済み引数
+- <Entity>.create({...}) の複数行呼び出し、ネストしたオブジェクト、expect(...) 内の呼び出し、引数追加済みの呼び出し
+同じ (files, seed) からは常に同じツリーが生成されるので、コミット間でベンチマーク結果を比較できる。
+
+使い方:
+    python3 scripts/coding-helpers/synthetic_tree.py /tmp/bench-tree --files 10000 --seed 1
+"""
+
+import argparse
+import os
+import random
+import sys
+
+# 生成内容を変えたら上げる（ベンチマーク結果の比較可否の判定に使う）
+GENERATOR_VERSION = 1
+
+LAYERS = ['domain', 'application', 'infrastructure', 'presentation']
+FILES_PER_DIR = 20
+ENTITIES = [
+    'AutomationVariables', 'StorageSyncConfig', 'AutomationResult', 'SyncResult',
+    'Website', 'TabRecording', 'SyncHistory',
+]
+REPOSITORY_METHODS = ['load', 'save', 'loadByWebsiteId', 'loadByStorageKey', 'delete']
+
+_RESOLVED_VALUES = [
+    "{ id: 'item-{n}', name: 'Item {n}', enabled: true }",
+    '{}',
+    '[]',
+    "[{ id: 'a-{n}' }, { id: 'b-{n}' }]",
+    "'success'",
+    '{n}',
+    'true',
+    'undefined',
+    'null',
+    "{ 'content-type': 'application/json', status: {n} }",
+    'Result.success(undefined)',
+    'Result.success(collection)',
+    'Result.failure(error)',
+    'mockResult',
+]
+
+
+def _resolved_value(rng, n):
+    return rng.choice(_RESOLVED_VALUES).replace('{n}', str(n))
+
+
+def _mock_line(rng, n):
+    value = _resolved_value(rng, n)
+    target = rng.choice([
+        f'mockRepository.{rng.choice(REPOSITORY_METHODS)}',
+        '(browser.storage.local.get as jest.Mock)',
+        f'mockUseCase{n % 7}.execute',
+    ])
+    if value.startswith('{ id') and rng.random() < 0.5:
+        # 複数行に分かれたオブジェクト引数
+        return (f'    {target}.mockResolvedValue({{\n'
+                f"      id: 'item-{n}',\n"
+                f"      nested: {{ key: 'value-{n}', list: [1, 2, 3] }},\n"
+                f'    }});\n')
+    return f'    {target}.mockResolvedValue({value});\n'
+
+
+def _create_call(rng, n):
+    entity = rng.choice(ENTITIES)
+    shape = rng.randrange(4)
+    if shape == 0:
+        return (f'    const entity{n} = {entity}.create({{\n'
+                f"      id: 'entity-{n}',\n"
+                f"      name: 'Entity {n}',\n"
+                f'      enabled: true,\n'
+                f'    }});\n')
+    if shape == 1:
+        return (f'    const nested{n} = {entity}.create({{\n'
+                f"      storageKey: 'key-{n}',\n"
+                f'      retryPolicy: {{ maxAttempts: 3, backoff: {{ initial: 100 }} }},\n'
+                f"      tags: ['a', 'b'],\n"
+                f'    }});\n')
+    if shape == 2:
+        return f"    expect({entity}.create({{ id: 'x-{n}' }})).toBeDefined();\n"
+    return f"    const done{n} = {entity}.create({{ id: 'done-{n}' }}, mockIdGenerator);\n"
+
+
+def generate_test_file(rng, name):
+    """1ファイル分のテストコードを返す"""
+    parts = [
+        f"import {{ {name} }} from '../{name}';\n",
+        "import { Logger } from '@domain/types/logger.types';\n",
+    ]
+    if rng.random() < 0.5:
+        parts.append("import { Result } from '@domain/values/result.value';\n")
+    if rng.random() < 0.4:
+        parts.append("import { IdGenerator } from '@domain/types/id-generator.types';\n")
+    parts.append('\n')
+
+    declarations = rng.choice([0, 1, 1, 1, 2])
+    for _ in range(declarations):
+        parts.append('// Mock IdGenerator\n'
+                     'const mockIdGenerator: IdGenerator = {\n'
+                     "  generate: jest.fn(() => 'mock-id-123'),\n"
+                     '};\n\n')
+
+    parts.append(f"describe('{name}', () => {{\n"
+                 f'  let subject: {name};\n'
+                 '  let mockLogger: jest.Mocked<Logger>;\n\n'
+                 '  beforeEach(() => {\n'
+                 '    mockLogger = { info: jest.fn(), error: jest.fn(), warn: jest.fn() } as any;\n'
+                 f'    subject = new {name}(mockLogger);\n'
+                 '  });\n')
+
+    for case in range(rng.randint(5, 30)):
+        parts.append(f"\n  it('handles case {case}', async () => {{\n")
+        for _ in range(rng.randint(1, 4)):
+            n = rng.randrange(10000)
+            parts.append(_mock_line(rng, n) if rng.random() < 0.6 else _create_call(rng, n))
+        parts.append(f"    const result = await subject.execute({{ id: 'case-{case}' }});\n"
+                     f"    // expect(result).toEqual({{ ok: true }});\n"
+                     '    expect(result.isSuccess()).toBe(true);\n'
+                     '  });\n')
+    parts.append('});\n')
+    return ''.join(parts)
+
+
+def generate_tree(root, files, seed=1):
+    """root配下にfiles個のテストファイルを生成し、(ファイル数, 合計バイト数) を返す"""
+    rng = random.Random(seed)
+    total = 0
+    for i in range(files):
+        layer = LAYERS[i % len(LAYERS)]
+        directory = os.path.join(root, layer, f'feature{i // FILES_PER_DIR:05d}', '__tests__')
+        os.makedirs(directory, exist_ok=True)
+        name = f'Subject{i:06d}'
+        data = generate_test_file(rng, name).encode('utf-8')
+        with open(os.path.join(directory, f'{name}.test.ts'), 'wb') as f:
+            f.write(data)
+        total += len(data)
+    return files, total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ベンチマーク用の合成テストツリーを生成する')
+    parser.add_argument('root', help='出力先ディレクトリ')
+    parser.add_argument('--files', type=int, default=1000, help='生成するテストファイル数 (default: 1000)')
+    parser.add_argument('--seed', type=int, default=1, help='乱数シード (default: 1)')
+    args = parser.parse_args(argv)
+
+    count, total = generate_tree(args.root, args.files, args.seed)
+    print(f"Generated {count} files ({total / 1024 / 1024:.1f} MiB) in {args.root}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+修正スクリプトの対象ファイルの決定
+
+- プロジェクトルート: カレントディレクトリから上に package.json / tsconfig.json のあるディレクトリを探す
+  （見つからなければこのスクリプトの2つ上のディレクトリ）
+- 対象: --include / --exclude のglob（プロジェクトルートからの相対パス。'**' は0個以上のディレクトリ）、
+  または --stdin で標準入力から渡したファイル一覧（git diff --name-only の出力など）
+- .gitignore（プロジェクトルートとリポジトリルート）で無視されるディレクトリは走査せずに読み飛ばす
+
+    args = parse_target_args('Result型のimportを追加')
+    for file_path in find_targets(args):
+        ...
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+ROOT_MARKERS = ('package.json', 'tsconfig.json')
+DEFAULT_INCLUDE = ('src/**/*.test.ts',)
+# .gitignoreに書かれていなくても走査しないディレクトリ
+ALWAYS_SKIP = {'.git', 'node_modules'}
+
+
+def find_project_root(start=None):
+    """startから上にたどって package.json / tsconfig.json のあるディレクトリを返す"""
+    directory = os.path.abspath(start or os.getcwd())
+    while True:
+        if any(os.path.isfile(os.path.join(directory, marker)) for marker in ROOT_MARKERS):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return DEFAULT_PROJECT_ROOT
+        directory = parent
+
+
+def glob_to_regex(pattern):
+    """globを正規表現に変換する（'**/' は0個以上のディレクトリ、'*' と '?' は '/' をまたがない）"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end < 0:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                parts.append('[' + ('^' + body[1:] if body.startswith('!') else body) + ']')
+                i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(parts) + r'\Z')
+
+
+class GitIgnore:
+    """.gitignore のパターン（base_dirからの相対パスで判定、後に書かれたパターンが優先）"""
+
+    def __init__(self, base_dir, lines):
+        self.base_dir = base_dir
+        self.patterns = []
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            line = line.rstrip()
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            # 先頭か途中に '/' があるパターンは base_dir からのパスに一致させる（末尾の '/' は数えない）
+            anchored = '/' in line
+            line = line.lstrip('/')
+            self.patterns.append((glob_to_regex(line), negate, dir_only, anchored))
+
+    @classmethod
+    def load(cls, base_dir):
+        try:
+            with open(os.path.join(base_dir, '.gitignore'), 'r', encoding='utf-8') as f:
+                return cls(base_dir, f.readlines())
+        except OSError:
+            return cls(base_dir, [])
+
+    def ignored(self, rel_path, is_dir):
+        """rel_path（base_dirからの相対パス）自体が無視されるか（親ディレクトリは見ない）"""
+        name = rel_path.rsplit('/', 1)[-1]
+        result = False
+        for regex, negate, dir_only, anchored in self.patterns:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                result = not negate
+        return result
+
+
+class IgnoreRules:
+    """プロジェクトルートとリポジトリルートの .gitignore をまとめて判定する"""
+
+    def __init__(self, root):
+        self.root = root
+        self.ignores = [GitIgnore.load(root)]
+        top = root
+        while not os.path.exists(os.path.join(top, '.git')):
+            parent = os.path.dirname(top)
+            if parent == top:
+                top = None
+                break
+            top = parent
+        if top is not None and top != root:
+            self.ignores.append(GitIgnore.load(top))
+
+    def ignored(self, path, is_dir):
+        path = os.path.abspath(path)
+        if os.path.basename(path) in ALWAYS_SKIP and is_dir:
+            return True
+        for ignore in self.ignores:
+            rel = os.path.relpath(path, ignore.base_dir).replace(os.sep, '/')
+            if not rel.startswith('../') and ignore.ignored(rel, is_dir):
+                return True
+        return False
+
+    def ignored_with_parents(self, path):
+        """pathまたはその親ディレクトリ（プロジェクトルートより下）が無視されるか"""
+        path = os.path.abspath(path)
+        if self.ignored(path, os.path.isdir(path)):
+            return True
+        parent = os.path.dirname(path)
+        while parent.startswith(self.root + os.sep):
+            if self.ignored(parent, True):
+                return True
+            parent = os.path.dirname(parent)
+        return False
+
+
+def _static_prefix(pattern):
+    """globのうちワイルドカードを含まない先頭のディレクトリ部分"""
+    prefix = []
+    for part in pattern.split('/')[:-1]:
+        if any(c in part for c in '*?['):
+            break
+        prefix.append(part)
+    return '/'.join(prefix)
+
+
+def walk_targets(root, include=DEFAULT_INCLUDE, exclude=(), ignore=None):
+    """includeのいずれかに一致し、excludeのどれにも一致しないファイルをrootからの相対パスで返す（ソート済み）"""
+    ignore = ignore or IgnoreRules(root)
+    includes = [glob_to_regex(pattern) for pattern in include]
+    excludes = [glob_to_regex(pattern) for pattern in exclude]
+    found = set()
+    # 重複して走査しないよう、他のプレフィックスの下にあるプレフィックスは除く
+    prefixes = sorted({_static_prefix(pattern) for pattern in include})
+    prefixes = [p for p in prefixes if not any(q != p and (q == '' or p.startswith(q + '/')) for q in prefixes)]
+    for prefix in prefixes:
+        top = os.path.join(root, prefix) if prefix else root
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = sorted(d for d in dirnames if not ignore.ignored(os.path.join(dirpath, d), True))
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+            for filename in filenames:
+                rel = filename if rel_dir == '.' else f'{rel_dir}/{filename}'
+                if (any(regex.match(rel) for regex in includes)
+                        and not any(regex.match(rel) for regex in excludes)
+                        and not ignore.ignored(os.path.join(dirpath, filename), False)):
+                    found.add(rel)
+    return sorted(found)
+
+
+def _git_toplevel(root):
+    try:
+        return subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=root,
+                              capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def filter_listed(root, names, include=DEFAULT_INCLUDE, exclude=(), ignore=None):
+    """ファイル一覧（カレントディレクトリ・リポジトリルート・プロジェクトルートのいずれかからの相対パス）を
+    include / exclude / .gitignore で絞り込み、rootからの相対パスで返す"""
+    ignore = ignore or IgnoreRules(root)
+    includes = [glob_to_regex(pattern) for pattern in include]
+    excludes = [glob_to_regex(pattern) for pattern in exclude]
+    top = None
+    found = set()
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        candidates = [os.path.abspath(name), os.path.join(root, name)]
+        if not os.path.isabs(name):
+            top = top or _git_toplevel(root)
+            if top:
+                candidates.insert(1, os.path.join(top, name))
+        path = next((c for c in candidates if os.path.isfile(c)), None)
+        if path is None or not path.startswith(root + os.sep):
+            continue
+        rel = os.path.relpath(path, root).replace(os.sep, '/')
+        if (any(regex.match(rel) for regex in includes)
+                and not any(regex.match(rel) for regex in excludes)
+                and not ignore.ignored_with_parents(path)):
+            found.add(rel)
+    return sorted(found)
+
+
+def add_target_arguments(parser, include=DEFAULT_INCLUDE):
+    """--project-root / --include / --exclude / --stdin を追加する"""
+    parser.add_argument('--project-root',
+                        help='プロジェクトルート (default: カレントディレクトリから package.json / tsconfig.json を探す)')
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                        help=f'対象ファイルのglob（プロジェクトルートからの相対パス、複数指定可, default: {", ".join(include)}）')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='対象から外すファイルのglob（複数指定可）')
+    parser.add_argument('--stdin', action='store_true',
+                        help='対象ファイルの一覧を標準入力から読む（例: git diff --name-only | ... --stdin）')
+    parser.set_defaults(default_include=tuple(include))
+
+
+def parse_target_args(description, argv=None, include=DEFAULT_INCLUDE):
+    parser = argparse.ArgumentParser(description=description)
+    add_target_arguments(parser, include)
+    return parser.parse_args(argv)
+
+
+def find_targets(args, stdin=None):
+    """引数から対象ファイルを求め、カレントディレクトリから見たパス（ソート済み）で返す"""
+    root = os.path.abspath(args.project_root) if args.project_root else find_project_root()
+    include = args.include or args.default_include
+    ignore = IgnoreRules(root)
+    if args.stdin:
+        rels = filter_listed(root, stdin or sys.stdin, include, args.exclude, ignore)
+    else:
+        rels = walk_targets(root, include, args.exclude, ignore)
+    base = os.path.relpath(root)
+    if base.startswith('..'):
+        base = root
+    return [os.path.normpath(os.path.join(base, rel)) for rel in rels]
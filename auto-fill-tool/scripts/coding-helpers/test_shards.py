@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+jestのテストファイルを実行時間で均等に分けるシャード計画
+
+jest --json の結果（またはテキスト出力の "PASS/FAIL <file> (12.3 s)" の行）からファイルごとの実行時間と
+失敗を .codemod-cache/test-timings.json に記録し、次回からはその実行時間の見込みで
+テストファイルをN個のシャードに分ける（最長処理時間順の貪欲法: 見込みの長いファイルから順に、
+その時点で合計が最も短いシャードに入れる）。遅いファイルが1つのシャードに偏らないので、
+全体の時間は最も遅いシャードではなく「合計 / N」に近づく。
+各シャードの中では、最近失敗したファイルを先頭にして早く失敗が分かるようにする。
+
+使い方（プロジェクトルートで実行）:
+    npm test -- --json --outputFile=jest-results.json
+    python3 scripts/coding-helpers/test_shards.py --record jest-results.json        # 実行時間を記録
+    python3 scripts/coding-helpers/test_shards.py --shards 4                         # 計画の概要
+    python3 scripts/coding-helpers/test_shards.py --shards 4 --index 1               # 1番目のシャードのファイル一覧
+    python3 scripts/coding-helpers/test_shards.py --shards 4 --index 1 --run         # それを1回のjestで実行
+    python3 scripts/coding-helpers/test_shards.py --shards 4 --json > shards.json    # CIの並列ジョブ用
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import re
+import statistics
+import sys
+
+from affected_tests import is_test_file, run_jest
+from codemod_manifest import DEFAULT_CACHE_DIR
+from file_writer import atomic_write
+from targets import find_project_root, walk_targets
+
+HISTORY_FORMAT = 1
+# ファイルごとに保持する実行時間の件数（見込みはその中央値）
+KEEP_SAMPLES = 5
+# この回数以内の記録で失敗したファイルを「最近失敗した」とみなす
+RECENT_FAILURE_RUNS = 3
+# 記録がまったくない場合の1ファイルの見込み（ミリ秒）
+DEFAULT_DURATION_MS = 1000
+# jestのテキスト出力はこれより遅いファイルにだけ時間を表示する（slowTestThreshold の既定値）
+SLOW_TEST_MS = 5000
+# jest.config.js の testMatch
+TEST_GLOBS = ('src/**/__tests__/**/*.test.ts',)
+
+_TEXT_RESULT = re.compile(r'^(PASS|FAIL)\s+(\S+)(?:\s+\((\d+(?:\.\d+)?) s\))?')
+_ANSI = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def default_history_path(root):
+    return os.path.join(root, DEFAULT_CACHE_DIR, 'test-timings.json')
+
+
+class History:
+    """ファイルごとの実行時間（ミリ秒、新しい順）と最後に失敗した記録の番号"""
+
+    def __init__(self, path, runs=0, files=None):
+        self.path = path
+        self.runs = runs
+        self.files = files if files is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == HISTORY_FORMAT:
+                return cls(path, data.get('runs', 0), data.get('files', {}))
+        except (OSError, ValueError):
+            pass
+        return cls(path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        data = {'format': HISTORY_FORMAT, 'runs': self.runs, 'files': self.files}
+        atomic_write(self.path, json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+    def record(self, results):
+        """1回分の実行結果 [(ファイル, ミリ秒またはNone, 失敗したか)] を記録する
+
+        ミリ秒がNoneのもの（テキスト出力で時間が表示されなかったファイル）は SLOW_TEST_MS より速かったものとして扱う。
+        """
+        self.runs += 1
+        for file, duration, failed in results:
+            entry = self.files.setdefault(file, {'ms': [], 'failed_run': None})
+            if duration is not None:
+                entry['ms'] = [round(duration)] + entry['ms'][:KEEP_SAMPLES - 1]
+            elif not entry['ms']:
+                entry['fast'] = True
+            if failed:
+                entry['failed_run'] = self.runs
+
+    def expected(self, file, default):
+        entry = self.files.get(file, {})
+        if entry.get('ms'):
+            return statistics.median(entry['ms'])
+        # 速かったことだけが分かっているファイルは 0〜SLOW_TEST_MS の中央
+        return min(default, SLOW_TEST_MS / 2) if entry.get('fast') else default
+
+    def recently_failed(self, file):
+        failed_run = self.files.get(file, {}).get('failed_run')
+        return failed_run is not None and self.runs - failed_run < RECENT_FAILURE_RUNS
+
+    def default_duration(self):
+        """記録のないファイルの見込み（記録のあるファイルの見込みの中央値）
+
+        テキスト出力の記録だけでは遅いファイルの時間しか分からないので、速かったファイルも含めて中央値を求める。
+        """
+        known = [statistics.median(entry['ms']) if entry.get('ms') else SLOW_TEST_MS / 2
+                 for entry in self.files.values() if entry.get('ms') or entry.get('fast')]
+        return statistics.median(known) if known else DEFAULT_DURATION_MS
+
+
+def read_results(path, root):
+    """jest --json の結果またはテキスト出力から [(ファイル, ミリ秒またはNone, 失敗したか)] を返す"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        if head == '{':
+            data = json.loads(head + f.read())
+            results = []
+            for suite in data.get('testResults', []):
+                file = os.path.relpath(suite.get('name', ''), root).replace(os.sep, '/')
+                stats = suite.get('perfStats') or {}
+                start, end = stats.get('start'), stats.get('end')
+                duration = end - start if start and end else None
+                results.append((file, duration, suite.get('status') == 'failed'))
+            return results
+
+        # テキスト出力: jestは遅いファイル（5秒以上）にだけ時間を表示する
+        results = {}
+        for line in itertools.chain([head + f.readline()], f) if head else ():
+            match = _TEXT_RESULT.match(_ANSI.sub('', line))
+            if match and match.group(2) not in results:
+                seconds = match.group(3)
+                results[match.group(2)] = (float(seconds) * 1000 if seconds else None, match.group(1) == 'FAIL')
+        return [(file, duration, failed) for file, (duration, failed) in results.items()]
+
+
+def plan_shards(files, history, count):
+    """files を count 個のシャードに分け、[(見込みの合計ミリ秒, [ファイル])] を返す"""
+    default = history.default_duration()
+    expected = {file: history.expected(file, default) for file in files}
+    # 見込みの長い順（同じならパス順）に、合計が最も短いシャードへ入れる
+    heap = [(0.0, index) for index in range(count)]
+    shards = [[] for _ in range(count)]
+    totals = [0.0] * count
+    for file in sorted(files, key=lambda f: (-expected[f], f)):
+        total, index = heapq.heappop(heap)
+        shards[index].append(file)
+        totals[index] = total + expected[file]
+        heapq.heappush(heap, (totals[index], index))
+    # シャード内は最近失敗したファイルを先頭に、あとは見込みの長い順
+    for shard in shards:
+        shard.sort(key=lambda f: (not history.recently_failed(f), -expected[f], f))
+    return [(totals[index], shards[index]) for index in range(count)], expected
+
+
+def print_plan(plan, expected, history, out=sys.stdout):
+    total = sum(expected.values())
+    for index, (duration, files) in enumerate(plan, 1):
+        failed = sum(1 for file in files if history.recently_failed(file))
+        line = f"shard {index}: {len(files)} file(s), expected {duration / 1000:.1f} s"
+        if failed:
+            line += f", {failed} recently failed"
+        if files:
+            slowest = max(files, key=lambda f: expected[f])
+            line += f" (slowest: {slowest} {expected[slowest] / 1000:.1f} s)"
+        print(line, file=out)
+    makespan = max(duration for duration, _ in plan) if plan else 0
+    known = sum(1 for file in expected if history.files.get(file, {}).get('ms'))
+    print(f"total {total / 1000:.1f} s, ideal {total / len(plan) / 1000:.1f} s/shard, "
+          f"longest shard {makespan / 1000:.1f} s ({known}/{len(expected)} file(s) with recorded timings)", file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='jestのテストファイルを実行時間で均等にシャードへ分ける')
+    parser.add_argument('--project-root',
+                        help='プロジェクトルート (default: カレントディレクトリから package.json / tsconfig.json を探す)')
+    parser.add_argument('--record', action='append', default=[], metavar='RESULTS',
+                        help='jest --json の結果（またはテキスト出力）の実行時間と失敗を記録する（複数指定可）')
+    parser.add_argument('--shards', type=int, help='シャード数')
+    parser.add_argument('--index', type=int, help='このシャード（1始まり）のファイルだけを1行ずつ出力する')
+    parser.add_argument('--json', action='store_true', help='全シャードの計画をJSONで出力する')
+    parser.add_argument('--run', action='store_true', help='--index のシャードを1回のjest実行で実行する')
+    parser.add_argument('--jest-arg', action='append', default=[], metavar='ARG',
+                        help='--run 時にjestへ渡す追加の引数（複数指定可）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    root = os.path.abspath(args.project_root) if args.project_root else find_project_root()
+    history = History.load(default_history_path(root))
+
+    if args.record:
+        try:
+            for path in args.record:
+                results = read_results(path, root)
+                history.record(results)
+                print(f"Recorded {len(results)} test file(s) from {path}", file=sys.stderr)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        history.save()
+    if args.shards is None:
+        if args.record:
+            return 0
+        print("Error: --shards or --record is required", file=sys.stderr)
+        return 1
+    if args.shards < 1 or (args.index is not None and not 1 <= args.index <= args.shards):
+        print("Error: --shards must be >= 1 and --index must be between 1 and --shards", file=sys.stderr)
+        return 1
+
+    files = [file for file in walk_targets(root, TEST_GLOBS) if is_test_file(file)]
+    plan, expected = plan_shards(files, history, args.shards)
+
+    if args.json:
+        json.dump([{'shard': index, 'expected_ms': round(duration), 'files': shard}
+                   for index, (duration, shard) in enumerate(plan, 1)], sys.stdout, indent=2)
+        print()
+        return 0
+    if args.index is None:
+        print_plan(plan, expected, history)
+        return 0
+    shard = plan[args.index - 1][1]
+    if args.run:
+        return run_jest(root, shard, args.jest_arg) if shard else 0
+    for file in shard:
+        print(file)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
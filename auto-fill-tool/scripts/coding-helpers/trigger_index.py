@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+ルールの事前フィルタ: 各ルールが宣言したリテラルのアンカー文字列を1回の多パターン検索で探し、
+アンカーを含むファイルだけをそのルールに回す
+
+全ルールのアンカーを長い順の選択パターン1つにまとめて走査するため、ファイルの走査は1回で済む。
+他のアンカーに包含されるアンカーは包含関係から補い、他のアンカーの末尾と重なり得るアンカーだけを
+個別に確認するので、結果は Aho–Corasick（全出現の検出）と同じになる。
+"""
+
+import re
+
+
+class TriggerIndex:
+    """アンカー集合に対する多パターン検索"""
+
+    def __init__(self, anchors):
+        self.anchors = frozenset(anchors)
+        # 同じ位置では長いアンカーを優先し、その中に含まれる短いアンカーは包含関係から補う
+        ordered = sorted(self.anchors, key=lambda a: (-len(a), a))
+        self._contained = {a: frozenset(b for b in self.anchors if b in a) for a in ordered}
+        self._pattern = re.compile('|'.join(re.escape(a) for a in ordered)) if ordered else None
+        # 重ならないマッチの走査では、他のアンカーの途中から始まるアンカーを見落とす可能性がある
+        self._overlapping = frozenset(b for b in self.anchors if any(_overlaps(a, b) for a in self.anchors))
+
+    def search(self, content):
+        """contentに出現するアンカーの集合を返す（全アンカーが見つかった時点で打ち切る）"""
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(content):
+            found |= self._contained[match.group()]
+            if len(found) == len(self.anchors):
+                return found
+        for anchor in self._overlapping - found:
+            if anchor in content:
+                found.add(anchor)
+        return found
+
+
+def _overlaps(a, b):
+    """aの末尾（a全体を除く）とbの先頭が重なり得るか"""
+    return a != b and any(b.startswith(a[i:]) for i in range(1, len(a)))
+
+
+_indexes = {}
+
+
+def index_for(rules):
+    """ルール列に対応するTriggerIndexを返す（ルール名の組ごとにキャッシュ）"""
+    key = tuple(rule.name for rule in rules)
+    index = _indexes.get(key)
+    if index is None:
+        index = TriggerIndex(anchor for rule in rules for anchor in (rule.anchors or ()))
+        _indexes[key] = index
+    return index
+
+
+def clear_cache():
+    """ルールのアンカーを変更した場合に、キャッシュしたTriggerIndexを捨てる"""
+    _indexes.clear()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+TypeScriptソース用の軽量スキャナ
+
+文字列（'...' / "..."）、テンプレートリテラル（`...${...}...`）、コメント、正規表現リテラルを読み飛ばしながら
+括弧 ( [ { の対応を1パスで求める。バックトラックする正規表現を使わないため、ファイルサイズに対して線形時間で動作し、
+ネストの深さや文字列中の括弧に左右されない。
+
+    result = scan(content)
+    result.pairs[open_index]  # -> 対応する閉じ括弧の位置（テンプレートリテラル内の '${' は '$' の位置 -> '}' の位置）
+    result.errors             # -> [(index, message)]  未終端の文字列や対応しない括弧
+    result.open_at_end        # -> [(開き文字, index)]  ファイルの終わりで閉じていない括弧（途中で切れたファイル）
+"""
+
+import re
+
+OPENERS = {'(': ')', '[': ']', '{': '}'}
+CLOSERS = {')': '(', ']': '[', '}': '{'}
+
+# コード中で次に注目すべき文字（それ以外は一気に読み飛ばす）
+_CODE_SPECIAL = re.compile(r'[\'"`/(){}\[\]]')
+_TEMPLATE_SPECIAL = re.compile(r'[\\`]|\$\{')
+# 引数の区切りを探す場合に注目する文字
+_ARGUMENT_SPECIAL = re.compile(r'[\'"`/(){}\[\],]')
+_STRING_SPECIAL = {
+    "'": re.compile(r"[\\'\n]"),
+    '"': re.compile(r'[\\"\n]'),
+}
+_IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+
+# 直前がこれらの場合、'/' は除算ではなく正規表現リテラルの開始とみなす
+_REGEX_PRECEDING_CHARS = frozenset('(,=:[!&|?{};+-*%<>~^')
+_REGEX_PRECEDING_WORDS = frozenset({
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw', 'case', 'do', 'else',
+    'yield', 'await',
+})
+
+
+class ScanResult:
+    """scan()の結果: 括弧の対応表とエラー一覧"""
+
+    def __init__(self):
+        self.pairs = {}
+        self.errors = []
+        self.open_at_end = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def skip_string(text, start):
+    """start位置の引用符で始まる文字列の直後の位置を返す（改行/EOFまでに閉じなければ -1）"""
+    quote = text[start]
+    pattern = _STRING_SPECIAL[quote]
+    i = start + 1
+    while True:
+        match = pattern.search(text, i)
+        if match is None or match.group() == '\n':
+            return -1
+        if match.group() == '\\':
+            i = match.end() + 1
+            continue
+        return match.end()
+
+
+def _is_regex_start(text, i, comments=None):
+    """i位置の '/' が正規表現リテラルの開始かどうかを直前のトークンから推定する
+
+    commentsは走査済みのコメントの {終了位置: 開始位置}（直前のトークンを探すときに読み飛ばす）。
+    """
+    j = i - 1
+    while j >= 0:
+        if text[j] in ' \t\r\n':
+            j -= 1
+        elif comments and j + 1 in comments:
+            j = comments[j + 1] - 1
+        else:
+            break
+    if j < 0:
+        return True
+    c = text[j]
+    if c in _REGEX_PRECEDING_CHARS or c == '}':
+        return True
+    if c in _IDENT_CHARS:
+        k = j
+        while k >= 0 and text[k] in _IDENT_CHARS:
+            k -= 1
+        return text[k + 1:j + 1] in _REGEX_PRECEDING_WORDS
+    return False
+
+
+def _skip_regex(text, start):
+    """start位置の '/' で始まる正規表現リテラルの直後の位置を返す（行内で閉じなければ -1）"""
+    i = start + 1
+    n = len(text)
+    in_class = False
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return -1
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            while i < n and text[i] in _IDENT_CHARS:
+                i += 1
+            return i
+        i += 1
+    return -1
+
+
+def scan(text):
+    """textを1パスで走査し、コード中の括弧の対応とエラーをScanResultで返す"""
+    result = ScanResult()
+    pairs = result.pairs
+    errors = result.errors
+    # (開き文字, 位置)。'${' はテンプレートリテラル内の式（対応する '}' でテンプレートに戻る）
+    stack = []
+    n = len(text)
+    i = 0
+    template_start = None
+    comments = {}
+
+    while i < n:
+        if template_start is not None:
+            # テンプレートリテラルの本文
+            match = _TEMPLATE_SPECIAL.search(text, i)
+            if match is None:
+                errors.append((template_start, 'unterminated template literal'))
+                result.open_at_end = [(opener, index) for opener, index, _ in stack]
+                return result
+            token = match.group()
+            if token == '\\':
+                i = match.end() + 1
+            elif token == '`':
+                template_start = None
+                i = match.end()
+            else:
+                stack.append(('${', match.start(), template_start))
+                template_start = None
+                i = match.end()
+            continue
+
+        match = _CODE_SPECIAL.search(text, i)
+        if match is None:
+            break
+        i = match.start()
+        c = text[i]
+
+        if c in OPENERS:
+            stack.append((c, i, None))
+            i += 1
+        elif c in CLOSERS:
+            i = _close(text, i, stack, pairs, errors)
+            if i < 0:
+                # '${...}' が閉じてテンプレート本文に戻る
+                template_start = -i - 1
+                i = match.start() + 1
+        elif c == '`':
+            template_start = i
+            i += 1
+        elif c in '\'"':
+            end = skip_string(text, i)
+            if end < 0:
+                errors.append((i, 'unterminated string literal'))
+                newline = text.find('\n', i)
+                i = n if newline < 0 else newline + 1
+            else:
+                i = end
+        else:  # '/'
+            nxt = text[i + 1] if i + 1 < n else ''
+            if nxt == '/':
+                newline = text.find('\n', i)
+                comments[n if newline < 0 else newline] = i
+                i = n if newline < 0 else newline + 1
+            elif nxt == '*':
+                end = text.find('*/', i + 2)
+                if end < 0:
+                    errors.append((i, 'unterminated block comment'))
+                    result.open_at_end = [(opener, index) for opener, index, _ in stack]
+                    return result
+                comments[end + 2] = i
+                i = end + 2
+            elif _is_regex_start(text, i, comments):
+                end = _skip_regex(text, i)
+                i = i + 1 if end < 0 else end
+            else:
+                i += 1
+
+    result.open_at_end = [(opener, index) for opener, index, _ in stack]
+    for opener, index, _ in stack:
+        errors.append((index, f"unclosed '{'${' if opener == '${' else opener}'"))
+    return result
+
+
+def _close(text, i, stack, pairs, errors):
+    """閉じ括弧を処理して次の位置を返す（'${' を閉じた場合は -(テンプレート開始位置)-1 を返す）"""
+    c = text[i]
+    expected = CLOSERS[c]
+    if stack:
+        opener, index, template_start = stack[-1]
+        if opener == '${' and c == '}':
+            stack.pop()
+            pairs[index] = i
+            return -template_start - 1
+        if opener == expected:
+            stack.pop()
+            pairs[index] = i
+            return i + 1
+        # 途中の開き括弧が閉じられていない場合は、対応する開き括弧まで巻き戻す
+        for depth in range(len(stack) - 1, -1, -1):
+            if stack[depth][0] == expected:
+                for unclosed, unclosed_index, _ in stack[depth + 1:]:
+                    errors.append((unclosed_index, f"unclosed '{unclosed}'"))
+                del stack[depth + 1:]
+                pairs[stack.pop()[1]] = i
+                return i + 1
+    errors.append((i, f"unexpected '{c}'"))
+    return i + 1
+
+
+def find_calls(text, callee, result=None):
+    """コード中の `callee(` 呼び出しを探し、[(開き括弧の位置, 閉じ括弧の位置)] を出現順で返す
+
+    calleeは '.mockResolvedValue' のような呼び出し名。文字列やコメント中の出現は無視される。
+    """
+    if result is None:
+        result = scan(text)
+    pairs = result.pairs
+    calls = []
+    start = text.find(callee)
+    while start >= 0:
+        i = start + len(callee)
+        while i < len(text) and text[i] in ' \t\r\n':
+            i += 1
+        if i in pairs and text[i] == '(':
+            calls.append((i, pairs[i]))
+        start = text.find(callee, start + len(callee))
+    return calls
+
+
+def skip_template(text, start, pairs):
+    """start位置の '`' で始まるテンプレートリテラルの直後の位置を返す（'${...}' はpairsで読み飛ばす）"""
+    i = start + 1
+    while True:
+        match = _TEMPLATE_SPECIAL.search(text, i)
+        if match is None:
+            return len(text)
+        token = match.group()
+        if token == '\\':
+            i = match.end() + 1
+        elif token == '`':
+            return match.end()
+        else:
+            close = pairs.get(match.start())
+            if close is None:
+                return len(text)
+            i = close + 1
+
+
+def split_arguments(text, open_index, result):
+    """open_index位置の '(' から対応する ')' までの引数を [(start, end)] で返す
+
+    ネストした括弧・文字列・テンプレートリテラル・コメント中のカンマは区切りとみなさない。
+    範囲は前後の空白を含み、末尾カンマの後の空の引数は含まない。呼び出しの長さに対して線形時間。
+    """
+    pairs = result.pairs
+    close_index = pairs[open_index]
+    spans = []
+    start = i = open_index + 1
+    while True:
+        match = _ARGUMENT_SPECIAL.search(text, i, close_index)
+        if match is None:
+            break
+        i = match.start()
+        c = text[i]
+        if c == ',':
+            spans.append((start, i))
+            start = i = i + 1
+        elif c in OPENERS:
+            # 対応しない開き括弧（構文エラー）の場合は呼び出しの終わりまで読み飛ばす
+            i = pairs.get(i, close_index - 1) + 1
+        elif c in '\'"':
+            end = skip_string(text, i)
+            i = i + 1 if end < 0 else end
+        elif c == '`':
+            i = skip_template(text, i, pairs)
+        elif c == '/':
+            nxt = text[i + 1] if i + 1 < close_index else ''
+            if nxt == '/':
+                newline = text.find('\n', i)
+                i = close_index if newline < 0 else newline + 1
+            elif nxt == '*':
+                end = text.find('*/', i + 2)
+                i = close_index if end < 0 else end + 2
+            elif _is_regex_start(text, i):
+                end = _skip_regex(text, i)
+                i = i + 1 if end < 0 else end
+            else:
+                i += 1
+        else:
+            i += 1
+    spans.append((start, close_index))
+    if not text[start:close_index].strip():
+        spans.pop()
+    return spans
+
+
+def line_col(text, index):
+    """0始まりのindexを1始まりの (行, 列) に変換する"""
+    line = text.count('\n', 0, index) + 1
+    return line, index - (text.rfind('\n', 0, index) + 1) + 1
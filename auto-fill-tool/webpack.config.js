@@ -9,11 +9,25 @@ const webpack = require('webpack');
 // eslint-disable-next-line max-lines-per-function -- Webpack configuration requires comprehensive setup including entry points, output, module rules, resolve aliases, optimization settings, and plugins. Splitting would fragment the cohesive webpack configuration.
 module.exports = (env, argv) => {
   const isProduction = argv.mode === 'production';
+  // `--env stats` (npm run build:stats): full stats for scripts/coding-helpers/bundle_stats.py
+  const withStats = Boolean(env && env.stats);
 
   return {
     bail: false, // Continue building even if there are errors
     ignoreWarnings: [/Failed to parse source map/, /Critical dependency/, /Module not found/, /Cannot resolve/, /export .* was not found/, /TS\d+/],
-    stats: {
+    stats: withStats ? {
+      all: false,
+      assets: true,
+      chunks: true,
+      chunkModules: true,
+      nestedModules: true,
+      cachedModules: true,
+      runtimeModules: true,
+      entrypoints: true,
+      ids: true,
+      reasons: true,
+      errors: true,
+    } : {
       colors: true,
       modules: false,
       chunks: false,